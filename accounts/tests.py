@@ -0,0 +1,47 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from core import versioning
+from core.testing import QueryBudgetMixin
+from .models import Department, User
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+
+    def setUp(self):
+        self.budget_user = self.admin
+
+    def test_departments(self):
+        self.assertListQueries('/api/accounts/departments/', lambda index: Department.objects.create(
+            name=f'Department {index}', head=self.admin
+        ), 3)
+
+
+class DepartmentVersionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.head = User.objects.create_user(
+            username='head', email='head@example.com', password='x', first_name='Ann', last_name='Lee'
+        )
+        Department.objects.create(name='Surgery', head=cls.head)
+
+    def version(self):
+        return versioning.current('accounts.department')[0]
+
+    def test_login_does_not_bump_department_version(self):
+        before = self.version()
+        self.head.last_login = timezone.now()
+        self.head.save(update_fields=['last_login'])
+        self.head.save()
+        self.assertEqual(self.version(), before)
+
+    def test_name_change_bumps_department_version(self):
+        before = self.version()
+        self.head.last_name = 'Smith'
+        self.head.save()
+        self.assertEqual(self.version(), before + 1)
@@ -6,6 +6,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from .models import Department
 from .serializers import UserSerializer, DepartmentSerializer
+from core.mixins import ConditionalGetMixin
 
 User = get_user_model()
 
@@ -36,8 +37,8 @@ class UserViewSet(viewsets.ModelViewSet):
         except Exception:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-class DepartmentViewSet(viewsets.ModelViewSet):
-    queryset = Department.objects.all()
+class DepartmentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = Department.objects.select_related('head')
     serializer_class = DepartmentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
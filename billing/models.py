@@ -1,9 +1,10 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from simple_history.models import HistoricalRecords
+from core.history import BatchedHistoricalRecords
 from accounts.models import User
 from reception.models import Patient
 from ward.models import WardStay
+from core import catalog
 
 class Service(models.Model):
     SERVICE_TYPE_CHOICES = (
@@ -66,7 +67,7 @@ class Invoice(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     # Track history
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords()
     
     def __str__(self):
         return f"Invoice #{self.invoice_number} - {self.patient}"
@@ -90,8 +91,11 @@ class InvoiceItem(models.Model):
         return f"{self.service.name} x {self.quantity} for Invoice #{self.invoice.invoice_number}"
     
     def save(self, *args, **kwargs):
-        self.unit_price = self.service.cost
-        self.tax_rate = self.service.tax_rate if self.service.is_taxable else 0
+        # Version-checked lookup; price many lines inside catalog.services.verified()
+        # to check the version once for the whole invoice
+        service = catalog.services.get_verified(self.service_id)
+        self.unit_price = service.cost
+        self.tax_rate = service.tax_rate if service.is_taxable else 0
         subtotal = self.quantity * self.unit_price
         self.tax_amount = subtotal * (self.tax_rate / 100)
         self.total_amount = subtotal + self.tax_amount
@@ -126,7 +130,7 @@ class Payment(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     # Track history
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords()
     
     def __str__(self):
         return f"Payment of ${self.amount} for Invoice #{self.invoice.invoice_number}"
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core import catalog
 from .models import Service, Invoice, InvoiceItem, Payment, InsuranceClaim
 
 class ServiceSerializer(serializers.ModelSerializer):
@@ -14,7 +15,7 @@ class InvoiceItemSerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_service_name(self, obj):
-        return obj.service.name
+        return catalog.services.get(obj.service_id).name
 
 class PaymentSerializer(serializers.ModelSerializer):
     received_by_name = serializers.SerializerMethodField()
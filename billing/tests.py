@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from core import catalog
+from core.testing import QueryBudgetMixin
+from reception.models import Patient
+from .models import Invoice, InvoiceItem, Payment, Service
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        cls.patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+        cls.service = Service.objects.create(name='Consultation', code='CONS', service_type='consultation', cost=50)
+
+    def setUp(self):
+        self.budget_user = self.admin
+
+    def invoice(self, index=0):
+        invoice = Invoice.objects.create(
+            patient=self.patient, invoice_number=f'INV{index}', due_date=date.today() + timedelta(days=30),
+            created_by=self.admin
+        )
+        InvoiceItem.objects.create(invoice=invoice, service=self.service, unit_price=50, total_amount=50)
+        Payment.objects.create(invoice=invoice, amount=10, payment_method='cash', received_by=self.admin)
+        return invoice
+
+    def test_invoices(self):
+        self.assertListQueries('/api/billing/invoices/', self.invoice, 6)
+
+    def test_invoice_items(self):
+        invoice = self.invoice('X')
+        self.assertListQueries('/api/billing/invoice-items/', lambda index: InvoiceItem.objects.create(
+            invoice=invoice, service=self.service, unit_price=50, total_amount=50
+        ), 4)
+
+    def test_payments(self):
+        invoice = self.invoice('X')
+        self.assertListQueries('/api/billing/payments/', lambda index: Payment.objects.create(
+            invoice=invoice, amount=10, payment_method='cash', received_by=self.admin
+        ), 2)
+
+
+class InvoicePricingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+        cls.invoice = Invoice.objects.create(
+            patient=patient, invoice_number='INV1', due_date=date.today(), created_by=cls.admin
+        )
+        cls.service = Service.objects.create(name='X-ray', code='XR', service_type='imaging', cost=40)
+
+    def test_items_use_the_current_price_not_the_cached_one(self):
+        self.assertEqual(catalog.services.get(self.service.pk).cost, 40)
+        self.service.cost = 55
+        self.service.save()
+
+        item = InvoiceItem.objects.create(invoice=self.invoice, service=self.service, unit_price=0, total_amount=0)
+
+        self.assertEqual(item.unit_price, 55)
+
+    def test_an_invoice_checks_the_catalog_version_once(self):
+        catalog.services.get(self.service.pk)
+        with CaptureQueriesContext(connection) as queries, catalog.services.verified():
+            for _ in range(20):
+                InvoiceItem.objects.create(invoice=self.invoice, service=self.service, unit_price=0, total_amount=0)
+
+        lookups = [query['sql'] for query in queries if not query['sql'].startswith('INSERT')]
+        self.assertEqual(len(lookups), 1, lookups)
@@ -8,10 +8,12 @@ from .serializers import (
     PaymentSerializer, InsuranceClaimSerializer
 )
 from notifications.utils import send_notification
-from django.db.models import Sum
+from dashboard.activity import record_activity
+from core.mixins import ConditionalGetMixin
+from django.db.models import Sum, Prefetch
 from django.utils import timezone
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -20,7 +22,12 @@ class ServiceViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'code', 'description']
 
 class InvoiceViewSet(viewsets.ModelViewSet):
-    queryset = Invoice.objects.all()
+    queryset = Invoice.objects.select_related(
+        'patient', 'created_by', 'insurance_claim'
+    ).prefetch_related(
+        'items',
+        Prefetch('payments', queryset=Payment.objects.select_related('received_by')),
+    )
     serializer_class = InvoiceSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -131,7 +138,7 @@ class InvoiceItemViewSet(viewsets.ModelViewSet):
         invoice.save()
 
 class PaymentViewSet(viewsets.ModelViewSet):
-    queryset = Payment.objects.all()
+    queryset = Payment.objects.select_related('received_by')
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -169,6 +176,15 @@ class PaymentViewSet(viewsets.ModelViewSet):
                 
             invoice.save()
             
+            record_activity(
+                actor=request.user,
+                event_type='payment',
+                action='received payment from',
+                target=invoice.patient.get_full_name(),
+                department='billing',
+                obj=serializer.instance
+            )
+            
             # Notify billing department
             send_notification(
                 recipient_type='department',
@@ -238,7 +254,7 @@ class InsuranceClaimViewSet(viewsets.ModelViewSet):
         invoice = claim.invoice
         if request.data.get('apply_payment', False):
             # Create payment record
-            Payment.objects.create(
+            payment = Payment.objects.create(
                 invoice=invoice,
                 amount=amount_approved,
                 payment_method='insurance',
@@ -257,6 +273,15 @@ class InsuranceClaimViewSet(viewsets.ModelViewSet):
                 invoice.status = 'partial'
                 
             invoice.save()
+            
+            record_activity(
+                actor=request.user,
+                event_type='payment',
+                action='received insurance payment for',
+                target=invoice.patient.get_full_name(),
+                department='billing',
+                obj=payment
+            )
         
         serializer = self.get_serializer(claim)
         return Response(serializer.data)
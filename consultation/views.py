@@ -2,7 +2,8 @@ from django.shortcuts import render
 from rest_framework import viewsets
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from .models import Consultation
+from django.db.models import Prefetch
+from .models import Consultation, Prescription, LabRequest, ConsultationNote
 from .serializers import ConsultationSerializer
 
 # Placeholder views - replace with actual implementation
@@ -18,5 +19,11 @@ def consultation_detail(request, pk):
 
 # ViewSet for more advanced functionality
 class ConsultationViewSet(viewsets.ModelViewSet):
-    queryset = Consultation.objects.all()
+    queryset = Consultation.objects.select_related(
+        'patient', 'doctor__user'
+    ).prefetch_related(
+        Prefetch('prescriptions', queryset=Prescription.objects.select_related('prescribed_by__user')),
+        Prefetch('lab_requests', queryset=LabRequest.objects.select_related('requested_by__user')),
+        Prefetch('notes', queryset=ConsultationNote.objects.select_related('created_by')),
+    )
     serializer_class = ConsultationSerializer 
\ No newline at end of file
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+    verbose_name = 'Core infrastructure'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .database import configure_sqlite
+        from .signals import connect_signals
+        connect_signals()
+        connection_created.connect(configure_sqlite, dispatch_uid='core_configure_sqlite')
@@ -0,0 +1,205 @@
+"""
+Retention and archival for simple_history tables.
+
+``archive_history`` moves every whole calendar month of history older than
+``HISTORY_RETENTION_DAYS`` out of the live ``Historical*`` tables into
+gzipped NDJSON files under ``HISTORY_ARCHIVE_DIR``, one file per table and
+month:
+
+    <archive dir>/reception.historicalpatient/2024-03.ndjson.gz
+    <archive dir>/manifest.json
+
+The manifest records each file's table, month, row count, history_id range
+and checksum. A file is fully written and listed in the manifest before
+its rows are deleted, so an interrupted run never loses history; at worst a
+month is present in both places, and readers de-duplicate by history_id.
+
+``history_for`` returns an object's history from the live table plus any
+archived months, so old changes stay reachable on demand.
+"""
+import datetime
+import gzip
+import hashlib
+import json
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+MANIFEST_NAME = 'manifest.json'
+DELETE_BATCH_SIZE = 1000
+
+
+class ArchiveEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder that stores field types it does not know (phone numbers, files) as text"""
+
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def archive_dir():
+    return str(settings.HISTORY_ARCHIVE_DIR)
+
+
+def tracked_models():
+    """Models whose history is written through BatchedHistoricalRecords"""
+    return [model for model in apps.get_models() if hasattr(model._meta, 'batched_history_records')]
+
+
+def history_model_for(model):
+    return getattr(model, model._meta.simple_history_manager_attribute).model
+
+
+def load_manifest():
+    path = os.path.join(archive_dir(), MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {'files': []}
+    with open(path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def _save_manifest(manifest):
+    path = os.path.join(archive_dir(), MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+        manifest_file.flush()
+        os.fsync(manifest_file.fileno())
+    os.replace(tmp_path, path)
+
+
+def retention_cutoff(days=None):
+    """Start of the month containing now - retention; older months are archived"""
+    days = settings.HISTORY_RETENTION_DAYS if days is None else days
+    horizon = timezone.localtime() - datetime.timedelta(days=days)
+    return horizon.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _month_bounds(month_start):
+    next_month = (month_start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return month_start, next_month
+
+
+def _file_path(table, month_label, manifest):
+    directory = os.path.join(archive_dir(), table)
+    os.makedirs(directory, exist_ok=True)
+    existing = sum(1 for entry in manifest['files'] if entry['table'] == table and entry['month'] == month_label)
+    name = f"{month_label}.ndjson.gz" if not existing else f"{month_label}.{existing + 1}.ndjson.gz"
+    return os.path.join(directory, name)
+
+
+def _write_month(queryset, path):
+    digest = hashlib.sha256()
+    rows, min_id, max_id = 0, None, None
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as archive_file:
+        for row in queryset.values().order_by('history_id').iterator(chunk_size=2000):
+            line = json.dumps(row, cls=ArchiveEncoder, sort_keys=True) + '\n'
+            archive_file.write(line)
+            digest.update(line.encode('utf-8'))
+            rows += 1
+            min_id = row['history_id'] if min_id is None else min_id
+            max_id = row['history_id']
+    with open(tmp_path, 'rb') as written:
+        os.fsync(written.fileno())
+    os.replace(tmp_path, path)
+    return rows, min_id, max_id, digest.hexdigest()
+
+
+def archive_history(days=None, models=None, dry_run=False, log=None):
+    """Archive and delete whole months of history older than the retention horizon"""
+    log = log or (lambda message: None)
+    cutoff = retention_cutoff(days)
+    manifest = load_manifest()
+    archived = []
+
+    for model in models or tracked_models():
+        history_model = history_model_for(model)
+        table = history_model._meta.label_lower
+        months = (
+            history_model.objects.filter(history_date__lt=cutoff)
+            .annotate(month=TruncMonth('history_date'))
+            .values_list('month', flat=True)
+            .distinct()
+            .order_by('month')
+        )
+        for month in months:
+            start, end = _month_bounds(month)
+            month_label = start.strftime('%Y-%m')
+            queryset = history_model.objects.filter(history_date__gte=start, history_date__lt=end)
+
+            if dry_run:
+                count = queryset.count()
+                log(f"{table} {month_label}: would archive {count} rows")
+                archived.append({'table': table, 'month': month_label, 'rows': count})
+                continue
+
+            path = _file_path(table, month_label, manifest)
+            rows, min_id, max_id, checksum = _write_month(queryset, path)
+            if not rows:
+                os.remove(path)
+                continue
+
+            entry = {
+                'table': table,
+                'model': model._meta.label,
+                'month': month_label,
+                'file': os.path.relpath(path, archive_dir()),
+                'rows': rows,
+                'min_history_id': min_id,
+                'max_history_id': max_id,
+                'sha256': checksum,
+                'archived_at': timezone.now().isoformat(),
+            }
+            manifest['files'].append(entry)
+            _save_manifest(manifest)
+
+            # Only delete what was written: rows added to the month since are kept
+            ids = queryset.filter(history_id__lte=max_id).values_list('history_id', flat=True)
+            with transaction.atomic():
+                ids = list(ids)
+                for index in range(0, len(ids), DELETE_BATCH_SIZE):
+                    history_model.objects.filter(history_id__in=ids[index:index + DELETE_BATCH_SIZE]).delete()
+
+            log(f"{table} {month_label}: archived {rows} rows to {entry['file']}")
+            archived.append(entry)
+
+    return archived
+
+
+def read_archive(model, object_id=None, since=None, until=None):
+    """Archived history rows for a tracked model, optionally for one object"""
+    table = history_model_for(model)._meta.label_lower
+    pk_name = model._meta.pk.attname
+    since_label = since.strftime('%Y-%m') if since else None
+    until_label = until.strftime('%Y-%m') if until else None
+
+    for entry in load_manifest()['files']:
+        if entry['table'] != table:
+            continue
+        if (since_label and entry['month'] < since_label) or (until_label and entry['month'] > until_label):
+            continue
+        with gzip.open(os.path.join(archive_dir(), entry['file']), 'rt', encoding='utf-8') as archive_file:
+            for line in archive_file:
+                row = json.loads(line)
+                if object_id is None or str(row[pk_name]) == str(object_id):
+                    yield row
+
+
+def history_for(model, object_id, include_archived=True):
+    """All history rows for one object, newest first, live and archived"""
+    history_model = history_model_for(model)
+    pk_name = model._meta.pk.attname
+    live = history_model.objects.filter(**{pk_name: object_id}).values()
+    rows = {row['history_id']: json.loads(json.dumps(row, cls=ArchiveEncoder)) for row in live}
+    if include_archived:
+        for row in read_archive(model, object_id):
+            rows.setdefault(row['history_id'], dict(row, archived=True))
+    return sorted(rows.values(), key=lambda row: (row['history_date'], row['history_id']), reverse=True)
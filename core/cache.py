@@ -0,0 +1,167 @@
+"""
+Cache configuration and a small domain caching API.
+
+``cache_from_url`` builds a CACHES entry from ``CACHE_URL``:
+
+    locmem://[name]          per-process memory (development)
+    file:///var/tmp/hims     file-based, shared by processes on one host
+    db://cache_table         database table (run ``createcachetable``)
+    redis://host:6379/0      Redis (production)
+    dummy://                 no caching
+
+``CacheNamespace`` is what application code uses. Keys are namespaced and
+carry a namespace version, so ``invalidate()`` drops every entry at once.
+``get_or_set`` computes a missing value in one caller only (single-flight
+via a short ``cache.add`` lock); concurrent callers wait for that value
+instead of all hitting the database. Hits, misses and recomputes are
+counted per namespace and reported by ``stats()``.
+"""
+import threading
+import time
+import uuid
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlsplit
+
+from django.core.cache import caches
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_from_url(url, key_prefix='', timeout=300):
+    parts = urlsplit(url)
+    if parts.scheme not in BACKENDS:
+        raise ValueError(f"Unsupported cache scheme in CACHE_URL: {parts.scheme!r}")
+
+    config = {
+        'BACKEND': BACKENDS[parts.scheme],
+        'KEY_PREFIX': key_prefix,
+        'TIMEOUT': timeout,
+    }
+    if parts.scheme in ('redis', 'rediss'):
+        config['LOCATION'] = url
+    elif parts.scheme == 'file':
+        config['LOCATION'] = parts.path
+    elif parts.scheme in ('locmem', 'db'):
+        config['LOCATION'] = parts.netloc or parts.path.lstrip('/')
+
+    options = dict(parse_qsl(parts.query))
+    if options and parts.scheme not in ('redis', 'rediss'):
+        config['OPTIONS'] = {key: int(value) if value.isdigit() else value for key, value in options.items()}
+    return config
+
+
+_MISSING = object()
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {'hits': 0, 'misses': 0, 'computes': 0, 'waits': 0})
+
+
+def _count(namespace, counter):
+    with _stats_lock:
+        _stats[namespace][counter] += 1
+
+
+def stats():
+    """Hit/miss counters per namespace for this process"""
+    with _stats_lock:
+        report = {}
+        for namespace, counters in _stats.items():
+            lookups = counters['hits'] + counters['misses']
+            report[namespace] = dict(counters, hit_rate=round(counters['hits'] / lookups, 3) if lookups else None)
+        return report
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class CacheNamespace:
+    def __init__(self, name, timeout=300, alias='default', lock_timeout=10):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+        self.lock_timeout = lock_timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _version_key(self):
+        return f"{self.name}:version"
+
+    def _version(self):
+        version = self.cache.get(self._version_key())
+        if version is None:
+            # Start from the clock so entries from before an eviction are not reused
+            self.cache.add(self._version_key(), int(time.time()), timeout=None)
+            version = self.cache.get(self._version_key(), 0)
+        return version
+
+    def key(self, *parts):
+        suffix = ':'.join(str(part) for part in parts)
+        return f"{self.name}:v{self._version()}:{suffix}"
+
+    def get(self, *parts, default=None):
+        value = self.cache.get(self.key(*parts), _MISSING)
+        if value is _MISSING:
+            _count(self.name, 'misses')
+            return default
+        _count(self.name, 'hits')
+        return value
+
+    def set(self, *parts, value, timeout=None):
+        self.cache.set(self.key(*parts), value, self.timeout if timeout is None else timeout)
+
+    def delete(self, *parts):
+        self.cache.delete(self.key(*parts))
+
+    def get_or_set(self, parts, compute, timeout=None):
+        """Return the cached value for ``parts``, computing it once on a miss"""
+        if not isinstance(parts, (list, tuple)):
+            parts = (parts,)
+        key = self.key(*parts)
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            _count(self.name, 'hits')
+            return value
+        _count(self.name, 'misses')
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        locked = self.cache.add(lock_key, token, timeout=self.lock_timeout)
+        if not locked:
+            # Someone else is computing it; wait for their result
+            _count(self.name, 'waits')
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                value = self.cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+            # The holder died or is very slow; compute it ourselves
+
+        try:
+            _count(self.name, 'computes')
+            value = compute()
+            self.cache.set(key, value, self.timeout if timeout is None else timeout)
+            return value
+        finally:
+            # Only release our own lock: a waiter that gave up never held one, and
+            # ours may have expired and been taken by another caller meanwhile
+            if locked and self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+
+    def invalidate(self):
+        """Drop every entry in the namespace"""
+        try:
+            self.cache.incr(self._version_key())
+        except ValueError:
+            # Version key evicted or never set
+            self.cache.set(self._version_key(), int(time.time()), timeout=None)
@@ -0,0 +1,122 @@
+"""
+Process-local, read-through cache of reference catalogs.
+
+Services, lab tests and medications are looked up by id on hot paths
+(pricing invoice lines, rendering result and dispense lists). Each catalog
+is loaded in one query into immutable records keyed by id and reloaded when
+its ReferenceVersion (core.versioning) moves on. Local changes invalidate
+the cache as soon as they commit; changes made by other processes are seen
+within ``CATALOG_VERSION_CHECK_INTERVAL`` seconds.
+
+Writes must not use a lagging cache, so they look rows up with
+``get_verified``, which forces a version check first. The check reads the
+ReferenceVersion row, which is bumped in the same transaction as the change,
+so it is never stale. Inside ``with catalog.verified():`` the check runs
+once on entry, so pricing a whole invoice costs a single version query.
+"""
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+
+from . import versioning
+
+
+class Catalog:
+    def __init__(self, model_label, fields):
+        self.model_label = model_label
+        self.name = model_label.lower()
+        self.fields = ('id',) + tuple(fields)
+        self.record_class = namedtuple(f"{model_label.split('.')[-1]}Record", self.fields)
+        self._lock = threading.Lock()
+        self._records = None
+        self._version = None
+        self._checked_at = 0.0
+        self._local = threading.local()
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def _check_interval(self):
+        return getattr(settings, 'CATALOG_VERSION_CHECK_INTERVAL', 5)
+
+    def _load(self):
+        version, _ = versioning.current(self.name)
+        rows = self.model._default_manager.values_list(*self.fields)
+        records = {row[0]: self.record_class(*row) for row in rows}
+        with self._lock:
+            self._records = records
+            self._version = version
+            self._checked_at = time.monotonic()
+        return records
+
+    def _current(self, force=False):
+        with self._lock:
+            records = self._records
+            due = force or time.monotonic() - self._checked_at >= self._check_interval()
+        if records is None:
+            return self._load()
+        if not due:
+            return records
+
+        version, _ = versioning.current(self.name)
+        with self._lock:
+            self._checked_at = time.monotonic()
+            unchanged = version == self._version
+        return records if unchanged else self._load()
+
+    def get(self, pk):
+        """Record for ``pk``; raises the model's DoesNotExist if there is none"""
+        record = self._current().get(pk)
+        if record is None:
+            # Possibly created elsewhere since the last version check
+            record = self._current(force=True).get(pk)
+        if record is None:
+            raise self.model.DoesNotExist(f"{self.model_label} {pk} does not exist")
+        return record
+
+    def get_verified(self, pk):
+        """Record for ``pk`` as of now, for writes; checks the version unless inside ``verified()``"""
+        if not getattr(self._local, 'depth', 0):
+            self._current(force=True)
+        return self.get(pk)
+
+    @contextmanager
+    def verified(self):
+        """Check the version once on entry; ``get_verified`` calls inside the block reuse that check"""
+        depth = getattr(self._local, 'depth', 0)
+        if not depth:
+            self._current(force=True)
+        self._local.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._local.depth = depth
+
+    def all(self):
+        return list(self._current().values())
+
+    def invalidate(self):
+        with self._lock:
+            self._records = None
+            self._version = None
+
+
+services = Catalog('billing.Service', ('name', 'code', 'service_type', 'cost', 'is_taxable', 'tax_rate', 'is_active'))
+lab_tests = Catalog('laboratory.LabTest', ('name', 'test_code', 'category', 'price', 'turnaround_time', 'sample_type', 'is_active'))
+medications = Catalog('pharmacy.Medication', (
+    'name', 'generic_name', 'strength', 'dosage_form', 'price',
+    'is_controlled', 'requires_prescription', 'is_active'
+))
+
+CATALOGS = {catalog.name: catalog for catalog in (services, lab_tests, medications)}
+
+
+def invalidate(name):
+    catalog = CATALOGS.get(name)
+    if catalog is not None:
+        catalog.invalidate()
@@ -0,0 +1,64 @@
+"""
+Database configuration helpers.
+
+``database_from_url`` turns ``DATABASE_URL`` into a Django DATABASES entry
+(postgres, mysql or sqlite). ``configure_sqlite`` applies ``SQLITE_PRAGMAS``
+to every new SQLite connection. The defaults put the database in WAL mode,
+so readers do not block the writer on single-node deployments.
+"""
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+ENGINES = {
+    'postgres': 'django.db.backends.postgresql',
+    'postgresql': 'django.db.backends.postgresql',
+    'pgsql': 'django.db.backends.postgresql',
+    'mysql': 'django.db.backends.mysql',
+    'sqlite': 'django.db.backends.sqlite3',
+}
+
+
+def database_from_url(url, conn_max_age=0, conn_health_checks=False):
+    parts = urlsplit(url)
+    if parts.scheme not in ENGINES:
+        raise ValueError(f"Unsupported database scheme in DATABASE_URL: {parts.scheme!r}")
+
+    options = dict(parse_qsl(parts.query))
+    config = {
+        'ENGINE': ENGINES[parts.scheme],
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': conn_health_checks,
+    }
+
+    if parts.scheme == 'sqlite':
+        # sqlite:////abs/path.db, sqlite:///relative.db or sqlite://:memory:
+        path = parts.path
+        if parts.netloc == ':memory:' or path in ('', '/', '/:memory:'):
+            config['NAME'] = ':memory:'
+        else:
+            config['NAME'] = unquote(path[1:])
+        if 'timeout' in options:
+            options['timeout'] = float(options['timeout'])
+    else:
+        config.update({
+            'NAME': unquote(parts.path.lstrip('/')),
+            'USER': unquote(parts.username or ''),
+            'PASSWORD': unquote(parts.password or ''),
+            'HOST': parts.hostname or '',
+            'PORT': str(parts.port or ''),
+        })
+
+    if options:
+        config['OPTIONS'] = options
+    return config
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created handler applying SQLITE_PRAGMAS"""
+    from django.conf import settings
+
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
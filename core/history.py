@@ -0,0 +1,176 @@
+"""
+django-simple-history integration.
+
+``HistoryRequestMiddleware`` only exposes the request (and so the acting
+user) to history records on mutating requests. Safe methods should not
+write, so GETs skip the bookkeeping entirely. A write made during a GET is
+still recorded, just without a history user.
+
+Models tracked with ``BatchedHistoricalRecords`` write history as usual,
+except inside a ``batched_history()`` block: there the rows are collected
+and inserted with one ``bulk_create`` per history table right before the
+block's transaction commits. ``record_history`` and
+``bulk_update_with_history`` cover bulk operations that bypass save().
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+from simple_history.middleware import HistoryRequestMiddleware as BaseHistoryRequestMiddleware
+from simple_history.models import HistoricalRecords
+from simple_history.signals import post_create_historical_record, pre_create_historical_record
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class HistoryRequestMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.tracked = BaseHistoryRequestMiddleware(get_response)
+
+    def __call__(self, request):
+        if request.method in SAFE_METHODS:
+            return self.get_response(request)
+        return self.tracked(request)
+
+
+_current_batch = ContextVar('history_batch', default=None)
+
+
+class HistoryBatch:
+    def __init__(self, using):
+        self.using = using
+        self.records = []
+
+    def add(self, history_instance, signal_kwargs):
+        self.records.append((history_instance, signal_kwargs))
+
+    def flush(self, batch_size=500):
+        records, self.records = self.records, []
+        by_model = defaultdict(list)
+        for history_instance, signal_kwargs in records:
+            by_model[type(history_instance)].append((history_instance, signal_kwargs))
+
+        for history_model, entries in by_model.items():
+            history_model._default_manager.using(self.using).bulk_create(
+                [history_instance for history_instance, _ in entries],
+                batch_size=batch_size
+            )
+            for history_instance, signal_kwargs in entries:
+                post_create_historical_record.send(
+                    sender=history_model,
+                    history_instance=history_instance,
+                    **signal_kwargs
+                )
+        return len(records)
+
+
+@contextmanager
+def batched_history(using=None):
+    """
+    Collect history rows written inside the block and insert them with
+    ``bulk_create`` just before the surrounding transaction commits.
+
+    Opens a transaction (atomic) if needed; nested blocks share the outer
+    batch. On an exception nothing is written, like the rest of the block.
+    """
+    using = using or DEFAULT_DB_ALIAS
+    if _current_batch.get() is not None:
+        with transaction.atomic(using=using):
+            yield _current_batch.get()
+        return
+
+    batch = HistoryBatch(using)
+    with transaction.atomic(using=using):
+        token = _current_batch.set(batch)
+        try:
+            yield batch
+        finally:
+            _current_batch.reset(token)
+        batch.flush()
+
+
+class BatchedHistoricalRecords(HistoricalRecords):
+    """HistoricalRecords that defers its inserts to an active ``batched_history`` block"""
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        cls._meta.batched_history_records = self
+
+    def create_historical_record(self, instance, history_type, using=None):
+        batch = _current_batch.get()
+        if batch is None or self.m2m_fields:
+            return super().create_historical_record(instance, history_type, using=using)
+
+        history_instance, signal_kwargs = build_historical_record(self, instance, history_type, using)
+        batch.add(history_instance, signal_kwargs)
+
+
+def build_historical_record(records, instance, history_type, using=None):
+    """Unsaved history row for ``instance``, as HistoricalRecords would write it"""
+    using = using if records.use_base_model_db else None
+    history_date = getattr(instance, '_history_date', timezone.now())
+    history_user = records.get_history_user(instance)
+    history_change_reason = records.get_change_reason_for_object(instance, history_type, using)
+    manager = getattr(instance, records.manager_name)
+
+    attrs = {field.attname: getattr(instance, field.attname) for field in records.fields_included(instance)}
+    if getattr(manager.model, 'history_relation', None) is not None:
+        attrs['history_relation'] = instance
+
+    history_instance = manager.model(
+        history_date=history_date,
+        history_type=history_type,
+        history_user=history_user,
+        history_change_reason=history_change_reason,
+        **attrs
+    )
+    signal_kwargs = {
+        'instance': instance,
+        'history_date': history_date,
+        'history_user': history_user,
+        'history_change_reason': history_change_reason,
+        'using': using,
+    }
+    pre_create_historical_record.send(
+        sender=manager.model,
+        history_instance=history_instance,
+        **signal_kwargs
+    )
+    return history_instance, signal_kwargs
+
+
+def record_history(objs, history_type='~', using=None):
+    """
+    Write history for objects changed in bulk (``bulk_update``,
+    ``queryset.update``), which bypass save() and so the history signals.
+    Rows join the active ``batched_history`` block, or are bulk inserted
+    straight away.
+    """
+    with batched_history(using=using):
+        batch = _current_batch.get()
+        for obj in objs:
+            records = history_records_for(type(obj))
+            history_instance, signal_kwargs = build_historical_record(records, obj, history_type, using)
+            batch.add(history_instance, signal_kwargs)
+
+
+def bulk_update_with_history(objs, fields, batch_size=None, using=None):
+    """``bulk_update`` plus one history row per object, in a single transaction"""
+    if not objs:
+        return 0
+    model = type(objs[0])
+    with batched_history(using=using):
+        updated = model._default_manager.db_manager(using).bulk_update(objs, fields, batch_size=batch_size)
+        record_history(objs, '~', using=using)
+    return updated
+
+
+def history_records_for(model):
+    """The BatchedHistoricalRecords tracking ``model``"""
+    try:
+        return model._meta.batched_history_records
+    except AttributeError:
+        raise ValueError(f"{model._meta.label} is not tracked with BatchedHistoricalRecords") from None
@@ -0,0 +1,36 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.archive import archive_history, retention_cutoff, tracked_models
+
+
+class Command(BaseCommand):
+    help = 'Move history older than HISTORY_RETENTION_DAYS into gzipped monthly archive files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Retention horizon in days (default: HISTORY_RETENTION_DAYS)')
+        parser.add_argument('--model', action='append', help='Limit to a tracked model, e.g. reception.Patient')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be archived')
+
+    def handle(self, *args, **options):
+        models = None
+        if options['model']:
+            try:
+                models = [apps.get_model(label) for label in options['model']]
+            except LookupError as exc:
+                raise CommandError(str(exc))
+            untracked = [model._meta.label for model in models if model not in tracked_models()]
+            if untracked:
+                raise CommandError(f"Not history-tracked: {', '.join(untracked)}")
+
+        cutoff = retention_cutoff(options['days'])
+        self.stdout.write(f"Archiving history recorded before {cutoff:%Y-%m-%d}")
+        archived = archive_history(
+            days=options['days'],
+            models=models,
+            dry_run=options['dry_run'],
+            log=self.stdout.write
+        )
+        total = sum(entry['rows'] for entry in archived)
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total} rows in {len(archived)} month file(s)"))
@@ -0,0 +1,57 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.profiling import merge_reports
+
+
+class Command(BaseCommand):
+    help = 'Summarise per-route query counts and duplicate SQL collected with QUERY_PROFILING'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Print the merged report as JSON')
+        parser.add_argument('--limit', type=int, default=20, help='Number of routes to show')
+        parser.add_argument('--reset', action='store_true', help='Delete collected reports')
+
+    def handle(self, *args, **options):
+        directory = settings.QUERY_PROFILING_DIR
+        files = []
+        if os.path.isdir(directory):
+            files = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.json')]
+
+        if options['reset']:
+            for path in files:
+                os.remove(path)
+            self.stdout.write(self.style.SUCCESS(f'Removed {len(files)} report file(s)'))
+            return
+
+        reports = []
+        for path in files:
+            with open(path) as report_file:
+                reports.append(json.load(report_file))
+        routes = merge_reports(reports)
+
+        if options['json']:
+            self.stdout.write(json.dumps(routes, indent=2))
+            return
+
+        if not routes:
+            self.stdout.write(f'No query profiles found in {directory}')
+            return
+
+        ordered = sorted(routes.items(), key=lambda item: item[1]['avg_queries'], reverse=True)
+        for route, entry in ordered[:options['limit']]:
+            self.stdout.write(self.style.MIGRATE_HEADING(route))
+            self.stdout.write(
+                f"  requests: {entry['requests']}  avg queries: {entry['avg_queries']}  "
+                f"max queries: {entry['max_queries']}  avg db time: {entry['avg_db_time_ms']} ms"
+            )
+            duplicates = sorted(entry['duplicates'].values(), key=lambda item: item['max_repeats'], reverse=True)
+            for duplicate in duplicates:
+                triggered_by = ', '.join(duplicate['triggered_by']) or 'unknown'
+                self.stdout.write(self.style.WARNING(
+                    f"  x{duplicate['max_repeats']} (in {duplicate['requests']} request(s)) from {triggered_by}"
+                ))
+                self.stdout.write(f"    {duplicate['sql'][:200]}")
@@ -0,0 +1,29 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.replicas import REPLICA_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database onto the replica file (local stand-in for replication)'
+
+    def handle(self, *args, **options):
+        if REPLICA_DB_ALIAS not in connections.databases:
+            raise CommandError('No replica configured; set DATABASE_REPLICA_URL')
+
+        primary = connections['default'].settings_dict
+        replica = connections[REPLICA_DB_ALIAS].settings_dict
+        if primary['ENGINE'] != 'django.db.backends.sqlite3' or replica['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('Both default and replica must be SQLite databases')
+
+        connections[REPLICA_DB_ALIAS].close()
+        source = sqlite3.connect(str(primary['NAME']))
+        target = sqlite3.connect(str(replica['NAME']))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(self.style.SUCCESS(f"Copied {primary['NAME']} to {replica['NAME']}"))
@@ -0,0 +1,71 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from . import versioning
+from .serializers import deferrable_fields
+
+
+class SparseFieldsetMixin:
+    """
+    Viewset mixin for high-volume list endpoints.
+
+    ``list`` uses ``summary_serializer_class`` unless the client picks its own
+    columns with ``?fields=``, and read requests defer every model column
+    the chosen serializer does not render.
+    """
+    summary_serializer_class = None
+
+    def get_serializer_class(self):
+        request = getattr(self, 'request', None)
+        if (
+            self.summary_serializer_class is not None and
+            getattr(self, 'action', None) == 'list' and
+            request is not None and 'fields' not in request.query_params
+        ):
+            return self.summary_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = getattr(self, 'request', None)
+        if request is None or request.method != 'GET':
+            return queryset
+        deferred = deferrable_fields(self.get_serializer())
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for reference data viewsets.
+
+    Validators come from the table's ReferenceVersion (see core.signals), so
+    a matching If-None-Match or If-Modified-Since gets a 304 without the
+    catalog itself being queried.
+    """
+    version_name = None
+
+    def get_version_name(self):
+        return self.version_name or self.queryset.model._meta.label_lower
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        name = self.get_version_name()
+        version, updated_at = versioning.current(name)
+        etag = quote_etag(f"{name}-{version}-{request.accepted_renderer.format}")
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Clients may keep a copy but must revalidate before using it
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,11 @@
+from django.db import models
+
+
+class ReferenceVersion(models.Model):
+    """Change counter for a slowly-changing reference table, used for ETags"""
+    name = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
@@ -0,0 +1,236 @@
+"""
+Opt-in per-request query profiling.
+
+Enable with ``QUERY_PROFILING=True``. For every request the middleware
+records the number of queries, total database time and any SQL statement
+issued more than once with different parameters (the usual N+1 signature),
+together with the serializer field that was being rendered when it ran.
+Results are aggregated per route and written periodically to
+``QUERY_PROFILING_DIR`` (one file per process) so the ``query_profile``
+management command can merge them.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?|\d+)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+_NAMED_GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+# Duplicate fingerprints kept per route in the aggregated report
+MAX_DUPLICATES_PER_ROUTE = 10
+
+
+def fingerprint(sql):
+    """Reduce a SQL statement to its shape, dropping literal values"""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def route_key(request):
+    """'METHOD /pattern' for the URL pattern that served the request"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return f"{request.method} {request.path}"
+    # Router patterns are regexes; show them like path() converters
+    route = _NAMED_GROUP.sub(r'<\1>', match.route).replace('^', '').replace('$', '')
+    return f"{request.method} /{route}"
+
+
+def current_serializer_field():
+    """Return 'Serializer.field' for the innermost field being rendered, if any"""
+    from rest_framework.serializers import BaseSerializer
+
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == 'to_representation':
+            serializer = frame.f_locals.get('self')
+            field = frame.f_locals.get('field')
+            if isinstance(serializer, BaseSerializer) and field is not None:
+                return f"{type(serializer).__name__}.{field.field_name}"
+        frame = frame.f_back
+    return None
+
+
+class RequestProfile:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.examples = {}
+        self.triggers = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+            shape = fingerprint(sql)
+            self.statements[shape] += 1
+            self.examples.setdefault(shape, sql)
+            trigger = current_serializer_field()
+            if trigger:
+                self.triggers.setdefault(shape, set()).add(trigger)
+
+    def duplicates(self):
+        return {shape: count for shape, count in self.statements.items() if count > 1}
+
+
+class ProfileStore:
+    """Thread-safe per-route aggregation of request profiles"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.routes = {}
+
+    def record(self, route, profile):
+        with self._lock:
+            entry = self.routes.setdefault(route, {
+                'requests': 0,
+                'queries': 0,
+                'max_queries': 0,
+                'db_time_ms': 0.0,
+                'duplicates': {},
+            })
+            entry['requests'] += 1
+            entry['queries'] += profile.count
+            entry['max_queries'] = max(entry['max_queries'], profile.count)
+            entry['db_time_ms'] += profile.duration * 1000
+
+            for shape, count in profile.duplicates().items():
+                duplicate = entry['duplicates'].setdefault(shape, {
+                    'sql': profile.examples[shape],
+                    'requests': 0,
+                    'max_repeats': 0,
+                    'triggered_by': [],
+                })
+                duplicate['requests'] += 1
+                duplicate['max_repeats'] = max(duplicate['max_repeats'], count)
+                triggers = set(duplicate['triggered_by']) | profile.triggers.get(shape, set())
+                duplicate['triggered_by'] = sorted(triggers)
+
+            if len(entry['duplicates']) > MAX_DUPLICATES_PER_ROUTE:
+                worst = sorted(
+                    entry['duplicates'].items(),
+                    key=lambda item: item[1]['max_repeats'],
+                    reverse=True
+                )[:MAX_DUPLICATES_PER_ROUTE]
+                entry['duplicates'] = dict(worst)
+
+    def report(self):
+        with self._lock:
+            return json.loads(json.dumps(self.routes))
+
+    def reset(self):
+        with self._lock:
+            self.routes = {}
+        path = report_path()
+        if os.path.exists(path):
+            os.remove(path)
+
+    def maybe_flush(self):
+        interval = getattr(settings, 'QUERY_PROFILING_FLUSH_INTERVAL', 30)
+        with self._lock:
+            if time.monotonic() - self._last_flush < interval:
+                return
+            self._last_flush = time.monotonic()
+        self.flush()
+
+    def flush(self):
+        directory = settings.QUERY_PROFILING_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = report_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as report_file:
+            json.dump(self.report(), report_file)
+        os.replace(tmp_path, path)
+
+
+def report_path():
+    return os.path.join(settings.QUERY_PROFILING_DIR, f"{os.getpid()}.json")
+
+
+def merge_reports(reports):
+    """Combine per-process reports into one per-route report"""
+    merged = {}
+    for report in reports:
+        for route, entry in report.items():
+            target = merged.setdefault(route, {
+                'requests': 0,
+                'queries': 0,
+                'max_queries': 0,
+                'db_time_ms': 0.0,
+                'duplicates': {},
+            })
+            target['requests'] += entry['requests']
+            target['queries'] += entry['queries']
+            target['max_queries'] = max(target['max_queries'], entry['max_queries'])
+            target['db_time_ms'] += entry['db_time_ms']
+            for shape, duplicate in entry['duplicates'].items():
+                existing = target['duplicates'].setdefault(shape, dict(duplicate, requests=0, max_repeats=0, triggered_by=[]))
+                existing['requests'] += duplicate['requests']
+                existing['max_repeats'] = max(existing['max_repeats'], duplicate['max_repeats'])
+                existing['triggered_by'] = sorted(set(existing['triggered_by']) | set(duplicate['triggered_by']))
+
+    for entry in merged.values():
+        entry['avg_queries'] = round(entry['queries'] / entry['requests'], 1) if entry['requests'] else 0
+        entry['avg_db_time_ms'] = round(entry['db_time_ms'] / entry['requests'], 2) if entry['requests'] else 0
+    return merged
+
+
+def collected_reports():
+    """Reports flushed by every process, plus this process's live data"""
+    directory = settings.QUERY_PROFILING_DIR
+    reports = {}
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                with open(os.path.join(directory, name)) as report_file:
+                    reports[name] = json.load(report_file)
+    reports[os.path.basename(report_path())] = store.report()
+    return merge_reports(reports.values())
+
+
+store = ProfileStore()
+
+
+class QueryProfilingMiddleware:
+    """Records query counts, DB time and duplicate SQL per route"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_PROFILING', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        wrappers = [connections[alias].execute_wrapper(profile) for alias in connections]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+
+        store.record(route_key(request), profile)
+        store.maybe_flush()
+
+        response['X-Query-Count'] = str(profile.count)
+        response['X-Query-Time-Ms'] = f"{profile.duration * 1000:.1f}"
+        return response
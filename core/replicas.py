@@ -0,0 +1,94 @@
+"""
+Read-replica routing for analytic endpoints.
+
+Views marked with ``replica_reads`` (function views) or ``replica_reads =
+True`` (class views) have their GET queries routed to the ``replica``
+database when one is configured with ``DATABASE_REPLICA_URL``. Everything
+else, and every write, goes to ``default``.
+
+Read-your-writes: once a request writes, the rest of it reads from primary,
+and the response sets a short-lived cookie that keeps that client's reads
+on primary for ``REPLICA_STICKY_SECONDS`` while the replica catches up.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_COOKIE = 'hims_db_pin'
+
+_request_state = ContextVar('replica_request_state', default=None)
+
+
+class RequestState:
+    def __init__(self, pinned=False):
+        self.use_replica = False
+        self.pinned = pinned
+        self.wrote = False
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in connections.databases
+
+
+def replica_reads(view):
+    """Mark a view as read-only analytics that may be served from the replica"""
+    view.replica_reads = True
+    return view
+
+
+def _is_replica_view(view_func):
+    view_class = getattr(view_func, 'cls', None)
+    return getattr(view_func, 'replica_reads', False) or getattr(view_class, 'replica_reads', False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if (
+            state is not None and state.use_replica and
+            not state.pinned and not state.wrote and replica_configured()
+        ):
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as primary
+        databases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RequestState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 10),
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _request_state.get()
+        if state is not None and request.method in ('GET', 'HEAD') and _is_replica_view(view_func):
+            state.use_replica = True
@@ -0,0 +1,54 @@
+"""
+Sparse fieldsets for API serializers.
+
+``?fields=id,name`` limits a response to the listed fields and ``?omit=notes``
+drops fields from it. Only read requests are pruned: on writes the parameters
+are ignored, so they can never discard submitted data. Serializers opt in with ``SparseFieldsMixin``; viewsets
+using ``SparseFieldsetMixin`` (core.mixins) also defer the model columns no
+remaining field reads, so large text and JSON columns are not fetched.
+"""
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()} if value else set()
+
+
+class SparseFieldsMixin:
+    """Serializer mixin honouring ``?fields=`` and ``?omit=`` on the request
+
+    Fields that read model columns through a method or SerializerMethodField
+    list those columns in ``Meta.source_fields`` so they are never deferred.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS or hasattr(self, 'initial_data'):
+            return
+
+        requested = parse_field_list(request.query_params.get('fields'))
+        omitted = parse_field_list(request.query_params.get('omit'))
+        for name in list(self.fields):
+            if (requested and name not in requested) or name in omitted:
+                self.fields.pop(name)
+
+
+def deferrable_fields(serializer):
+    """Model columns that none of the serializer's fields read"""
+    meta = getattr(serializer, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return []
+
+    source_fields = getattr(meta, 'source_fields', {})
+    needed = {model._meta.pk.name}
+    for name, field in serializer.fields.items():
+        if field.source != '*':
+            needed.add(field.source.split('.')[0])
+        needed.update(source_fields.get(name, ()))
+
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.is_relation and field.name not in needed
+    ]
@@ -0,0 +1,54 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+
+from . import catalog, versioning
+
+# Reference versions bumped by changes to each model
+VERSIONED_MODELS = {
+    'billing.Service': ('billing.service',),
+    'laboratory.LabTest': ('laboratory.labtest',),
+    'pharmacy.Medication': ('pharmacy.medication',),
+    'accounts.Department': ('accounts.department',),
+    # Department lists show the head's name (see VERSIONED_FIELDS)
+    'accounts.User': ('accounts.department',),
+    'ward.Ward': ('ward.ward',),
+    # Ward lists carry bed availability and occupancy
+    'ward.Bed': ('ward.ward',),
+}
+
+# Models whose saves only bump versions when one of these fields changes.
+# Users are saved on every login (last_login), which must not invalidate
+# department ETags.
+VERSIONED_FIELDS = {
+    'accounts.User': ('first_name', 'last_name'),
+}
+
+
+def detect_versioned_changes(sender, instance, raw=False, update_fields=None, **kwargs):
+    fields = VERSIONED_FIELDS[sender._meta.label]
+    if raw or instance.pk is None or (update_fields is not None and not set(fields) & set(update_fields)):
+        # New rows are not referenced by any versioned representation yet
+        instance._versioned_fields_changed = False
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).values_list(*fields).first()
+    instance._versioned_fields_changed = previous != tuple(getattr(instance, field) for field in fields)
+
+
+def bump_reference_versions(sender, instance, signal, **kwargs):
+    if kwargs.get('raw'):
+        return
+    if signal is post_save and not getattr(instance, '_versioned_fields_changed', True):
+        return
+    for name in VERSIONED_MODELS[sender._meta.label]:
+        versioning.bump(name)
+        transaction.on_commit(lambda name=name: catalog.invalidate(name))
+
+
+def connect_signals():
+    for label in VERSIONED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(bump_reference_versions, sender=model, dispatch_uid=f'core_version_{label}_save')
+        post_delete.connect(bump_reference_versions, sender=model, dispatch_uid=f'core_version_{label}_delete')
+        if label in VERSIONED_FIELDS:
+            pre_save.connect(detect_versioned_changes, sender=model, dispatch_uid=f'core_version_{label}_changes')
@@ -0,0 +1,37 @@
+"""
+Shared helpers for the apps' test suites.
+"""
+from rest_framework.test import APIClient
+
+from . import catalog
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin asserting a list endpoint's query count does not grow with the page.
+
+    ``assertListQueries`` calls ``make_row(index)`` until the page holds
+    ``small`` and then ``large`` rows, and requires ``queries`` queries for
+    both requests. Catalog caches (core.catalog) start empty for each
+    request, so their loads count towards the budget.
+    """
+    budget_user = None
+
+    def api_client(self):
+        client = APIClient()
+        client.force_authenticate(self.budget_user)
+        return client
+
+    def assertListQueries(self, url, make_row, queries, small=2, large=6):
+        client = self.api_client()
+        created = 0
+        for rows in (small, large):
+            while created < rows:
+                make_row(created)
+                created += 1
+            for reference in catalog.CATALOGS.values():
+                reference.invalidate()
+            with self.assertNumQueries(queries):
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertGreaterEqual(len(response.data['results']), rows)
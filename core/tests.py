@@ -0,0 +1,61 @@
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.renderers import JSONRenderer
+
+from .cache import CacheNamespace
+from .renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_output_matches_drf(self):
+        data = {
+            'results': [{
+                'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+                'created_at': datetime(2024, 5, 1, 9, 30, 47, 859992, tzinfo=dt_timezone.utc),
+                'naive': datetime(2024, 5, 1, 9, 30),
+                'offset': datetime(2024, 5, 1, 9, 30, tzinfo=dt_timezone(timedelta(hours=3))),
+                'date': date(2024, 5, 1),
+                'time': time(9, 30, 0, 1500),
+                'duration': timedelta(minutes=90),
+                'cost': Decimal('12.50'),
+                'label': _('Active'),
+                'name': 'Zoë Ochieng',
+                'note': 'first line\u2028second line',
+                'score': 1.5,
+                'missing': None,
+            }],
+            1: True,
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_finite_floats_are_rejected(self):
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.assertRaises(ValueError):
+                JSONRenderer().render({'rows': [{'value': value}]})
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render({'rows': [{'value': value}]})
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CacheNamespaceTests(SimpleTestCase):
+    def test_waiter_that_times_out_keeps_the_holders_lock(self):
+        namespace = CacheNamespace('lock-test', lock_timeout=0.1)
+        namespace.cache.clear()
+        lock_key = f"{namespace.key('row')}:lock"
+        namespace.cache.add(lock_key, 'holder', timeout=60)
+
+        self.assertEqual(namespace.get_or_set('row', lambda: 'computed'), 'computed')
+        self.assertEqual(namespace.cache.get(lock_key), 'holder')
+
+    def test_computing_caller_releases_its_lock(self):
+        namespace = CacheNamespace('lock-test')
+        namespace.cache.clear()
+
+        namespace.get_or_set('row', lambda: 'computed')
+
+        self.assertIsNone(namespace.cache.get(f"{namespace.key('row')}:lock"))
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('query-profile/', views.QueryProfileView.as_view(), name='query-profile'),
+    path('cache-stats/', views.CacheStatsView.as_view(), name='cache-stats'),
+    path('history/<str:app_label>/<str:model_name>/<str:pk>/', views.ObjectHistoryView.as_view(), name='object-history'),
+]
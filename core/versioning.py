@@ -0,0 +1,36 @@
+"""
+Version stamps for reference data.
+
+Each catalog (services, lab tests, medications, wards, departments) has a
+ReferenceVersion row whose counter is bumped in the same transaction as any
+change to the rows it covers. Views derive ETag and Last-Modified headers
+from it, so a conditional GET is answered from this one-row lookup without
+reading the catalog table itself.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ReferenceVersion
+
+
+def bump(name):
+    """Advance the version of a reference table"""
+    updated = ReferenceVersion.objects.filter(name=name).update(
+        version=F('version') + 1,
+        updated_at=timezone.now()
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            ReferenceVersion.objects.create(name=name, version=1)
+    except IntegrityError:
+        # Created concurrently by another writer
+        ReferenceVersion.objects.filter(name=name).update(version=F('version') + 1, updated_at=timezone.now())
+
+
+def current(name):
+    """Return (version, updated_at) for a reference table, (0, None) if never changed"""
+    row = ReferenceVersion.objects.filter(name=name).values_list('version', 'updated_at').first()
+    return row or (0, None)
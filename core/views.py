@@ -0,0 +1,56 @@
+from django.apps import apps
+from django.http import Http404
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
+
+from . import archive, cache, profiling
+
+
+class QueryProfileView(APIView):
+    """Per-route query report collected by QueryProfilingMiddleware"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        routes = profiling.collected_reports()
+        ordered = sorted(routes.items(), key=lambda item: item[1]['avg_queries'], reverse=True)
+        return Response({
+            'enabled': settings.QUERY_PROFILING,
+            'routes': [dict(route=route, **entry) for route, entry in ordered]
+        })
+
+    def delete(self, request):
+        profiling.store.reset()
+        return Response(status=204)
+
+
+class CacheStatsView(APIView):
+    """Hit/miss counters per cache namespace in this process"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'backend': settings.CACHES['default']['BACKEND'],
+            'namespaces': cache.stats()
+        })
+
+    def delete(self, request):
+        cache.reset_stats()
+        return Response(status=204)
+
+
+class ObjectHistoryView(APIView):
+    """Change history of one record, including months moved to the archive"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, app_label, model_name, pk):
+        try:
+            model = apps.get_model(app_label, model_name)
+        except LookupError:
+            raise Http404
+        if model not in archive.tracked_models():
+            raise Http404
+
+        include_archived = request.query_params.get('include_archived', 'true').lower() != 'false'
+        return Response(archive.history_for(model, pk, include_archived=include_archived))
@@ -0,0 +1,33 @@
+from .models import ActivityEvent
+
+
+def record_activity(actor, event_type, action, target, department='', obj=None):
+    """
+    Append an event to the activity feed
+    
+    Args:
+        actor: User who performed the action
+        event_type: One of ActivityEvent.EVENT_TYPE_CHOICES
+        action: Verb phrase, e.g. 'received payment from'
+        target: Display name of whoever or whatever the action was applied to
+        department: Department the event belongs to, used for filtering
+        obj: Optional model instance the event refers to
+    """
+    event = build_activity(actor, event_type, action, target, department, obj)
+    event.save()
+    return event
+
+
+def build_activity(actor, event_type, action, target, department='', obj=None):
+    """Unsaved event with the same snapshot fields ``record_activity`` writes"""
+    return ActivityEvent(
+        event_type=event_type,
+        department=department or '',
+        actor=actor,
+        actor_name=actor.get_full_name(),
+        actor_role=actor.get_user_type_display(),
+        actor_avatar=actor.profile_picture.url if actor.profile_picture else '',
+        action=action,
+        target=target,
+        object_id=obj.pk if obj is not None else None
+    )
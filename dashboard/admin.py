@@ -1,3 +1,15 @@
 from django.contrib import admin
+from .models import ActivityEvent
 
-# Register your models here.
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    list_display = ('actor_name', 'action', 'target', 'event_type', 'department', 'created_at')
+    list_filter = ('event_type', 'department', 'created_at')
+    search_fields = ('actor_name', 'target')
+    
+    # The feed is append-only
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
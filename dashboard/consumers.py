@@ -0,0 +1,57 @@
+import asyncio
+import json
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .live import snapshot, DASHBOARD_GROUP
+
+class DashboardConsumer(AsyncWebsocketConsumer):
+    async def connect(self):
+        self.user = self.scope["user"]
+        
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+        
+        # Join dashboard group
+        await self.channel_layer.group_add(
+            DASHBOARD_GROUP,
+            self.channel_name
+        )
+        snapshot.subscribe(asyncio.get_running_loop())
+        
+        await self.accept()
+        await self.send_snapshot()
+    
+    async def disconnect(self, close_code):
+        if not self.user.is_authenticated:
+            return
+        
+        # Leave dashboard group
+        snapshot.unsubscribe()
+        await self.channel_layer.group_discard(
+            DASHBOARD_GROUP,
+            self.channel_name
+        )
+    
+    # Receive message from WebSocket
+    async def receive(self, text_data):
+        data = json.loads(text_data)
+        
+        if data.get('type', '') == 'refresh':
+            await self.send_snapshot()
+    
+    # Receive delta from group
+    async def dashboard_delta(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'dashboard_delta',
+            'sections': event['sections']
+        }))
+    
+    async def send_snapshot(self):
+        sections = await database_sync_to_async(snapshot.full)()
+        await self.send(text_data=json.dumps({
+            'type': 'dashboard_snapshot',
+            'sections': sections
+        }, cls=DjangoJSONEncoder))
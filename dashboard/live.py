@@ -0,0 +1,184 @@
+"""
+Shared in-process dashboard snapshot.
+
+Every open dashboard used to poll each widget endpoint, so database load grew
+with the number of screens. Instead, one snapshot per process is kept here.
+Model signals mark the affected sections dirty, dirty sections are recomputed
+at most once per ``DASHBOARD_PUSH_INTERVAL`` seconds and only the changed
+parts are pushed to the ``dashboard`` channel group. Sections are also
+recomputed on read once older than ``DASHBOARD_SNAPSHOT_MAX_AGE`` seconds, so
+wait times and "time ago" labels do not freeze while nothing changes.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+
+from . import services
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_GROUP = 'dashboard'
+
+SECTIONS = {
+    'stats': services.dashboard_stats,
+    'patient_queue': services.patient_queue,
+    'bed_occupancy': services.bed_occupancy,
+    'revenue_chart': services.revenue_chart,
+    'recent_activity': services.recent_activity,
+}
+
+
+def _diff(old, new):
+    """Return the part of ``new`` that differs from ``old``, or None if unchanged"""
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        return {key: value for key, value in new.items() if old.get(key) != value}
+    return new
+
+
+class DashboardSnapshot:
+    def __init__(self, interval=None):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._data = {}
+        self._computed_at = {}
+        self._dirty = set(SECTIONS)
+        # Sections awaiting a push, and the last value pushed for each. Reads
+        # clear ``_dirty`` but not these, so a read inside the coalescing
+        # window cannot swallow the push.
+        self._pending = set()
+        self._pushed = {}
+        self._timer = None
+        self._last_push = 0.0
+        self.subscribers = 0
+        self._loop = None
+
+    def get_interval(self):
+        if self.interval is not None:
+            return self.interval
+        return getattr(settings, 'DASHBOARD_PUSH_INTERVAL', 1.0)
+
+    def _is_fresh(self, section):
+        max_age = getattr(settings, 'DASHBOARD_SNAPSHOT_MAX_AGE', 60)
+        return (
+            section in self._data and
+            section not in self._dirty and
+            time.monotonic() - self._computed_at[section] < max_age
+        )
+
+    def _store(self, section, value):
+        self._data[section] = value
+        self._computed_at[section] = time.monotonic()
+
+    def get(self, section):
+        """Return a section, recomputing it first if it is stale"""
+        with self._lock:
+            if self._is_fresh(section):
+                return self._data[section]
+        value = SECTIONS[section]()
+        with self._lock:
+            self._store(section, value)
+            self._dirty.discard(section)
+        return value
+
+    def full(self):
+        return {section: self.get(section) for section in SECTIONS}
+
+    def mark_dirty(self, *sections):
+        """Flag sections as stale and schedule a coalesced push"""
+        with self._lock:
+            self._dirty.update(sections)
+            if self.subscribers <= 0:
+                return
+            for section in set(sections) - self._pending:
+                # Clients hold the last pushed value, or what they loaded on connect
+                self._pushed.setdefault(section, self._data.get(section))
+            self._pending.update(sections)
+            self._schedule()
+
+    def _schedule(self):
+        # Caller holds the lock
+        if self._timer is not None:
+            # A push is already scheduled and will include these sections
+            return
+        delay = max(0.0, self._last_push + self.get_interval() - time.monotonic())
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Recompute sections awaiting a push and send what changed since the last push"""
+        with self._lock:
+            pending = self._pending & set(SECTIONS)
+            self._pending = set()
+            self._dirty -= pending
+            self._timer = None
+            self._last_push = time.monotonic()
+            previous = {section: self._pushed.get(section) for section in pending}
+
+        if not pending:
+            return
+
+        delta = {}
+        values = {}
+        try:
+            for section in pending:
+                values[section] = SECTIONS[section]()
+                with self._lock:
+                    self._store(section, values[section])
+                changed = _diff(previous[section], values[section])
+                if changed is not None:
+                    delta[section] = changed
+        except Exception:
+            logger.exception("Failed to refresh dashboard snapshot")
+            with self._lock:
+                self._dirty.update(pending)
+                self._pending.update(pending)
+                if self.subscribers > 0:
+                    # Retry after the usual interval rather than waiting for the next change
+                    self._schedule()
+            return
+        finally:
+            # Flushes run on their own timer thread, so release its connection
+            connections.close_all()
+
+        with self._lock:
+            self._pushed.update(values)
+        if delta:
+            self._send({
+                'type': 'dashboard_delta',
+                # Channel layers only carry plain JSON types (no Decimal)
+                'sections': json.loads(json.dumps(delta, cls=DjangoJSONEncoder))
+            })
+
+    def _send(self, message):
+        group_send = get_channel_layer().group_send
+        if self._loop is not None and not self._loop.is_closed():
+            # Flushes run on a timer thread; hand the send back to the event
+            # loop the consumers live on (required by the in-memory layer).
+            future = asyncio.run_coroutine_threadsafe(group_send(DASHBOARD_GROUP, message), self._loop)
+            future.result()
+        else:
+            async_to_sync(group_send)(DASHBOARD_GROUP, message)
+
+    def subscribe(self, loop=None):
+        with self._lock:
+            self.subscribers += 1
+            if loop is not None:
+                self._loop = loop
+
+    def unsubscribe(self):
+        with self._lock:
+            self.subscribers = max(0, self.subscribers - 1)
+
+
+snapshot = DashboardSnapshot()
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from billing.models import Payment
+from core import catalog
+from dashboard.activity import build_activity
+from dashboard.models import ActivityEvent
+from laboratory.models import LabResult
+from ward.models import WardStay
+
+
+def _recorded(event_type):
+    return ActivityEvent.objects.filter(event_type=event_type, object_id__isnull=False).values('object_id')
+
+
+class Command(BaseCommand):
+    help = 'Add feed events for recent payments, verified lab results and admissions that predate the feed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='How far back to seed (default: 7)')
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days'])
+        events = []
+
+        payments = Payment.objects.filter(payment_date__gte=since).exclude(
+            pk__in=_recorded('payment')
+        ).select_related('invoice__patient', 'received_by')
+        for payment in payments:
+            action = 'received insurance payment for' if payment.payment_method == 'insurance' else 'received payment from'
+            events.append((payment.payment_date, build_activity(
+                payment.received_by, 'payment', action, payment.invoice.patient.get_full_name(), 'billing', payment
+            )))
+
+        results = LabResult.objects.filter(verified_at__gte=since, verified_by__isnull=False).exclude(
+            pk__in=_recorded('lab_result')
+        ).select_related('patient', 'verified_by')
+        for result in results:
+            events.append((result.verified_at, build_activity(
+                result.verified_by, 'lab_result', f'verified {catalog.lab_tests.get(result.test_id).name} results for',
+                result.patient.get_full_name(), 'laboratory', result
+            )))
+
+        stays = WardStay.objects.filter(admission_date__gte=since).exclude(
+            pk__in=_recorded('admission')
+        ).select_related('patient', 'admitting_doctor__user')
+        for stay in stays:
+            events.append((stay.admission_date, build_activity(
+                stay.admitting_doctor.user, 'admission', 'admitted', stay.patient.get_full_name(), 'ward', stay
+            )))
+
+        with transaction.atomic():
+            for happened_at, event in events:
+                event.save()
+                # created_at is auto_now_add; backdate it to when the action happened
+                event.created_at = happened_at
+            ActivityEvent.objects.bulk_update([event for _, event in events], ['created_at'], batch_size=500)
+        self.stdout.write(self.style.SUCCESS(f"Seeded {len(events)} activity event(s) since {since:%Y-%m-%d %H:%M}"))
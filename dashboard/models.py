@@ -0,0 +1,42 @@
+from django.db import models
+from accounts.models import User
+
+class ActivityEvent(models.Model):
+    """
+    Append-only feed of notable actions across departments.
+    
+    Actor and target details are copied onto the row when the event is
+    written, so reading the feed never has to follow foreign keys.
+    """
+    EVENT_TYPE_CHOICES = (
+        ('admission', 'Admission'),
+        ('consultation', 'Consultation'),
+        ('payment', 'Payment'),
+        ('lab_result', 'Lab Result'),
+        ('dispense', 'Medication Dispense'),
+        ('triage', 'Triage'),
+    )
+    
+    event_type = models.CharField(max_length=20, choices=EVENT_TYPE_CHOICES)
+    department = models.CharField(max_length=100, blank=True)
+    
+    # Actor snapshot
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_events')
+    actor_name = models.CharField(max_length=200)
+    actor_role = models.CharField(max_length=50, blank=True)
+    actor_avatar = models.CharField(max_length=255, blank=True)
+    
+    action = models.CharField(max_length=100)
+    target = models.CharField(max_length=200)
+    object_id = models.PositiveBigIntegerField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"{self.actor_name} {self.action} {self.target}"
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['department', '-created_at'], name='activity_dept_created_idx'),
+        ]
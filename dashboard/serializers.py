@@ -0,0 +1,25 @@
+from rest_framework import serializers
+from .models import ActivityEvent
+from .services import get_time_ago
+
+class ActivityEventSerializer(serializers.ModelSerializer):
+    id = serializers.SerializerMethodField()
+    user = serializers.SerializerMethodField()
+    time = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ActivityEvent
+        fields = ['id', 'event_type', 'department', 'user', 'action', 'target', 'time', 'created_at']
+    
+    def get_id(self, obj):
+        return f"{obj.event_type}{obj.id}"
+    
+    def get_user(self, obj):
+        return {
+            'name': obj.actor_name,
+            'avatar': obj.actor_avatar or None,
+            'role': obj.actor_role
+        }
+    
+    def get_time(self, obj):
+        return get_time_ago(obj.created_at)
@@ -0,0 +1,187 @@
+from django.db.models import Sum
+from django.utils import timezone
+from datetime import timedelta
+
+from reception.models import Patient
+from ward import census
+from ward.models import Ward, Bed, WardStay
+from billing.models import Payment
+
+
+def get_time_ago(timestamp):
+    """Convert timestamp to human-readable time ago format"""
+    now = timezone.now()
+    diff = now - timestamp
+
+    if diff.days > 0:
+        return f"{diff.days} {'day' if diff.days == 1 else 'days'} ago"
+
+    hours = diff.seconds // 3600
+    if hours > 0:
+        return f"{hours} {'hour' if hours == 1 else 'hours'} ago"
+
+    minutes = diff.seconds // 60
+    if minutes > 0:
+        return f"{minutes} {'minute' if minutes == 1 else 'minutes'} ago"
+
+    return "just now"
+
+
+def dashboard_stats(days=30):
+    """Headline figures for the dashboard stat cards"""
+    start_date = timezone.now() - timedelta(days=days)
+
+    # Total patients
+    total_patients = Patient.objects.count()
+    new_patients = Patient.objects.filter(registration_date__gte=start_date).count()
+
+    # Bed occupancy
+    total_beds = Bed.objects.filter(is_active=True).count()
+    occupied_beds = Bed.objects.filter(is_active=True, status='occupied').count()
+    occupancy_rate = (occupied_beds / total_beds * 100) if total_beds > 0 else 0
+
+    # Revenue
+    today = timezone.now().date()
+    daily_revenue = Payment.objects.filter(
+        payment_date__date=today
+    ).aggregate(total=Sum('amount'))['total'] or 0
+
+    yesterday = today - timedelta(days=1)
+    yesterday_revenue = Payment.objects.filter(
+        payment_date__date=yesterday
+    ).aggregate(total=Sum('amount'))['total'] or 0
+
+    revenue_change = 0
+    if yesterday_revenue > 0:
+        revenue_change = ((daily_revenue - yesterday_revenue) / yesterday_revenue) * 100
+
+    # Active cases
+    active_cases = WardStay.objects.filter(is_active=True).count()
+
+    # Change since the ward census snapshot taken this time yesterday
+    occupancy_change = cases_change = 0
+    occupancy_label, cases_label = "Current occupancy rate", "Current active cases"
+    yesterday_census = census.snapshot_at(timezone.now() - timedelta(days=1))
+    if yesterday_census:
+        occupancy_change = round(occupancy_rate - yesterday_census['occupancy_rate'], 1)
+        occupancy_label = f"{'+' if occupancy_change >= 0 else ''}{occupancy_change:.1f} pts from yesterday"
+        if yesterday_census['active_stays']:
+            cases_change = (active_cases - yesterday_census['active_stays']) / yesterday_census['active_stays'] * 100
+        cases_label = f"{'+' if active_cases >= yesterday_census['active_stays'] else ''}{active_cases - yesterday_census['active_stays']} from yesterday"
+
+    return {
+        'total_patients': {
+            'value': total_patients,
+            'change': (new_patients / total_patients * 100) if total_patients > 0 else 0,
+            'change_label': f"+{new_patients} from last {days} days"
+        },
+        'bed_occupancy': {
+            'value': occupancy_rate,
+            'total_beds': total_beds,
+            'occupied_beds': occupied_beds,
+            'change': occupancy_change,
+            'change_label': occupancy_label
+        },
+        'daily_revenue': {
+            'value': daily_revenue,
+            'change': revenue_change,
+            'change_label': f"{'+' if revenue_change >= 0 else ''}{revenue_change:.1f}% from yesterday"
+        },
+        'active_cases': {
+            'value': active_cases,
+            'change': cases_change,
+            'change_label': cases_label
+        }
+    }
+
+
+def patient_queue():
+    """Patients in queue (checked in but not yet seen)"""
+    from reception.models import Queue
+
+    queued_patients = Queue.objects.filter(
+        status='waiting'
+    ).select_related('patient')
+
+    queue_data = []
+    for queue_entry in queued_patients:
+        # Calculate wait time
+        wait_time = timezone.now() - queue_entry.check_in_time
+        wait_minutes = int(wait_time.total_seconds() / 60)
+
+        queue_data.append({
+            'id': queue_entry.patient.patient_id,
+            'name': queue_entry.patient.get_full_name(),
+            'age': queue_entry.patient.age(),
+            'gender': queue_entry.patient.get_gender_display(),
+            'waitTime': f"{wait_minutes} min",
+            'priority': queue_entry.priority,
+            'department': queue_entry.department
+        })
+
+    return queue_data
+
+
+def bed_occupancy():
+    """Overall and per-ward bed occupancy"""
+    total_beds = Bed.objects.filter(is_active=True).count()
+    occupied_beds = Bed.objects.filter(is_active=True, status='occupied').count()
+    available_beds = total_beds - occupied_beds
+
+    # Get ward-specific data
+    wards = Ward.objects.filter(is_active=True)
+    ward_data = []
+
+    for ward in wards:
+        ward_beds = ward.beds.filter(is_active=True)
+        total = ward_beds.count()
+        occupied = ward_beds.filter(status='occupied').count()
+
+        ward_data.append({
+            'name': ward.name,
+            'total': total,
+            'occupied': occupied
+        })
+
+    return {
+        'overall': [
+            {'name': 'Occupied', 'value': occupied_beds, 'color': '#ef4444'},
+            {'name': 'Available', 'value': available_beds, 'color': '#22c55e'}
+        ],
+        'wards': ward_data
+    }
+
+
+def revenue_chart():
+    """Revenue per day for the past 7 days"""
+    end_date = timezone.now().date()
+    start_date = end_date - timedelta(days=6)
+
+    # Initialize data for all 7 days
+    revenue_data = []
+    current_date = start_date
+
+    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+    while current_date <= end_date:
+        day_revenue = Payment.objects.filter(
+            payment_date__date=current_date
+        ).aggregate(total=Sum('amount'))['total'] or 0
+
+        revenue_data.append({
+            'day': days[current_date.weekday()],
+            'revenue': float(day_revenue)
+        })
+
+        current_date += timedelta(days=1)
+
+    return revenue_data
+
+
+def recent_activity(limit=10):
+    """Latest events from the activity feed"""
+    from .models import ActivityEvent
+    from .serializers import ActivityEventSerializer
+
+    events = ActivityEvent.objects.all()[:limit]
+    return ActivityEventSerializer(events, many=True).data
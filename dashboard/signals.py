@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from reception.models import Patient, Queue
+from ward.models import Ward, Bed, WardStay
+from billing.models import Payment
+from .live import snapshot
+from .models import ActivityEvent
+
+# Dashboard sections affected by changes to each model
+WATCHED_MODELS = {
+    Patient: ('stats',),
+    Queue: ('patient_queue',),
+    Ward: ('bed_occupancy',),
+    Bed: ('stats', 'bed_occupancy'),
+    WardStay: ('stats',),
+    Payment: ('stats', 'revenue_chart'),
+    ActivityEvent: ('recent_activity',),
+}
+
+
+def mark_dashboard_dirty(sender, **kwargs):
+    sections = WATCHED_MODELS[sender]
+    transaction.on_commit(lambda: snapshot.mark_dirty(*sections))
+
+
+def connect_signals():
+    for model in WATCHED_MODELS:
+        post_save.connect(mark_dashboard_dirty, sender=model, dispatch_uid=f'dashboard_{model.__name__}_save')
+        post_delete.connect(mark_dashboard_dirty, sender=model, dispatch_uid=f'dashboard_{model.__name__}_delete')
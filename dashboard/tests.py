@@ -0,0 +1,78 @@
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from billing.models import Invoice, Payment
+from reception.models import Patient
+from . import live
+from .models import ActivityEvent
+
+
+class DashboardSnapshotTests(SimpleTestCase):
+    def setUp(self):
+        self.value = {'count': 1}
+        patcher = mock.patch.dict(live.SECTIONS, {'stats': lambda: dict(self.value)}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.snapshot = live.DashboardSnapshot(interval=60)
+        self.snapshot.subscribe()
+        self.snapshot._send = mock.Mock()
+        # Keep the coalescing timer from firing during the test; tests flush explicitly
+        self.snapshot._last_push = time.monotonic()
+        self.snapshot.get('stats')
+
+    def tearDown(self):
+        if self.snapshot._timer is not None:
+            self.snapshot._timer.cancel()
+
+    def test_read_inside_coalescing_window_keeps_the_push(self):
+        self.value['count'] = 2
+        self.snapshot.mark_dirty('stats')
+        self.assertEqual(self.snapshot.get('stats'), {'count': 2})
+
+        self.snapshot.flush()
+
+        self.snapshot._send.assert_called_once()
+        self.assertEqual(self.snapshot._send.call_args.args[0]['sections'], {'stats': {'count': 2}})
+
+    def test_unchanged_section_is_not_pushed(self):
+        self.snapshot.mark_dirty('stats')
+        self.snapshot.flush()
+
+        self.snapshot._send.assert_not_called()
+
+    def test_failed_flush_schedules_a_retry(self):
+        self.snapshot.mark_dirty('stats')
+        with mock.patch.dict(live.SECTIONS, {'stats': mock.Mock(side_effect=RuntimeError)}), \
+                self.assertLogs('dashboard', 'ERROR'):
+            self.snapshot.flush()
+
+        self.assertIsNotNone(self.snapshot._timer)
+        self.assertIn('stats', self.snapshot._pending)
+
+
+class SeedActivityFeedTests(TestCase):
+    def test_recent_payments_are_seeded_once_at_their_own_time(self):
+        cashier = User.objects.create_user(
+            username='cashier', email='cashier@example.com', password='x', user_type='accountant', department='billing'
+        )
+        patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+        invoice = Invoice.objects.create(patient=patient, invoice_number='INV1', due_date=date.today(), created_by=cashier)
+        payment = Payment.objects.create(invoice=invoice, amount=10, payment_method='cash', received_by=cashier)
+        Payment.objects.filter(pk=payment.pk).update(payment_date=timezone.now() - timedelta(days=2))
+
+        call_command('seed_activity_feed', stdout=StringIO())
+        call_command('seed_activity_feed', stdout=StringIO())
+
+        event = ActivityEvent.objects.get()
+        self.assertEqual((event.event_type, event.object_id, event.target), ('payment', payment.pk, 'Jane Doe'))
+        self.assertEqual(event.created_at, Payment.objects.get(pk=payment.pk).payment_date)
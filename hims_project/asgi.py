@@ -1,18 +1,26 @@
 import os
 from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hims_project.settings')
+
+# Initialize Django before importing consumers, which import models
+django_asgi_app = get_asgi_application()
+
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.security.websocket import AllowedHostsOriginValidator
 from notifications.middleware import TokenAuthMiddleware
 import notifications.routing
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hims_project.settings')
+import dashboard.routing
+import reception.routing
 
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": django_asgi_app,
     "websocket": AllowedHostsOriginValidator(
         TokenAuthMiddleware(
             URLRouter(
-                notifications.routing.websocket_urlpatterns
+                notifications.routing.websocket_urlpatterns +
+                dashboard.routing.websocket_urlpatterns +
+                reception.routing.websocket_urlpatterns
             )
         )
     ),
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 from decouple import config, Csv
+from core.cache import cache_from_url
+from core.database import database_from_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,6 +45,7 @@ INSTALLED_APPS = [
     'dashboard',
     'notifications',
     'reports',
+    'core',
 ]
 
 MIDDLEWARE = [
@@ -54,7 +57,9 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'simple_history.middleware.HistoryRequestMiddleware',
+    'core.history.HistoryRequestMiddleware',
+    'core.replicas.ReplicaRoutingMiddleware',
+    'core.profiling.QueryProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'hims_project.urls'
@@ -79,13 +84,62 @@ WSGI_APPLICATION = 'hims_project.wsgi.application'
 ASGI_APPLICATION = 'hims_project.asgi.application'
 
 # Database
+# Defaults to a local SQLite file; docker-compose passes a postgresql:// URL
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_url(
+        config('DATABASE_URL', default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+        # Keep connections open between requests instead of reconnecting each time
+        conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+        conn_health_checks=True,
+    )
+}
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Wait for the write lock instead of failing with "database is locked"
+    DATABASES['default'].setdefault('OPTIONS', {}).setdefault('timeout', 20)
+
+# Set when connecting through PgBouncer in transaction pooling mode
+if config('DB_PGBOUNCER', default=False, cast=bool):
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Optional read replica for reports and analytics (see core.replicas)
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default='')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = database_from_url(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DATABASES['default']['CONN_MAX_AGE'],
+        conn_health_checks=True,
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
+# Seconds a client's reads stay on primary after it writes
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+# Applied to every new SQLite connection (see core.database.configure_sqlite).
+# WAL lets readers proceed while a write is in progress.
+SQLITE_PRAGMAS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+    'mmap_size': 134217728,
+}
+
+# Cache: locmem:// in development, redis:// in production (see core.cache)
+CACHES = {
+    'default': cache_from_url(
+        config('CACHE_URL', default=config('REDIS_URL', default='locmem://hims')),
+        key_prefix='hims',
+        timeout=config('CACHE_TIMEOUT', default=300, cast=int),
+    )
 }
 
+# Sessions (admin, browsable API) are read from the cache, written through to the DB
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+
 # Channel layers for WebSockets (using in-memory for development)
 CHANNEL_LAYERS = {
     'default': {
@@ -93,6 +147,54 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Live dashboard: minimum seconds between WebSocket pushes, and how long a
+# snapshot section may be served before it is recomputed on read
+DASHBOARD_PUSH_INTERVAL = config('DASHBOARD_PUSH_INTERVAL', default=1.0, cast=float)
+DASHBOARD_SNAPSHOT_MAX_AGE = config('DASHBOARD_SNAPSHOT_MAX_AGE', default=60, cast=int)
+
+# Seconds a process keeps its in-memory department queue before reloading it
+LIVE_QUEUE_MAX_AGE = config('LIVE_QUEUE_MAX_AGE', default=30, cast=int)
+
+# Per-route query profiling (N+1 detection); off unless explicitly enabled
+QUERY_PROFILING = config('QUERY_PROFILING', default=False, cast=bool)
+QUERY_PROFILING_DIR = config('QUERY_PROFILING_DIR', default=str(BASE_DIR / 'query_profiles'))
+QUERY_PROFILING_FLUSH_INTERVAL = config('QUERY_PROFILING_FLUSH_INTERVAL', default=30, cast=int)
+
+# History rows older than this (whole months) are moved to gzipped archives
+# by the archive_history command
+HISTORY_RETENTION_DAYS = config('HISTORY_RETENTION_DAYS', default=365, cast=int)
+HISTORY_ARCHIVE_DIR = config('HISTORY_ARCHIVE_DIR', default=str(BASE_DIR / 'history_archive'))
+
+# Seconds between checks for catalog (service, lab test, medication) changes made by other processes
+CATALOG_VERSION_CHECK_INTERVAL = config('CATALOG_VERSION_CHECK_INTERVAL', default=5, cast=int)
+
+# Early warning alerts: lowest risk level (low, low_medium, medium, high) that
+# notifies the ward's head nurse, and seconds between repeat alerts per stay
+EARLY_WARNING_ALERT_RISK = config('EARLY_WARNING_ALERT_RISK', default='medium')
+EARLY_WARNING_ALERT_COOLDOWN = config('EARLY_WARNING_ALERT_COOLDOWN', default=3600, cast=int)
+
+# Most readings accepted in one bulk vitals upload
+VITALS_INGEST_MAX_BATCH = config('VITALS_INGEST_MAX_BATCH', default=5000, cast=int)
+
+# Hours ahead that recurring nursing task rules are expanded into tasks
+NURSING_TASK_HORIZON_HOURS = config('NURSING_TASK_HORIZON_HOURS', default=24, cast=int)
+
+# Minutes between ward census snapshots (schedule take_census at this interval)
+CENSUS_INTERVAL_MINUTES = config('CENSUS_INTERVAL_MINUTES', default=60, cast=int)
+
+# Bed forecasts: days of completed stays used for length-of-stay estimates, and
+# the longest a cached forecast is served without an admission or discharge
+BED_FORECAST_HISTORY_DAYS = config('BED_FORECAST_HISTORY_DAYS', default=180, cast=int)
+BED_FORECAST_CACHE_SECONDS = config('BED_FORECAST_CACHE_SECONDS', default=3600, cast=int)
+
+# Appointment booking: slot length, clinic hours (HH:MM), working days
+# (0 = Monday) and how many days ahead first-available searches look
+APPOINTMENT_SLOT_MINUTES = config('APPOINTMENT_SLOT_MINUTES', default=30, cast=int)
+APPOINTMENT_DAY_START = config('APPOINTMENT_DAY_START', default='08:00')
+APPOINTMENT_DAY_END = config('APPOINTMENT_DAY_END', default='17:00')
+APPOINTMENT_WORKING_DAYS = config('APPOINTMENT_WORKING_DAYS', default='0,1,2,3,4', cast=Csv(cast=int))
+APPOINTMENT_SEARCH_DAYS = config('APPOINTMENT_SEARCH_DAYS', default=60, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -147,6 +249,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -17,6 +17,7 @@ urlpatterns = [
     path('api/dashboard/', include('dashboard.urls')),
     path('api/notifications/', include('notifications.urls')),
     path('api/reports/', include('reports.urls')),
+    path('api/system/', include('core.urls')),
     
     # Serve the frontend in production
     path('', TemplateView.as_view(template_name='index.html')),
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from core import catalog
+from core.serializers import SparseFieldsMixin
 from .models import LabTest, LabResult, Sample
 from reception.serializers import PatientSerializer
 
@@ -7,7 +9,7 @@ class LabTestSerializer(serializers.ModelSerializer):
         model = LabTest
         fields = '__all__'
 
-class LabResultSerializer(serializers.ModelSerializer):
+class LabResultSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
     test_name = serializers.SerializerMethodField()
     technician_name = serializers.SerializerMethodField()
@@ -20,11 +22,20 @@ class LabResultSerializer(serializers.ModelSerializer):
         return f"{obj.patient.first_name} {obj.patient.last_name}"
     
     def get_test_name(self, obj):
-        return obj.test.name
+        return catalog.lab_tests.get(obj.test_id).name
     
     def get_technician_name(self, obj):
         return obj.technician.get_full_name()
 
+class LabResultSummarySerializer(LabResultSerializer):
+    """Result list columns, without the results payload and interpretation"""
+    
+    class Meta(LabResultSerializer.Meta):
+        fields = [
+            'id', 'patient', 'patient_name', 'test', 'test_name', 'technician_name',
+            'date_time', 'status', 'verified_at'
+        ]
+
 class SampleSerializer(serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
     collected_by_name = serializers.SerializerMethodField()
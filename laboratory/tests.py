@@ -0,0 +1,53 @@
+from datetime import date
+
+from django.test import TestCase
+
+from accounts.models import Doctor, User
+from consultation.models import Consultation, LabRequest
+from core.testing import QueryBudgetMixin
+from reception.models import Patient
+from .models import LabResult, LabTest, Sample
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        doctor_user = User.objects.create_user(
+            username='doctor', email='doctor@example.com', password='x', user_type='doctor', department='general'
+        )
+        cls.doctor = Doctor.objects.create(user=doctor_user, specialty='general', license_number='L1')
+        cls.patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+        cls.consultation = Consultation.objects.create(
+            patient=cls.patient, doctor=cls.doctor, chief_complaint='Fever', history_of_present_illness='Two days',
+            assessment='Viral', diagnosis='Viral fever', plan='Bloods'
+        )
+        cls.test = LabTest.objects.create(
+            name='Full blood count', description='', test_code='FBC', category='haematology', price=20,
+            turnaround_time=2, sample_type='blood'
+        )
+
+    def setUp(self):
+        self.budget_user = self.admin
+
+    def lab_request(self, index):
+        return LabRequest.objects.create(
+            consultation=self.consultation, test_name='Full blood count', test_type='haematology',
+            requested_by=self.doctor
+        )
+
+    def test_results(self):
+        self.assertListQueries('/api/laboratory/results/', lambda index: LabResult.objects.create(
+            patient=self.patient, request=self.lab_request(index), test=self.test, technician=self.admin,
+            results={}, reference_ranges={}, interpretation='Normal'
+        ), 4)
+
+    def test_samples(self):
+        self.assertListQueries('/api/laboratory/samples/', lambda index: Sample.objects.create(
+            lab_request=self.lab_request(index), sample_id=f'S{index}', sample_type='blood', collected_by=self.admin
+        ), 2)
@@ -3,20 +3,24 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import LabTest, LabResult, Sample
-from .serializers import LabTestSerializer, LabResultSerializer, SampleSerializer
+from .serializers import LabTestSerializer, LabResultSerializer, LabResultSummarySerializer, SampleSerializer
+from core import catalog
+from core.mixins import ConditionalGetMixin, SparseFieldsetMixin
 from consultation.models import LabRequest
 from notifications.utils import send_notification
+from dashboard.activity import record_activity
 
-class LabTestViewSet(viewsets.ModelViewSet):
+class LabTestViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = LabTest.objects.all()
     serializer_class = LabTestSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['category', 'is_active']
 
-class LabResultViewSet(viewsets.ModelViewSet):
-    queryset = LabResult.objects.all()
+class LabResultViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = LabResult.objects.select_related('patient', 'technician')
     serializer_class = LabResultSerializer
+    summary_serializer_class = LabResultSummarySerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['patient', 'test', 'status']
@@ -33,6 +37,15 @@ class LabResultViewSet(viewsets.ModelViewSet):
             lab_result.status = 'verified'
             lab_result.save()
             
+            record_activity(
+                actor=request.user,
+                event_type='lab_result',
+                action=f'verified {catalog.lab_tests.get(lab_result.test_id).name} results for',
+                target=lab_result.patient.get_full_name(),
+                department='laboratory',
+                obj=lab_result
+            )
+            
             # Notify the requesting doctor
             send_notification(
                 recipient_type='user',
@@ -70,7 +83,7 @@ class LabResultViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_400_BAD_REQUEST)
 
 class SampleViewSet(viewsets.ModelViewSet):
-    queryset = Sample.objects.all()
+    queryset = Sample.objects.select_related('lab_request__consultation__patient', 'collected_by')
     serializer_class = SampleSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -433,7 +433,9 @@ export const dashboardAPI = {
     if (USE_MOCK_DATA) {
       return createMockResponse(mockData.recentActivity)
     }
-    return withRetry(() => apiRequest("/dashboard/recent-activity/"))
+    // The activity feed is cursor-paginated; the widget shows the first page
+    const page = await withRetry(() => apiRequest("/dashboard/recent-activity/"))
+    return page.results
   },
 }
 
@@ -1,6 +1,12 @@
 from rest_framework import serializers
+from core import catalog
 from .models import Medication, MedicationDispense, Inventory, MedicationTransaction
 
+def medication_name(medication_id):
+    """Same text as str(Medication), read from the catalog cache"""
+    medication = catalog.medications.get(medication_id)
+    return f"{medication.name} {medication.strength} {medication.dosage_form}"
+
 class MedicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Medication
@@ -19,7 +25,7 @@ class MedicationDispenseSerializer(serializers.ModelSerializer):
         return f"{obj.patient.first_name} {obj.patient.last_name}"
     
     def get_medication_name(self, obj):
-        return str(obj.medication)
+        return medication_name(obj.medication_id)
     
     def get_pharmacist_name(self, obj):
         return obj.pharmacist.get_full_name()
@@ -33,7 +39,7 @@ class InventorySerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_medication_name(self, obj):
-        return str(obj.medication)
+        return medication_name(obj.medication_id)
     
     def get_days_until_expiry(self, obj):
         from django.utils import timezone
@@ -52,7 +58,7 @@ class MedicationTransactionSerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_medication_name(self, obj):
-        return str(obj.medication)
+        return medication_name(obj.medication_id)
     
     def get_performed_by_name(self, obj):
         return obj.performed_by.get_full_name()
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from accounts.models import Doctor, User
+from consultation.models import Consultation, Prescription
+from core.testing import QueryBudgetMixin
+from reception.models import Patient
+from .models import Inventory, Medication, MedicationDispense, MedicationTransaction
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        doctor_user = User.objects.create_user(
+            username='doctor', email='doctor@example.com', password='x', user_type='doctor', department='general'
+        )
+        cls.doctor = Doctor.objects.create(user=doctor_user, specialty='general', license_number='L1')
+        cls.patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+        cls.consultation = Consultation.objects.create(
+            patient=cls.patient, doctor=cls.doctor, chief_complaint='Fever', history_of_present_illness='Two days',
+            assessment='Viral', diagnosis='Viral fever', plan='Paracetamol'
+        )
+        cls.medication = cls.make_medication('base')
+
+    @staticmethod
+    def make_medication(index):
+        return Medication.objects.create(
+            name=f'Paracetamol {index}', generic_name='Paracetamol', dosage_form='tablet', strength='500mg',
+            manufacturer='Generic', price=1
+        )
+
+    def setUp(self):
+        self.budget_user = self.admin
+
+    def test_dispenses(self):
+        def make_row(index):
+            prescription = Prescription.objects.create(
+                consultation=self.consultation, medication='Paracetamol', dosage='1g', frequency='QDS',
+                duration='3 days', instructions='After food', prescribed_by=self.doctor
+            )
+            MedicationDispense.objects.create(
+                prescription=prescription, patient=self.patient, medication=self.medication, quantity=12,
+                instructions='After food', pharmacist=self.admin
+            )
+        self.assertListQueries('/api/pharmacy/dispenses/', make_row, 4)
+
+    def test_inventory(self):
+        self.assertListQueries('/api/pharmacy/inventory/', lambda index: Inventory.objects.create(
+            medication=self.make_medication(index), batch_number=f'B{index}',
+            expiry_date=date.today() + timedelta(days=365), date_received=date.today(),
+            quantity_received=100, quantity_current=100, unit_cost=1, supplier='Supplier', location='Shelf A',
+            updated_by=self.admin
+        ), 4)
+
+    def test_transactions(self):
+        self.assertListQueries('/api/pharmacy/transactions/', lambda index: MedicationTransaction.objects.create(
+            medication=self.medication, transaction_type='received', quantity=10, performed_by=self.admin
+        ), 4)
@@ -9,9 +9,11 @@ from .serializers import (
 )
 from consultation.models import Prescription
 from notifications.utils import send_notification
+from dashboard.activity import record_activity
+from core.mixins import ConditionalGetMixin
 from django.db.models import F
 
-class MedicationViewSet(viewsets.ModelViewSet):
+class MedicationViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Medication.objects.all()
     serializer_class = MedicationSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -21,12 +23,12 @@ class MedicationViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def low_stock(self, request):
-        low_stock_items = Medication.objects.filter(stock_level__lte=F('reorder_level'))
+        low_stock_items = self.get_queryset().filter(stock_level__lte=F('reorder_level'))
         serializer = self.get_serializer(low_stock_items, many=True)
         return Response(serializer.data)
 
 class MedicationDispenseViewSet(viewsets.ModelViewSet):
-    queryset = MedicationDispense.objects.all()
+    queryset = MedicationDispense.objects.select_related('patient', 'pharmacist')
     serializer_class = MedicationDispenseSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -81,6 +83,15 @@ class MedicationDispenseViewSet(viewsets.ModelViewSet):
             dispense.status = 'dispensed'
             dispense.save()
             
+            record_activity(
+                actor=request.user,
+                event_type='dispense',
+                action=f'dispensed {medication.name} to',
+                target=dispense.patient.get_full_name(),
+                department='pharmacy',
+                obj=dispense
+            )
+            
             # Send notification to the doctor
             send_notification(
                 recipient_type='user',
@@ -112,12 +123,12 @@ class InventoryViewSet(viewsets.ModelViewSet):
         days = int(request.query_params.get('days', 30))
         threshold_date = timezone.now().date() + datetime.timedelta(days=days)
         
-        expiring_items = Inventory.objects.filter(expiry_date__lte=threshold_date)
+        expiring_items = self.get_queryset().filter(expiry_date__lte=threshold_date)
         serializer = self.get_serializer(expiring_items, many=True)
         return Response(serializer.data)
 
 class MedicationTransactionViewSet(viewsets.ModelViewSet):
-    queryset = MedicationTransaction.objects.all()
+    queryset = MedicationTransaction.objects.select_related('performed_by')
     serializer_class = MedicationTransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
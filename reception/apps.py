@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReceptionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reception'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
@@ -0,0 +1,55 @@
+import json
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .live_queue import live_queue, group_name
+
+class QueueConsumer(AsyncWebsocketConsumer):
+    async def connect(self):
+        self.user = self.scope["user"]
+        
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+        
+        self.department = self.scope["url_route"]["kwargs"]["department"]
+        self.queue_group_name = group_name(self.department)
+        
+        # Join department queue group
+        await self.channel_layer.group_add(
+            self.queue_group_name,
+            self.channel_name
+        )
+        
+        await self.accept()
+        await self.send_snapshot()
+    
+    async def disconnect(self, close_code):
+        if not self.user.is_authenticated:
+            return
+        
+        # Leave department queue group
+        await self.channel_layer.group_discard(
+            self.queue_group_name,
+            self.channel_name
+        )
+    
+    # Receive message from WebSocket
+    async def receive(self, text_data):
+        data = json.loads(text_data)
+        
+        if data.get('type', '') == 'refresh':
+            await self.send_snapshot()
+    
+    # Receive enqueue/dequeue/reprioritize event from group
+    async def queue_update(self, event):
+        await self.send(text_data=json.dumps(event, cls=DjangoJSONEncoder))
+    
+    async def send_snapshot(self):
+        entries = await database_sync_to_async(live_queue.entries)(self.department)
+        await self.send(text_data=json.dumps({
+            'type': 'queue_snapshot',
+            'department': self.department,
+            'entries': [entry.to_dict() for entry in entries]
+        }, cls=DjangoJSONEncoder))
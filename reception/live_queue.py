@@ -0,0 +1,231 @@
+"""
+In-memory live view of the waiting queue per department.
+
+Reception and triage screens used to poll ``QueueViewSet.current``, which
+re-serialized every waiting entry (one patient query per row) on every poll.
+Here each department's waiting list is loaded once with a single query into
+compact records kept in call order, then maintained incrementally from Queue
+saves. Every change is broadcast to the ``queue_<department>`` channel group
+as an ``enqueue``, ``dequeue`` or ``reprioritize`` event.
+
+The structure is per process; departments are reloaded from the database
+after ``LIVE_QUEUE_MAX_AGE`` seconds so changes made by other workers are
+picked up.
+"""
+import bisect
+import re
+import threading
+import time
+from typing import NamedTuple, Optional
+import datetime
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.fields import DateTimeField
+
+from .models import Patient, Queue
+
+
+# Renders datetimes exactly as the REST API does (UTC as "Z")
+_datetime_field = DateTimeField()
+
+
+class QueueRecord(NamedTuple):
+    id: int
+    patient: int
+    patient_name: str
+    age: int
+    gender: str
+    appointment: Optional[int]
+    department: str
+    priority: str
+    rank: int
+    check_in_time: datetime.datetime
+
+    @property
+    def sort_key(self):
+        return (self.rank, self.check_in_time, self.id)
+
+    def to_dict(self, now=None):
+        """The entry as QueueSerializer renders it: same keys and datetime format"""
+        now = now or timezone.now()
+        return {
+            'id': self.id,
+            'patient_name': self.patient_name,
+            'age': self.age,
+            'gender': self.gender,
+            'wait_time': f"{int((now - self.check_in_time).total_seconds() / 60)} min",
+            'department': self.department,
+            'priority': self.priority,
+            'rank': self.rank,
+            'status': 'waiting',
+            'check_in_time': _datetime_field.to_representation(self.check_in_time),
+            'patient': self.patient,
+            'appointment': self.appointment,
+        }
+
+
+def _age(date_of_birth, today):
+    return today.year - date_of_birth.year - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
+
+
+def _record(entry, patient):
+    return QueueRecord(
+        id=entry.id,
+        patient=patient.id,
+        patient_name=patient.get_full_name(),
+        age=patient.age(),
+        gender=patient.get_gender_display(),
+        appointment=entry.appointment_id,
+        department=entry.department,
+        priority=entry.priority,
+        rank=entry.rank,
+        check_in_time=entry.check_in_time
+    )
+
+
+def group_name(department):
+    """Channel group for a department (group names allow only [0-9A-Za-z_.-])"""
+    return 'queue_' + re.sub(r'[^0-9A-Za-z_.-]', '_', department)[:80]
+
+
+class DepartmentQueue:
+    def __init__(self, records):
+        self.records = sorted(records, key=lambda record: record.sort_key)
+        self.keys = [record.sort_key for record in self.records]
+        self.loaded_at = time.monotonic()
+
+    def index_of(self, entry_id):
+        for index, record in enumerate(self.records):
+            if record.id == entry_id:
+                return index
+        return None
+
+    def insert(self, record):
+        index = bisect.bisect(self.keys, record.sort_key)
+        self.keys.insert(index, record.sort_key)
+        self.records.insert(index, record)
+        return index
+
+    def pop(self, index):
+        del self.keys[index]
+        return self.records.pop(index)
+
+
+class LiveQueue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._departments = {}
+
+    def _max_age(self):
+        return getattr(settings, 'LIVE_QUEUE_MAX_AGE', 30)
+
+    def _load(self, department):
+        gender_display = dict(Patient.GENDER_CHOICES)
+        today = datetime.date.today()
+        rows = Queue.objects.filter(
+            department=department,
+            status='waiting'
+        ).values_list(
+            'id', 'patient_id', 'patient__first_name', 'patient__last_name',
+            'patient__date_of_birth', 'patient__gender', 'appointment_id', 'priority', 'rank', 'check_in_time'
+        )
+        return DepartmentQueue([
+            QueueRecord(
+                id=entry_id,
+                patient=patient_pk,
+                patient_name=f"{first_name} {last_name}",
+                age=_age(date_of_birth, today),
+                gender=gender_display.get(gender, gender),
+                appointment=appointment_id,
+                department=department,
+                priority=priority,
+                rank=rank,
+                check_in_time=check_in_time
+            )
+            for (entry_id, patient_pk, first_name, last_name, date_of_birth,
+                 gender, appointment_id, priority, rank, check_in_time) in rows
+        ])
+
+    def _get(self, department):
+        with self._lock:
+            queue = self._departments.get(department)
+            if queue is not None and time.monotonic() - queue.loaded_at < self._max_age():
+                return queue
+        queue = self._load(department)
+        with self._lock:
+            self._departments[department] = queue
+        return queue
+
+    def entries(self, department):
+        """Waiting records for a department in call order"""
+        queue = self._get(department)
+        with self._lock:
+            return list(queue.records)
+
+    def sync(self, entry, created=False):
+        """Bring the live view in line with a saved Queue entry and broadcast the change"""
+        record = _record(entry, entry.patient) if entry.status == 'waiting' else None
+        event, position = None, None
+        moved = []
+
+        with self._lock:
+            # Drop the entry from any other department it was moved out of
+            for department, other in self._departments.items():
+                if department != entry.department:
+                    index = other.index_of(entry.id)
+                    if index is not None:
+                        moved.append((department, other.pop(index)))
+
+            queue = self._departments.get(entry.department)
+            if queue is not None:
+                index = queue.index_of(entry.id)
+                previous = queue.pop(index) if index is not None else None
+                if record is not None:
+                    position = queue.insert(record)
+                    if previous is None:
+                        event = 'enqueue'
+                    elif previous.sort_key != record.sort_key:
+                        event = 'reprioritize'
+                elif previous is not None:
+                    event, record = 'dequeue', previous
+
+        if queue is None:
+            # Not loaded in this process; subscribers elsewhere still need the event
+            if record is None:
+                event, record = 'dequeue', _record(entry, entry.patient)
+            else:
+                event = 'enqueue' if created else 'reprioritize'
+
+        for department, previous in moved:
+            self._send(department, 'dequeue', previous, None)
+        if event:
+            self._send(entry.department, event, record, position)
+
+    def remove(self, entry):
+        with self._lock:
+            queue = self._departments.get(entry.department)
+            index = queue.index_of(entry.id) if queue is not None else None
+            record = queue.pop(index) if index is not None else None
+        if record is not None:
+            self._send(entry.department, 'dequeue', record, None)
+
+    def _send(self, department, event, record, position):
+        async_to_sync(get_channel_layer().group_send)(
+            group_name(department),
+            {
+                'type': 'queue_update',
+                'event': event,
+                'position': position,
+                'entry': record.to_dict()
+            }
+        )
+
+    def clear(self):
+        with self._lock:
+            self._departments = {}
+
+
+live_queue = LiveQueue()
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from reception.models import Queue
+
+
+class Command(BaseCommand):
+    help = 'Set Queue.rank from priority on rows saved before the rank column existed'
+
+    def handle(self, *args, **options):
+        count = 0
+        for priority, rank in Queue.PRIORITY_RANKS.items():
+            count += Queue.objects.filter(priority=priority).exclude(rank=rank).update(rank=rank)
+        self.stdout.write(self.style.SUCCESS(f"Updated the rank of {count} queue entries"))
@@ -1,7 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
-from simple_history.models import HistoricalRecords
+from core.history import BatchedHistoricalRecords
 from accounts.models import User
 
 class Patient(models.Model):
@@ -53,7 +53,7 @@ class Patient(models.Model):
     is_active = models.BooleanField(default=True)
     
     # Track history
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords()
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.patient_id})"
@@ -103,13 +103,24 @@ class Appointment(models.Model):
     notes = models.TextField(blank=True)
     
     # Track history
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords()
     
     def __str__(self):
         return f"{self.patient} - {self.scheduled_date} {self.scheduled_time}"
     
     class Meta:
         ordering = ['scheduled_date', 'scheduled_time']
+        indexes = [
+            models.Index(fields=['doctor', 'scheduled_date', 'scheduled_time'], name='appointment_doctor_slot_idx'),
+        ]
+        constraints = [
+            # One booking per doctor per slot; cancelled and no-show appointments free the slot
+            models.UniqueConstraint(
+                fields=['doctor', 'scheduled_date', 'scheduled_time'],
+                condition=~models.Q(status__in=['cancelled', 'no_show']),
+                name='appointment_doctor_slot_unique',
+            ),
+        ]
 
 class Queue(models.Model):
     PRIORITY_CHOICES = (
@@ -118,6 +129,13 @@ class Queue(models.Model):
         ('emergency', 'Emergency'),
     )
     
+    # Lower rank is seen first
+    PRIORITY_RANKS = {
+        'emergency': 0,
+        'urgent': 1,
+        'normal': 2,
+    }
+    
     STATUS_CHOICES = (
         ('waiting', 'Waiting'),
         ('in_progress', 'In Progress'),
@@ -128,11 +146,24 @@ class Queue(models.Model):
     appointment = models.ForeignKey(Appointment, on_delete=models.CASCADE, related_name='queue_entries', null=True, blank=True)
     department = models.CharField(max_length=100)
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='normal')
+    # Rows that predate this column are set by the backfill_queue_rank command
+    rank = models.PositiveSmallIntegerField(default=2, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='waiting')
     check_in_time = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
         return f"{self.patient} - {self.department} ({self.priority})"
     
+    def save(self, *args, **kwargs):
+        # Keep the sortable rank in step with the priority label
+        self.rank = self.PRIORITY_RANKS.get(self.priority, self.PRIORITY_RANKS['normal'])
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'priority' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'rank'}
+        super().save(*args, **kwargs)
+    
     class Meta:
-        ordering = ['priority', 'check_in_time']
+        ordering = ['rank', 'check_in_time']
+        indexes = [
+            models.Index(fields=['department', 'status', 'rank', 'check_in_time'], name='queue_dept_status_rank_idx'),
+        ]
@@ -0,0 +1,58 @@
+"""
+Department queue engine.
+
+Entries are ordered by ``(rank, check_in_time)`` where ``rank`` is derived
+from the priority label, served by the ``(department, status, rank,
+check_in_time)`` index.
+"""
+from django.db import transaction, router
+from django.db.models.signals import post_save
+
+from .models import Queue
+
+# Attempts made when another clinician claims the same head entry first
+MAX_CLAIM_ATTEMPTS = 5
+
+
+def waiting_entries(department):
+    """Waiting entries for a department in the order they will be called"""
+    return Queue.objects.filter(
+        department=department,
+        status='waiting'
+    ).order_by('rank', 'check_in_time')
+
+
+def call_next(department):
+    """
+    Atomically take the next waiting patient off a department queue.
+    
+    The head row is locked with ``SKIP LOCKED`` so concurrent callers each get
+    a different patient instead of blocking on one another. The claim itself
+    is a conditional update, which keeps it safe on backends that ignore row
+    locks (SQLite).
+    
+    Returns:
+        The claimed Queue entry (now ``in_progress``), or None if the queue is empty
+    """
+    for _ in range(MAX_CLAIM_ATTEMPTS):
+        with transaction.atomic(using=router.db_for_write(Queue)):
+            entry = waiting_entries(department).select_for_update(skip_locked=True).first()
+            if entry is None:
+                return None
+            
+            claimed = Queue.objects.filter(pk=entry.pk, status='waiting').update(status='in_progress')
+            if not claimed:
+                continue
+        
+        entry.status = 'in_progress'
+        # update() skips signals; listeners such as the dashboard still need to hear about it
+        post_save.send(
+            sender=Queue,
+            instance=entry,
+            created=False,
+            update_fields={'status'},
+            raw=False,
+            using=entry._state.db
+        )
+        return entry
+    return None
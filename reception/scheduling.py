@@ -0,0 +1,196 @@
+"""
+Appointment scheduling: free/busy lookups and conflict-free booking.
+
+Each doctor's day is divided into fixed slots of ``APPOINTMENT_SLOT_MINUTES``
+between ``APPOINTMENT_DAY_START`` and ``APPOINTMENT_DAY_END`` on
+``APPOINTMENT_WORKING_DAYS``. An appointment occupies the slot its
+``scheduled_time`` falls in until it is cancelled or marked a no-show.
+
+Busy slots for any number of doctors over a date range come from one query
+on the ``(doctor, scheduled_date, scheduled_time)`` index, so lookups only
+touch the requested range however much history has built up. The partial
+unique constraint on the same columns is the final guard against double
+booking: ``book`` checks the slot under a lock on the doctor row and turns a
+constraint violation from a concurrent booking into ``SlotUnavailable``.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from accounts.models import Doctor, User
+from .models import Appointment
+
+# Statuses that give the slot back to the doctor
+RELEASED_STATUSES = ('cancelled', 'no_show')
+SLOT_FIELDS = ('doctor', 'scheduled_date', 'scheduled_time')
+# Widest range a single availability lookup may cover
+MAX_RANGE_DAYS = 31
+# Days of bookings loaded per query while searching for the first free slot
+SEARCH_WINDOW_DAYS = 7
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def day_slots():
+    """Start times of every slot in a working day"""
+    start = _minutes(time.fromisoformat(settings.APPOINTMENT_DAY_START))
+    end = _minutes(time.fromisoformat(settings.APPOINTMENT_DAY_END))
+    step = settings.APPOINTMENT_SLOT_MINUTES
+    return [time(minutes // 60, minutes % 60) for minutes in range(start, end - step + 1, step)]
+
+
+def slot_of(value):
+    """Start of the slot containing ``value``"""
+    start = _minutes(time.fromisoformat(settings.APPOINTMENT_DAY_START))
+    step = settings.APPOINTMENT_SLOT_MINUTES
+    minutes = start + (_minutes(value) - start) // step * step
+    return time(minutes // 60 % 24, minutes % 60)
+
+
+def slot_error(scheduled_date, scheduled_time, now=None):
+    """Why an appointment cannot be placed at this date and time, or None"""
+    now = timezone.localtime(now)
+    if scheduled_date.weekday() not in settings.APPOINTMENT_WORKING_DAYS:
+        return 'Appointments cannot be booked on this day.'
+    if scheduled_time not in day_slots():
+        return (
+            f'Appointments start on {settings.APPOINTMENT_SLOT_MINUTES}-minute slots between '
+            f'{settings.APPOINTMENT_DAY_START} and {settings.APPOINTMENT_DAY_END}.'
+        )
+    if datetime.combine(scheduled_date, scheduled_time) < now.replace(tzinfo=None):
+        return 'Appointments cannot be booked in the past.'
+    return None
+
+
+def open_slots(day, now=None):
+    """Slots on ``day`` that can still be booked"""
+    now = timezone.localtime(now)
+    if day.weekday() not in settings.APPOINTMENT_WORKING_DAYS or day < now.date():
+        return []
+    slots = day_slots()
+    if day == now.date():
+        slots = [slot for slot in slots if slot >= now.time()]
+    return slots
+
+
+def busy(doctor_ids, start_date, end_date, exclude=None):
+    """Booked ``(date, slot)`` pairs per doctor between the two dates inclusive, in one query"""
+    queryset = Appointment.objects.filter(
+        doctor_id__in=doctor_ids, scheduled_date__gte=start_date, scheduled_date__lte=end_date
+    ).exclude(status__in=RELEASED_STATUSES)
+    if exclude is not None:
+        queryset = queryset.exclude(pk=exclude)
+
+    booked = defaultdict(set)
+    rows = queryset.values_list('doctor_id', 'scheduled_date', 'scheduled_time').order_by()
+    for doctor_id, scheduled_date, scheduled_time in rows:
+        booked[doctor_id].add((scheduled_date, slot_of(scheduled_time)))
+    return booked
+
+
+def _days(start_date, end_date):
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def availability(doctor_ids, start_date, end_date, now=None):
+    """Free and busy slots per doctor and day between the two dates inclusive"""
+    booked = busy(doctor_ids, start_date, end_date)
+    result = []
+    for doctor_id in doctor_ids:
+        days = []
+        for day in _days(start_date, end_date):
+            taken = sorted(slot for booked_day, slot in booked[doctor_id] if booked_day == day)
+            days.append({
+                'date': day,
+                'free': [slot for slot in open_slots(day, now) if (day, slot) not in booked[doctor_id]],
+                'busy': taken,
+            })
+        result.append({'doctor': doctor_id, 'days': days})
+    return result
+
+
+def first_available(specialty, after=None, days=None):
+    """
+    Earliest free slot with any active doctor of ``specialty``, or None.
+
+    Bookings are loaded a week at a time, so the search stops as soon as a
+    free slot turns up instead of reading the whole search range.
+    """
+    after = timezone.localtime(after)
+    days = days or settings.APPOINTMENT_SEARCH_DAYS
+    doctors = list(
+        Doctor.objects.filter(specialty=specialty, user__is_active=True)
+        .order_by('user_id').values_list('user_id', flat=True)
+    )
+    if not doctors:
+        return None
+
+    search_end = after.date() + timedelta(days=days - 1)
+    window_start = after.date()
+    while window_start <= search_end:
+        window_end = min(window_start + timedelta(days=SEARCH_WINDOW_DAYS - 1), search_end)
+        booked = busy(doctors, window_start, window_end)
+        for day in _days(window_start, window_end):
+            for slot in open_slots(day, after):
+                for doctor_id in doctors:
+                    if (day, slot) not in booked[doctor_id]:
+                        return {'doctor': doctor_id, 'scheduled_date': day, 'scheduled_time': slot}
+        window_start = window_end + timedelta(days=1)
+    return None
+
+
+def moves_slot(instance, attrs):
+    """Whether saving ``attrs`` onto ``instance`` (None when creating) sets a new doctor, date or time"""
+    if instance is None:
+        return True
+    return any(field in attrs and attrs[field] != getattr(instance, field) for field in SLOT_FIELDS)
+
+
+def claims_slot(instance, attrs):
+    """Whether saving ``attrs`` onto ``instance`` takes a slot it does not already hold"""
+    if attrs.get('status', getattr(instance, 'status', 'scheduled')) in RELEASED_STATUSES:
+        return False
+    return moves_slot(instance, attrs) or instance.status in RELEASED_STATUSES
+
+
+def book(serializer, **kwargs):
+    """
+    Save an appointment serializer, refusing a slot someone else holds.
+
+    The doctor row is locked for the check so bookings for one doctor are
+    serialized; the unique constraint still catches any race the lock
+    cannot (e.g. on databases without row locks).
+    """
+    instance = serializer.instance
+    attrs = serializer.validated_data
+    if not claims_slot(instance, attrs):
+        return serializer.save(**kwargs)
+
+    doctor = attrs.get('doctor', getattr(instance, 'doctor', None))
+    scheduled_date = attrs.get('scheduled_date', getattr(instance, 'scheduled_date', None))
+    scheduled_time = slot_of(attrs.get('scheduled_time', getattr(instance, 'scheduled_time', None)))
+    exclude = instance.pk if instance is not None else None
+
+    def taken():
+        booked = busy([doctor.pk], scheduled_date, scheduled_date, exclude)
+        return (scheduled_date, scheduled_time) in booked[doctor.pk]
+
+    try:
+        with transaction.atomic():
+            User.objects.select_for_update().only('pk').get(pk=doctor.pk)
+            if taken():
+                raise SlotUnavailable('The doctor already has an appointment in this slot.')
+            return serializer.save(**kwargs)
+    except IntegrityError:
+        if taken():
+            raise SlotUnavailable('The doctor already has an appointment in this slot.')
+        raise
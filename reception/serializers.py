@@ -1,12 +1,24 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsMixin
 from .models import Patient, Appointment, Queue
+from . import scheduling
 
-class PatientSerializer(serializers.ModelSerializer):
+class PatientSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     age = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Patient
         fields = '__all__'
+        source_fields = {'age': ['date_of_birth']}
+
+class PatientSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Columns shown on patient list pages"""
+    age = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = Patient
+        fields = ['id', 'patient_id', 'first_name', 'last_name', 'gender', 'age', 'phone_number', 'registration_date']
+        source_fields = {'age': ['date_of_birth']}
 
 class AppointmentSerializer(serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
@@ -21,6 +33,15 @@ class AppointmentSerializer(serializers.ModelSerializer):
     
     def get_doctor_name(self, obj):
         return f"Dr. {obj.doctor.first_name} {obj.doctor.last_name}"
+    
+    def validate(self, attrs):
+        if scheduling.moves_slot(self.instance, attrs) and scheduling.claims_slot(self.instance, attrs):
+            scheduled_date = attrs.get('scheduled_date', getattr(self.instance, 'scheduled_date', None))
+            scheduled_time = attrs.get('scheduled_time', getattr(self.instance, 'scheduled_time', None))
+            error = scheduling.slot_error(scheduled_date, scheduled_time)
+            if error:
+                raise serializers.ValidationError({'scheduled_time': error})
+        return attrs
 
 class QueueSerializer(serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
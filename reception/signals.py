@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .models import Queue
+from .live_queue import live_queue
+
+
+def queue_saved(sender, instance, created=False, **kwargs):
+    transaction.on_commit(lambda: live_queue.sync(instance, created=created))
+
+
+def queue_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: live_queue.remove(instance))
+
+
+def connect_signals():
+    post_save.connect(queue_saved, sender=Queue, dispatch_uid='live_queue_save')
+    post_delete.connect(queue_deleted, sender=Queue, dispatch_uid='live_queue_delete')
@@ -0,0 +1,136 @@
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Doctor, User
+from core.testing import QueryBudgetMixin
+from .models import Appointment, Patient, Queue
+from .serializers import QueueSerializer
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        cls.doctor = User.objects.create_user(
+            username='doctor', email='doctor@example.com', password='x', user_type='doctor', department='general'
+        )
+        Doctor.objects.create(user=cls.doctor, specialty='general', license_number='L1')
+        cls.patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+
+    def setUp(self):
+        self.budget_user = self.admin
+
+    def test_appointments(self):
+        day = timezone.localdate() + timedelta(days=1)
+        self.assertListQueries('/api/reception/appointments/', lambda index: Appointment.objects.create(
+            patient=self.patient, doctor=self.doctor, scheduled_date=day, scheduled_time=time(8 + index),
+            reason='Review', created_by=self.admin
+        ), 2)
+
+    def test_queue(self):
+        self.assertListQueries('/api/reception/queue/', lambda index: Queue.objects.create(
+            patient=self.patient, department='general'
+        ), 2)
+
+
+class LiveQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        cls.patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+
+    def test_current_matches_queue_serializer(self):
+        entry = Queue.objects.create(patient=self.patient, department='queue-contract-test')
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        current = client.get('/api/reception/queue/current/?department=queue-contract-test').json()
+        detail = client.get(f'/api/reception/queue/{entry.pk}/').json()
+
+        self.assertEqual(current, [detail])
+        self.assertEqual(current[0], dict(QueueSerializer(entry).data))
+
+
+class SchedulingParameterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        doctor = User.objects.create_user(
+            username='doctor', email='doctor@example.com', password='x', user_type='doctor', department='general'
+        )
+        Doctor.objects.create(user=doctor, specialty='general', license_number='L1')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_impossible_dates_are_rejected(self):
+        for url in (
+            f'/api/reception/appointments/by_doctor/?doctor_id={self.admin.pk}&start_date=2024-02-30',
+            f'/api/reception/appointments/availability/?doctor={self.admin.pk}&start_date=2024-02-30',
+            '/api/reception/appointments/first-available/?specialty=general&after=2024-13-01T00:00:00',
+            '/api/reception/appointments/first-available/?specialty=general&after=9999-12-31T00:00:00',
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400, url)
+
+
+class SparseFieldsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        cls.patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_reads_are_pruned(self):
+        response = self.client.get(f'/api/reception/patients/{self.patient.pk}/?fields=id,first_name')
+        self.assertEqual(set(response.data), {'id', 'first_name'})
+
+    def test_writes_ignore_the_field_list(self):
+        response = self.client.patch(
+            f'/api/reception/patients/{self.patient.pk}/?fields=id', {'first_name': 'Ann'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.patient.refresh_from_db()
+        self.assertEqual(self.patient.first_name, 'Ann')
+
+
+class QueueRankBackfillTests(TestCase):
+    def test_rank_follows_priority(self):
+        patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+        entry = Queue.objects.create(patient=patient, department='general', priority='emergency')
+        Queue.objects.filter(pk=entry.pk).update(rank=2)
+
+        call_command('backfill_queue_rank', stdout=StringIO())
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.rank, Queue.PRIORITY_RANKS['emergency'])
@@ -2,14 +2,23 @@ from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from .models import Patient, Appointment, Queue
-from .serializers import PatientSerializer, AppointmentSerializer, QueueSerializer
+from .serializers import PatientSerializer, PatientSummarySerializer, AppointmentSerializer, QueueSerializer
+from core.mixins import SparseFieldsetMixin
+from core.serializers import parse_field_list
+from . import queueing, scheduling
+from .live_queue import live_queue
+from dashboard.activity import record_activity
 import datetime
 
-class PatientViewSet(viewsets.ModelViewSet):
+class PatientViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Patient.objects.all()
     serializer_class = PatientSerializer
+    summary_serializer_class = PatientSummarySerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['gender', 'blood_type']
@@ -30,33 +39,144 @@ class PatientViewSet(viewsets.ModelViewSet):
         return Response({'error': 'Search query required'}, status=status.HTTP_400_BAD_REQUEST)
 
 class AppointmentViewSet(viewsets.ModelViewSet):
-    queryset = Appointment.objects.all()
+    queryset = Appointment.objects.select_related('patient', 'doctor')
     serializer_class = AppointmentSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['scheduled_date', 'status', 'doctor', 'patient']
     
+    def create(self, request, *args, **kwargs):
+        try:
+            return super().create(request, *args, **kwargs)
+        except scheduling.SlotUnavailable as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+    
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except scheduling.SlotUnavailable as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+    
+    def perform_create(self, serializer):
+        scheduling.book(serializer)
+    
+    def perform_update(self, serializer):
+        was_completed = serializer.instance.status == 'completed'
+        appointment = scheduling.book(serializer)
+        if appointment.status == 'completed' and not was_completed:
+            record_activity(
+                actor=appointment.doctor,
+                event_type='consultation',
+                action='completed consultation with',
+                target=appointment.patient.get_full_name(),
+                department=appointment.doctor.department,
+                obj=appointment
+            )
+    
     @action(detail=False, methods=['get'])
     def today(self, request):
         today = datetime.date.today()
-        appointments = Appointment.objects.filter(scheduled_date=today)
+        appointments = self.get_queryset().filter(scheduled_date=today)
         serializer = self.get_serializer(appointments, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def by_doctor(self, request):
+        """A doctor's appointments, paginated and optionally limited to ?start_date=&end_date="""
         doctor_id = request.query_params.get('doctor_id', None)
-        if doctor_id:
-            appointments = Appointment.objects.filter(doctor_id=doctor_id)
-            serializer = self.get_serializer(appointments, many=True)
-            return Response(serializer.data)
-        return Response({'error': 'Doctor ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        if not doctor_id:
+            return Response({'error': 'Doctor ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        appointments = self.get_queryset().filter(doctor_id=doctor_id)
+        for param, lookup in (('start_date', 'scheduled_date__gte'), ('end_date', 'scheduled_date__lte')):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    parsed = parse_date(value)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    return Response({'error': f'Invalid {param}'}, status=status.HTTP_400_BAD_REQUEST)
+                appointments = appointments.filter(**{lookup: parsed})
+        
+        page = self.paginate_queryset(appointments)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """
+        Free and busy slots: ?doctor=<id>[,<id>...]&start_date=&end_date=
+
+        Defaults to the next 7 days; ranges are limited to 31 days.
+        """
+        try:
+            doctor_ids = sorted(int(doctor_id) for doctor_id in parse_field_list(request.query_params.get('doctor')))
+        except ValueError:
+            return Response({'error': 'doctor must be a list of user IDs'}, status=status.HTTP_400_BAD_REQUEST)
+        if not doctor_ids:
+            return Response({'error': 'Doctor parameter required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        today = timezone.localdate()
+        window = {'start_date': today, 'end_date': today + datetime.timedelta(days=6)}
+        for param in window:
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    window[param] = parse_date(value)
+                except ValueError:
+                    window[param] = None
+                if window[param] is None:
+                    return Response({'error': f'Invalid {param}'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= (window['end_date'] - window['start_date']).days < scheduling.MAX_RANGE_DAYS:
+            return Response(
+                {'error': f'Range must be positive and at most {scheduling.MAX_RANGE_DAYS} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            'slot_minutes': settings.APPOINTMENT_SLOT_MINUTES,
+            'doctors': scheduling.availability(doctor_ids, window['start_date'], window['end_date']),
+        })
+    
+    @action(detail=False, methods=['get'], url_path='first-available')
+    def first_available(self, request):
+        """Earliest free slot across doctors of a specialty: ?specialty=&after="""
+        specialty = request.query_params.get('specialty')
+        if not specialty:
+            return Response({'error': 'Specialty parameter required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        after = None
+        if request.query_params.get('after'):
+            try:
+                after = parse_datetime(request.query_params['after'])
+            except ValueError:
+                after = None
+            if after is None:
+                return Response({'error': 'Invalid after datetime'}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(after):
+                # replace() rather than make_aware(): a wall time skipped by a DST
+                # change takes the earlier offset instead of raising
+                after = after.replace(tzinfo=timezone.get_current_timezone())
+            after = max(after, timezone.now())
+        
+        try:
+            slot = scheduling.first_available(specialty, after)
+        except OverflowError:
+            # The search window runs past the last representable date
+            return Response({'error': 'Invalid after datetime'}, status=status.HTTP_400_BAD_REQUEST)
+        if slot is None:
+            return Response(
+                {'error': f'No free slot in the next {settings.APPOINTMENT_SEARCH_DAYS} days'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(slot)
     
     @action(detail=False, methods=['get'])
     def by_patient(self, request):
         patient_id = request.query_params.get('patient_id', None)
         if patient_id:
-            appointments = Appointment.objects.filter(patient_id=patient_id)
+            appointments = self.get_queryset().filter(patient_id=patient_id)
             serializer = self.get_serializer(appointments, many=True)
             return Response(serializer.data)
         return Response({'error': 'Patient ID required'}, status=status.HTTP_400_BAD_REQUEST)
@@ -81,7 +201,7 @@ class AppointmentViewSet(viewsets.ModelViewSet):
         return Response({'error': 'Appointment is not in scheduled status'}, status=status.HTTP_400_BAD_REQUEST)
 
 class QueueViewSet(viewsets.ModelViewSet):
-    queryset = Queue.objects.all()
+    queryset = Queue.objects.select_related('patient')
     serializer_class = QueueSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -91,14 +211,24 @@ class QueueViewSet(viewsets.ModelViewSet):
     def current(self, request):
         department = request.query_params.get('department', None)
         if department:
-            queue_entries = Queue.objects.filter(
-                department=department,
-                status='waiting'
-            ).order_by('priority', 'check_in_time')
-            serializer = self.get_serializer(queue_entries, many=True)
-            return Response(serializer.data)
+            # Served from the live queue rather than re-serializing every entry
+            now = timezone.now()
+            return Response([entry.to_dict(now) for entry in live_queue.entries(department)])
         return Response({'error': 'Department parameter required'}, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'])
+    def call_next(self, request):
+        department = request.data.get('department', None)
+        if not department:
+            return Response({'error': 'Department parameter required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        queue_entry = queueing.call_next(department)
+        if queue_entry is None:
+            return Response({'error': 'No patients waiting in this department'}, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = self.get_serializer(queue_entry)
+        return Response(serializer.data)
+    
     @action(detail=True, methods=['post'])
     def update_priority(self, request, pk=None):
         queue_entry = self.get_object()
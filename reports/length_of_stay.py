@@ -0,0 +1,125 @@
+"""
+Length-of-stay analytics for completed ward stays.
+
+Stays are streamed as ``(ward, admission_type, admission_date,
+discharge_date)`` tuples with ``values_list().iterator()`` and packed chunk
+by chunk into compact NumPy arrays (a float duration and two small integer
+codes per stay), so no model instances or per-stay dicts are ever held.
+Statistics are then computed in vectorized passes: overall summary,
+histogram and median/p90 per ward and per admission type via one sort of
+(group, duration).
+
+Durations are computed in Python from the two timestamps rather than with
+database date arithmetic, which SQLite does not support reliably.
+"""
+import numpy as np
+
+from ward.models import Ward, WardStay
+
+CHUNK_SIZE = 5000
+
+# Histogram bin edges in days; the last bin is open-ended
+HISTOGRAM_DAYS = (0, 1, 2, 3, 5, 7, 14, 30)
+
+
+def load(start_date, end_date, chunk_size=CHUNK_SIZE):
+    """Durations (hours), ward IDs and admission-type codes of stays completed in the range"""
+    type_codes = {value: code for code, (value, _) in enumerate(WardStay.ADMISSION_TYPE_CHOICES)}
+    rows = WardStay.objects.filter(
+        discharge_date__isnull=False,
+        admission_date__date__gte=start_date,
+        discharge_date__date__lte=end_date
+    ).values_list('bed__ward_id', 'admission_type', 'admission_date', 'discharge_date')
+
+    hours, wards, types = [], [], []
+    chunk = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            _pack(chunk, type_codes, hours, wards, types)
+            chunk = []
+    if chunk:
+        _pack(chunk, type_codes, hours, wards, types)
+
+    if not hours:
+        return np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8)
+    return np.concatenate(hours), np.concatenate(wards), np.concatenate(types)
+
+
+def _pack(chunk, type_codes, hours, wards, types):
+    hours.append(np.fromiter(
+        ((discharged - admitted).total_seconds() / 3600 for _, _, admitted, discharged in chunk),
+        dtype=np.float64, count=len(chunk)
+    ))
+    wards.append(np.fromiter((ward_id for ward_id, _, _, _ in chunk), dtype=np.int64, count=len(chunk)))
+    types.append(np.fromiter(
+        (type_codes.get(admission_type, -1) for _, admission_type, _, _ in chunk), dtype=np.int8, count=len(chunk)
+    ))
+
+
+def summarize(hours):
+    if not len(hours):
+        return {'count': 0, 'mean_hours': None, 'median_hours': None, 'p90_hours': None,
+                'min_hours': None, 'max_hours': None}
+    p50, p90 = np.percentile(hours, [50, 90])
+    return {
+        'count': int(len(hours)),
+        'mean_hours': round(float(hours.mean()), 1),
+        'median_hours': round(float(p50), 1),
+        'p90_hours': round(float(p90), 1),
+        'min_hours': round(float(hours.min()), 1),
+        'max_hours': round(float(hours.max()), 1),
+    }
+
+
+def histogram(hours):
+    edges = np.array(HISTOGRAM_DAYS + (np.inf,)) * 24
+    counts, _ = np.histogram(hours, bins=edges)
+    labels = [
+        f"{low}-{high} days" for low, high in zip(HISTOGRAM_DAYS, HISTOGRAM_DAYS[1:])
+    ] + [f"{HISTOGRAM_DAYS[-1]}+ days"]
+    return [{'range': label, 'count': int(count)} for label, count in zip(labels, counts)]
+
+
+def breakdown(hours, groups):
+    """Count, mean, median and p90 per group code in one sorted pass"""
+    if not len(hours):
+        return {}
+    order = np.lexsort((hours, groups))
+    sorted_hours, sorted_groups = hours[order], groups[order]
+    codes, starts, counts = np.unique(sorted_groups, return_index=True, return_counts=True)
+    sums = np.add.reduceat(sorted_hours, starts)
+
+    result = {}
+    for code, start, count, total in zip(codes, starts, counts, sums):
+        values = sorted_hours[start:start + count]
+        # values are already sorted, so percentiles are cheap interpolations
+        p50, p90 = np.percentile(values, [50, 90])
+        result[int(code)] = {
+            'count': int(count),
+            'mean_hours': round(float(total / count), 1),
+            'median_hours': round(float(p50), 1),
+            'p90_hours': round(float(p90), 1),
+        }
+    return result
+
+
+def analyze(start_date, end_date, chunk_size=CHUNK_SIZE):
+    """Full length-of-stay report for stays completed between the two dates"""
+    hours, wards, types = load(start_date, end_date, chunk_size)
+    ward_names = dict(Ward.objects.values_list('id', 'name'))
+    type_names = dict(WardStay.ADMISSION_TYPE_CHOICES)
+    type_values = [value for value, _ in WardStay.ADMISSION_TYPE_CHOICES]
+
+    return {
+        'overall': summarize(hours),
+        'histogram': histogram(hours),
+        'by_ward': [
+            dict(stats, ward_id=ward_id, ward=ward_names.get(ward_id))
+            for ward_id, stats in breakdown(hours, wards).items()
+        ],
+        'by_admission_type': [
+            dict(stats, admission_type=type_values[code], label=type_names[type_values[code]])
+            for code, stats in breakdown(hours, types).items() if code >= 0
+        ],
+    }
@@ -0,0 +1,30 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+
+
+class OccupancyTrendsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_invalid_parameters_are_rejected(self):
+        for query in (
+            'ward=abc',
+            'start_date=2024-13-01&end_date=2024-12-31',
+            'start_date=2024-02-01&end_date=2024-01-01',
+        ):
+            response = self.client.get(f'/api/reports/occupancy-trends/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_defaults_to_last_30_days(self):
+        response = self.client.get('/api/reports/occupancy-trends/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['ward'])
@@ -6,4 +6,5 @@ urlpatterns = [
     path('financial-report/', views.financial_report, name='financial-report'),
     path('operational-report/', views.operational_report, name='operational-report'),
     path('doctor-performance/', views.doctor_performance_report, name='doctor-performance-report'),
+    path('occupancy-trends/', views.occupancy_trends, name='occupancy-trends'),
 ]
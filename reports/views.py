@@ -1,7 +1,7 @@
 from rest_framework import permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Count, Sum, Avg, F, Q
+from django.db.models import Count, Sum, F, Q
 from django.db.models.functions import TruncDate, TruncMonth
 from django.utils import timezone
 import datetime
@@ -12,7 +12,10 @@ from ward.models import Bed, WardStay
 from billing.models import Invoice, Payment
 from laboratory.models import LabResult
 from pharmacy.models import MedicationDispense
+from core.replicas import replica_reads
+from . import length_of_stay
 
+@replica_reads
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def patient_statistics(request):
@@ -60,6 +63,7 @@ def patient_statistics(request):
         'registration_trend': registration_trend
     })
 
+@replica_reads
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def financial_report(request):
@@ -131,6 +135,7 @@ def financial_report(request):
         'revenue_by_service_type': revenue_by_service
     })
 
+@replica_reads
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def operational_report(request):
@@ -140,9 +145,8 @@ def operational_report(request):
     end_date_str = request.query_params.get('end_date')
     
     if start_date_str and end_date_str:
-        from datetime import datetime
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+        start_date = datetime.datetime.strptime(start_date_str, '%Y-%m-%d').date()
+        end_date = datetime.datetime.strptime(end_date_str, '%Y-%m-%d').date()
     else:
         # Default to last 30 days
         end_date = timezone.now().date()
@@ -172,20 +176,9 @@ def operational_report(request):
         occupancy_rate=F('occupied') * 100.0 / F('capacity')
     )
     
-    # Average length of stay
-    completed_stays = WardStay.objects.filter(
-        discharge_date__isnull=False,
-        admission_date__date__gte=start_date,
-        discharge_date__date__lte=end_date
-    )
-    
-    avg_stay_duration = completed_stays.annotate(
-        duration=F('discharge_date') - F('admission_date')
-    ).aggregate(
-        avg_duration=Avg('duration')
-    )['avg_duration']
-    
-    avg_stay_hours = avg_stay_duration.total_seconds() / 3600 if avg_stay_duration else 0
+    # Length of stay for stays completed in the period
+    stay_analytics = length_of_stay.analyze(start_date, end_date)
+    avg_stay_hours = stay_analytics['overall']['mean_hours'] or 0
     
     # Lab test statistics
     lab_tests_by_status = LabResult.objects.filter(
@@ -213,10 +206,12 @@ def operational_report(request):
         },
         'ward_occupancy': ward_occupancy,
         'average_stay_duration_hours': avg_stay_hours,
+        'length_of_stay': stay_analytics,
         'lab_tests': lab_tests_by_status,
         'medications_dispensed': medications_dispensed
     })
 
+@replica_reads
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def doctor_performance_report(request):
@@ -289,3 +284,51 @@ def doctor_performance_report(request):
         },
         'revenue_generated': revenue_generated
     })
+
+@replica_reads
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def occupancy_trends(request):
+    """Occupancy trend and period-over-period change from ward census snapshots"""
+    from ward import census
+    
+    start_date_str = request.query_params.get('start_date')
+    end_date_str = request.query_params.get('end_date')
+    bucket = request.query_params.get('bucket', 'day')
+    ward_id = request.query_params.get('ward') or None
+    
+    if bucket not in census.BUCKETS:
+        return Response({'error': f"bucket must be one of {', '.join(census.BUCKETS)}"}, status=400)
+    if ward_id:
+        try:
+            ward_id = int(ward_id)
+        except ValueError:
+            return Response({'error': 'ward must be an integer'}, status=400)
+    
+    if start_date_str and end_date_str:
+        try:
+            start_date = datetime.datetime.strptime(start_date_str, '%Y-%m-%d').date()
+            end_date = datetime.datetime.strptime(end_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=400)
+        if end_date < start_date:
+            return Response({'error': 'end_date must not be before start_date'}, status=400)
+    else:
+        # Default to last 30 days
+        end_date = timezone.localdate()
+        start_date = end_date - datetime.timedelta(days=29)
+    
+    start = timezone.make_aware(datetime.datetime.combine(start_date, datetime.time.min))
+    end = timezone.make_aware(datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time.min))
+    days = (end_date - start_date).days + 1
+    
+    return Response({
+        'period': {
+            'start_date': start_date,
+            'end_date': end_date
+        },
+        'bucket': bucket,
+        'ward': ward_id,
+        'trend': census.trend(start, end, ward_id=ward_id, bucket=bucket),
+        'change': census.period_change(days, ward_id=ward_id, now=end)
+    })
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Benchmark history-tracked writes with and without batched history.
+
+Updates N patients three ways, each inside a transaction that is rolled
+back afterwards:
+
+  per-row      save() per patient, one history INSERT per save (default)
+  batched      save() per patient inside core.history.batched_history()
+  bulk-update  core.history.bulk_update_with_history (one UPDATE batch plus
+               one history bulk insert)
+
+    python scripts/benchmark_history.py --rows 1000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+
+def setup_django():
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, project_dir)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hims_project.settings')
+    import django
+    django.setup()
+
+
+class Rollback(Exception):
+    pass
+
+
+def run(label, rows, update):
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+    from reception.models import Patient
+
+    try:
+        with transaction.atomic():
+            patients = Patient.objects.bulk_create([
+                Patient(
+                    first_name=f'Bench{i}', last_name='History', date_of_birth=date(1980, 1, 1),
+                    gender='M', phone_number='+254700000000', patient_id=f'BENCH-H{i:06d}'
+                )
+                for i in range(rows)
+            ])
+            patients = list(Patient.objects.filter(patient_id__startswith='BENCH-H'))
+            for patient in patients:
+                patient.city = 'Benchmark'
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                update(patients)
+                elapsed = time.perf_counter() - start
+            history_rows = Patient.history.filter(patient_id__startswith='BENCH-H', city='Benchmark').count()
+            raise Rollback()
+    except Rollback:
+        pass
+
+    print(f"{label:<14}{elapsed * 1000:>10.1f}{rows / elapsed:>12.0f}{len(queries):>10}{history_rows:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from core.history import batched_history, bulk_update_with_history
+
+    def per_row(patients):
+        for patient in patients:
+            patient.save()
+
+    def batched(patients):
+        with batched_history():
+            for patient in patients:
+                patient.save()
+
+    def bulk_update(patients):
+        bulk_update_with_history(patients, ['city'], batch_size=500)
+
+    print(f"{'mode':<14}{'ms':>10}{'rows/s':>12}{'queries':>10}{'history':>10}")
+    run('per-row', args.rows, per_row)
+    run('batched', args.rows, batched)
+    run('bulk-update', args.rows, bulk_update)
+
+
+if __name__ == '__main__':
+    main()
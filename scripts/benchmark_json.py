@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Benchmark DRF's stdlib JSON renderer/parser against core.renderers.
+
+Builds representative invoice and consultation payloads with the real
+serializers inside a transaction that is rolled back afterwards, then times
+rendering and parsing them with each implementation.
+
+    python scripts/benchmark_json.py --invoices 200 --consultations 200
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+
+def setup_django():
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, project_dir)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hims_project.settings')
+    import django
+    django.setup()
+
+
+class Rollback(Exception):
+    pass
+
+
+def build_payloads(invoice_count, consultation_count):
+    from django.db import transaction
+    from accounts.models import User, Doctor
+    from billing.models import Service, Invoice, InvoiceItem, Payment
+    from billing.serializers import InvoiceSerializer
+    from billing.views import InvoiceViewSet
+    from consultation.models import Consultation, Prescription, LabRequest, ConsultationNote
+    from consultation.serializers import ConsultationSerializer
+    from consultation.views import ConsultationViewSet
+    from reception.models import Patient
+
+    payloads = {}
+    try:
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username='benchmark-json', password='x', first_name='Bench', last_name='Mark', user_type='doctor'
+            )
+            doctor = Doctor.objects.create(user=user, specialty='general', license_number='BENCH-JSON')
+            patient = Patient.objects.create(
+                first_name='Bench', last_name='Patient', date_of_birth=date(1980, 1, 1),
+                gender='F', phone_number='+254700000000', patient_id='BENCH-JSON'
+            )
+            services = [
+                Service.objects.create(
+                    name=f'Service {i}', code=f'BENCH-{i}', service_type='consultation',
+                    cost=Decimal('1250.50') + i, tax_rate=Decimal('16.00')
+                )
+                for i in range(5)
+            ]
+
+            for i in range(invoice_count):
+                invoice = Invoice.objects.create(
+                    patient=patient, invoice_number=f'BENCH{i:06d}', due_date=date.today() + timedelta(days=30),
+                    amount=Decimal('6000.00'), total_amount=Decimal('6960.00'), notes='Benchmark invoice',
+                    created_by=user
+                )
+                for service in services:
+                    InvoiceItem.objects.create(invoice=invoice, service=service, quantity=2, description=service.name)
+                for _ in range(2):
+                    Payment.objects.create(
+                        invoice=invoice, amount=Decimal('1500.00'), payment_method='cash', received_by=user
+                    )
+
+            for i in range(consultation_count):
+                consultation = Consultation.objects.create(
+                    patient=patient, doctor=doctor,
+                    chief_complaint='Persistent cough and fever for five days. ' * 3,
+                    history_of_present_illness='Gradual onset, worse at night, productive cough. ' * 10,
+                    review_of_systems={'respiratory': 'cough, wheeze', 'cardiovascular': 'normal', 'gi': 'normal'},
+                    physical_examination={'temperature': 38.4, 'pulse': 96, 'bp': '124/82', 'chest': 'crackles'},
+                    assessment='Likely lower respiratory tract infection. ' * 5,
+                    diagnosis='Community acquired pneumonia', plan='Antibiotics, review in one week. ' * 5
+                )
+                for j in range(3):
+                    Prescription.objects.create(
+                        consultation=consultation, medication=f'Medication {j}', dosage='500mg',
+                        frequency='TDS', duration='7 days', instructions='After meals', prescribed_by=doctor
+                    )
+                LabRequest.objects.create(
+                    consultation=consultation, test_name='Full blood count', test_type='haematology',
+                    requested_by=doctor
+                )
+                ConsultationNote.objects.create(consultation=consultation, created_by=user, note='Reviewed. ' * 20)
+
+            invoices = InvoiceViewSet.queryset.filter(created_by=user)
+            consultations = ConsultationViewSet.queryset.filter(doctor=doctor)
+            payloads['invoices'] = InvoiceSerializer(invoices, many=True).data
+            payloads['consultations'] = ConsultationSerializer(consultations, many=True).data
+            raise Rollback()
+    except Rollback:
+        pass
+    return payloads
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--invoices', type=int, default=200)
+    parser.add_argument('--consultations', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from core.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+    if orjson is None:
+        print("orjson is not installed; FastJSONRenderer falls back to the stdlib encoder")
+
+    payloads = build_payloads(args.invoices, args.consultations)
+    implementations = [
+        ('stdlib', JSONRenderer(), JSONParser()),
+        ('orjson' if orjson else 'fallback', FastJSONRenderer(), FastJSONParser()),
+    ]
+
+    print(f"{'payload':<15}{'renderer':<10}{'size':>12}{'render ms':>12}{'parse ms':>12}")
+    for name, data in payloads.items():
+        for label, renderer, json_parser in implementations:
+            body = renderer.render(data)
+            render_ms = timed(lambda: renderer.render(data), args.repeat)
+            parse_ms = timed(lambda: json_parser.parse(io.BytesIO(body)), args.repeat)
+            print(f"{name:<15}{label:<10}{len(body):>12}{render_ms:>12.2f}{parse_ms:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Benchmark vital sign ingestion: one POST per reading against bulk uploads.
+
+Generates readings for N stays (a gateway with N monitors) and posts them
+through the API three ways, each inside a transaction that is rolled back
+afterwards:
+
+  single   POST /api/ward/vitals/ once per reading
+  json     POST /api/ward/vitals/bulk/ with JSON arrays of --batch readings
+  ndjson   the same batches as application/x-ndjson
+
+    python scripts/benchmark_vitals_ingest.py --stays 60 --readings 3600 --batch 600
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date
+
+
+def setup_django():
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, project_dir)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hims_project.settings')
+    import django
+    django.setup()
+
+
+class Rollback(Exception):
+    pass
+
+
+def create_fixtures(stays):
+    from django.utils import timezone
+    from accounts.models import Doctor, User
+    from reception.models import Patient
+    from ward.models import Bed, Ward, WardStay
+
+    user = User.objects.create_user(
+        username='bench-gateway', email='gateway@example.com', password='x', user_type='nurse'
+    )
+    doctor = Doctor.objects.create(user=user, specialty='general', license_number='BENCH-GW')
+    ward = Ward.objects.create(name='Benchmark Ward', ward_type='icu', capacity=stays)
+    stay_ids = []
+    for i in range(stays):
+        patient = Patient.objects.create(
+            first_name=f'Bench{i}', last_name='Vitals', date_of_birth=date(1970, 1, 1),
+            gender='F', phone_number='+254700000000', patient_id=f'BENCH-V{i:05d}'
+        )
+        bed = Bed.objects.create(ward=ward, bed_number=f'B{i}', status='occupied')
+        stay = WardStay.objects.create(
+            patient=patient, bed=bed, admission_date=timezone.now(), admitting_doctor=doctor,
+            attending_doctor=doctor, admission_diagnosis='Benchmark', created_by=user
+        )
+        stay_ids.append(stay.id)
+    return user, stay_ids
+
+
+def generate(stay_ids, count):
+    return [
+        {
+            'ward_stay': stay_ids[i % len(stay_ids)],
+            'temperature': round(random.uniform(36.0, 38.5), 1),
+            'pulse_rate': random.randint(55, 120),
+            'respiratory_rate': random.randint(12, 24),
+            'blood_pressure_systolic': random.randint(95, 150),
+            'blood_pressure_diastolic': random.randint(60, 95),
+            'oxygen_saturation': random.randint(92, 100),
+        }
+        for i in range(count)
+    ]
+
+
+def run(label, args, post):
+    from django.db import transaction
+    from rest_framework.test import APIClient
+    from ward.models import VitalSign
+
+    try:
+        with transaction.atomic():
+            user, stay_ids = create_fixtures(args.stays)
+            client = APIClient(SERVER_NAME='localhost')
+            client.force_authenticate(user)
+            readings = generate(stay_ids, args.readings)
+
+            start = time.perf_counter()
+            requests = post(client, readings, stay_ids)
+            elapsed = time.perf_counter() - start
+            stored = VitalSign.objects.filter(ward_stay_id__in=stay_ids).count()
+            raise Rollback()
+    except Rollback:
+        pass
+
+    print(f"{label:<10}{requests:>10}{elapsed * 1000:>12.1f}{args.readings / elapsed:>14.0f}{stored:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stays', type=int, default=60)
+    parser.add_argument('--readings', type=int, default=3600)
+    parser.add_argument('--batch', type=int, default=600)
+    args = parser.parse_args()
+
+    setup_django()
+
+    def batches(readings):
+        return [readings[i:i + args.batch] for i in range(0, len(readings), args.batch)]
+
+    def single(client, readings, stay_ids):
+        recorded_by = client.handler._force_user.id
+        for reading in readings:
+            response = client.post('/api/ward/vitals/', dict(reading, recorded_by=recorded_by), format='json')
+            assert response.status_code == 201, response.content
+        return len(readings)
+
+    def bulk_json(client, readings, stay_ids):
+        for batch in batches(readings):
+            response = client.post('/api/ward/vitals/bulk/', batch, format='json')
+            assert response.status_code == 201 and not response.data['errors'], response.content
+        return len(batches(readings))
+
+    def bulk_ndjson(client, readings, stay_ids):
+        for batch in batches(readings):
+            body = '\n'.join(json.dumps(reading) for reading in batch)
+            response = client.generic('POST', '/api/ward/vitals/bulk/', body, content_type='application/x-ndjson')
+            assert response.status_code == 201 and not response.data['errors'], response.content
+        return len(batches(readings))
+
+    print(f"{'mode':<10}{'requests':>10}{'ms':>12}{'readings/s':>14}{'stored':>10}")
+    run('single', args, single)
+    run('json', args, bulk_json)
+    run('ndjson', args, bulk_ndjson)
+
+
+if __name__ == '__main__':
+    main()
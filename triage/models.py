@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from simple_history.models import HistoricalRecords
+from core.history import BatchedHistoricalRecords
+from ward import early_warning
 from accounts.models import User
 from reception.models import Patient, Appointment, Queue
 
@@ -26,6 +27,10 @@ class TriageRecord(models.Model):
     weight = models.DecimalField(max_digits=5, decimal_places=2, help_text="Weight in kg")
     height = models.DecimalField(max_digits=5, decimal_places=2, help_text="Height in cm")
     
+    # Early warning score, computed on save (see ward.early_warning)
+    early_warning_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    early_warning_risk = models.CharField(max_length=10, choices=early_warning.RISK_CHOICES, blank=True)
+    
     # Assessment
     chief_complaint = models.TextField()
     brief_history = models.TextField()
@@ -38,11 +43,15 @@ class TriageRecord(models.Model):
     notes = models.TextField(blank=True)
     
     # Track history
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords()
     
     def __str__(self):
         return f"Triage for {self.patient} on {self.triage_time.strftime('%Y-%m-%d %H:%M')}"
     
+    def save(self, *args, **kwargs):
+        self.early_warning_score, self.early_warning_risk = early_warning.score(self)
+        super().save(*args, **kwargs)
+    
     def calculate_bmi(self):
         """Calculate BMI (Body Mass Index)"""
         if self.height and self.weight:
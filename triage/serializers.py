@@ -20,6 +20,7 @@ class TriageRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = TriageRecord
         fields = '__all__'
+        read_only_fields = ['early_warning_score', 'early_warning_risk']
     
     def get_patient_details(self, obj):
         return {
@@ -0,0 +1,40 @@
+from datetime import date
+
+from django.test import TestCase
+
+from accounts.models import User
+from core.testing import QueryBudgetMixin
+from reception.models import Patient
+from .models import TriageNote, TriageRecord
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        cls.patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+
+    def setUp(self):
+        self.budget_user = self.admin
+
+    def triage(self, index=0):
+        return TriageRecord.objects.create(
+            patient=self.patient, temperature=36.8, pulse_rate=72, respiratory_rate=16,
+            blood_pressure_systolic=120, blood_pressure_diastolic=80, oxygen_saturation=98,
+            weight=70, height=170, chief_complaint='Headache', brief_history='Two days',
+            triage_level=3, nurse=self.admin
+        )
+
+    def test_records(self):
+        self.assertListQueries('/api/triage/records/', self.triage, 2)
+
+    def test_notes(self):
+        record = self.triage()
+        self.assertListQueries('/api/triage/notes/', lambda index: TriageNote.objects.create(
+            triage_record=record, created_by=self.admin, note=f'Note {index}'
+        ), 2)
@@ -6,9 +6,10 @@ from .models import TriageRecord, TriageNote
 from .serializers import TriageRecordSerializer, TriageNoteSerializer
 from reception.models import Queue
 from notifications.utils import send_notification
+from dashboard.activity import record_activity
 
 class TriageRecordViewSet(viewsets.ModelViewSet):
-    queryset = TriageRecord.objects.all()
+    queryset = TriageRecord.objects.select_related('patient', 'nurse')
     serializer_class = TriageRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -44,6 +45,15 @@ class TriageRecordViewSet(viewsets.ModelViewSet):
             
         queue_entry.save()
         
+        record_activity(
+            actor=request.user,
+            event_type='triage',
+            action=f'triaged (level {triage_record.triage_level})',
+            target=triage_record.patient.get_full_name(),
+            department='triage',
+            obj=triage_record
+        )
+        
         # Send notification to appropriate department based on triage level
         department = "emergency" if triage_record.triage_level <= 2 else queue_entry.department
         message = f"Patient {triage_record.patient.first_name} {triage_record.patient.last_name} triaged as level {triage_record.triage_level} - priority {queue_entry.priority}"
@@ -63,6 +73,6 @@ class TriageRecordViewSet(viewsets.ModelViewSet):
         return Response({'status': 'Triage completed and queue updated'})
 
 class TriageNoteViewSet(viewsets.ModelViewSet):
-    queryset = TriageNote.objects.all()
+    queryset = TriageNote.objects.select_related('created_by')
     serializer_class = TriageNoteSerializer
     permission_classes = [permissions.IsAuthenticated]
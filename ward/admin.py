@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Ward, Bed, WardStay, VitalSign, NursingTask
+from .models import Ward, Bed, WardStay, VitalSign, LatestVitals, NursingTask, RecurringTaskRule, WardCensus
 
 @admin.register(Ward)
 class WardAdmin(admin.ModelAdmin):
@@ -25,8 +25,26 @@ class VitalSignAdmin(admin.ModelAdmin):
     list_filter = ('recorded_at',)
     search_fields = ('ward_stay__patient__first_name', 'ward_stay__patient__last_name')
 
+@admin.register(LatestVitals)
+class LatestVitalsAdmin(admin.ModelAdmin):
+    list_display = ('ward_stay', 'ward', 'pulse_rate', 'oxygen_saturation', 'recorded_at', 'is_active')
+    list_filter = ('ward', 'is_active')
+    readonly_fields = ('updated_at',)
+
 @admin.register(NursingTask)
 class NursingTaskAdmin(admin.ModelAdmin):
     list_display = ('title', 'ward_stay', 'priority', 'status', 'scheduled_time', 'assigned_to')
     list_filter = ('priority', 'status', 'scheduled_time')
     search_fields = ('title', 'ward_stay__patient__first_name', 'ward_stay__patient__last_name')
+
+@admin.register(RecurringTaskRule)
+class RecurringTaskRuleAdmin(admin.ModelAdmin):
+    list_display = ('title', 'ward_stay', 'interval_minutes', 'starts_at', 'ends_at', 'assigned_to', 'is_active')
+    list_filter = ('is_active', 'priority')
+    search_fields = ('title', 'ward_stay__patient__first_name', 'ward_stay__patient__last_name')
+
+@admin.register(WardCensus)
+class WardCensusAdmin(admin.ModelAdmin):
+    list_display = ('ward', 'taken_at', 'total_beds', 'occupied_beds', 'active_stays')
+    list_filter = ('ward',)
+    date_hierarchy = 'taken_at'
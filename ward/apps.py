@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class WardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ward'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
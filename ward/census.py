@@ -0,0 +1,126 @@
+"""
+Ward census: periodic occupancy snapshots for historical trends.
+
+``take_snapshot`` records beds, occupied beds and active stays for every
+active ward into ``WardCensus``, one row per ward per census slot
+(``CENSUS_INTERVAL_MINUTES``). Run it from cron via ``take_census``:
+re-running within a slot changes nothing.
+
+Trends and period-over-period figures are read from these snapshots, so
+past occupancy never has to be rebuilt from WardStay history.
+"""
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from .models import Ward, WardCensus, WardStay
+
+BUCKETS = ('hour', 'day', 'week')
+
+
+def slot(at=None):
+    """Start of the census slot containing ``at``"""
+    at = at or timezone.now()
+    interval = settings.CENSUS_INTERVAL_MINUTES * 60
+    return at - timedelta(seconds=at.timestamp() % interval)
+
+
+def take_snapshot(at=None):
+    """Snapshot every active ward for the current slot; returns the number of rows written"""
+    taken_at = slot(at)
+    wards = Ward.objects.filter(is_active=True).annotate(
+        bed_count=Count('beds', filter=Q(beds__is_active=True)),
+        occupied_count=Count('beds', filter=Q(beds__is_active=True, beds__status='occupied')),
+    ).values_list('pk', 'bed_count', 'occupied_count')
+    stays = dict(
+        WardStay.objects.filter(is_active=True).values('bed__ward').annotate(count=Count('id'))
+        .values_list('bed__ward', 'count')
+    )
+    rows = [
+        WardCensus(
+            ward_id=ward_id, taken_at=taken_at, total_beds=bed_count,
+            occupied_beds=occupied_count, active_stays=stays.get(ward_id, 0)
+        )
+        for ward_id, bed_count, occupied_count in wards
+    ]
+    WardCensus.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows)
+
+
+def _snapshots(start, end, ward_id=None):
+    """Hospital (or single ward) totals per snapshot time in [start, end)"""
+    queryset = WardCensus.objects.filter(taken_at__gte=start, taken_at__lt=end)
+    if ward_id is not None:
+        queryset = queryset.filter(ward_id=ward_id)
+    return queryset.values('taken_at').annotate(
+        total_beds=Sum('total_beds'), occupied_beds=Sum('occupied_beds'), active_stays=Sum('active_stays')
+    ).order_by('taken_at')
+
+
+def _rate(occupied, total):
+    return round(occupied * 100.0 / total, 1) if total else 0.0
+
+
+def _bucket_start(taken_at, bucket):
+    local = timezone.localtime(taken_at)
+    if bucket == 'hour':
+        return local.replace(minute=0, second=0, microsecond=0)
+    day = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=day.weekday()) if bucket == 'week' else day
+
+
+def trend(start, end, ward_id=None, bucket='day'):
+    """Average occupancy and active stays per hour, day or week"""
+    buckets = OrderedDict()
+    for snapshot in _snapshots(start, end, ward_id):
+        key = _bucket_start(snapshot['taken_at'], bucket)
+        buckets.setdefault(key, []).append(snapshot)
+
+    series = []
+    for period, snapshots in buckets.items():
+        count = len(snapshots)
+        occupied = sum(row['occupied_beds'] for row in snapshots) / count
+        total = sum(row['total_beds'] for row in snapshots) / count
+        series.append({
+            'period': period,
+            'occupancy_rate': _rate(occupied, total),
+            'occupied_beds': round(occupied, 1),
+            'total_beds': round(total, 1),
+            'active_stays': round(sum(row['active_stays'] for row in snapshots) / count, 1),
+            'snapshots': count,
+        })
+    return series
+
+
+def snapshot_at(at, ward_id=None):
+    """Totals from the last snapshot taken at or shortly before ``at``, or None"""
+    tolerance = timedelta(minutes=2 * settings.CENSUS_INTERVAL_MINUTES)
+    queryset = WardCensus.objects.filter(taken_at__lte=at, taken_at__gt=at - tolerance)
+    if ward_id is not None:
+        queryset = queryset.filter(ward_id=ward_id)
+    taken_at = queryset.aggregate(latest=Max('taken_at'))['latest']
+    if taken_at is None:
+        return None
+    totals = _snapshots(taken_at, taken_at + timedelta(microseconds=1), ward_id).first()
+    return dict(totals, occupancy_rate=_rate(totals['occupied_beds'], totals['total_beds']))
+
+
+def period_change(days, ward_id=None, now=None):
+    """Mean occupancy over the last ``days`` against the ``days`` before, in percentage points"""
+    now = now or timezone.now()
+    periods = {}
+    for name, start, end in (
+        ('current', now - timedelta(days=days), now),
+        ('previous', now - timedelta(days=2 * days), now - timedelta(days=days)),
+    ):
+        snapshots = list(_snapshots(start, end, ward_id))
+        rates = [_rate(row['occupied_beds'], row['total_beds']) for row in snapshots]
+        periods[name] = round(sum(rates) / len(rates), 1) if rates else None
+
+    change = None
+    if periods['current'] is not None and periods['previous'] is not None:
+        change = round(periods['current'] - periods['previous'], 1)
+    return dict(periods, change=change, days=days)
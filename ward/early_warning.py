@@ -0,0 +1,161 @@
+"""
+NEWS2-style early warning scores for vital sign readings.
+
+Each vital is scored against banded thresholds (``BANDS``) and the scores
+are summed. Risk follows NEWS2: 7+ is high, 5-6 medium, and any single
+vital scoring 3 raises an otherwise low score to low-medium. Consciousness
+and supplemental oxygen are not recorded in this system, so those two
+NEWS2 parameters are left out.
+
+``score`` handles one reading with a few bisects and runs inline whenever a
+VitalSign or TriageRecord is saved. ``score_columns`` applies the same bands
+to whole numpy columns at once, which ``backfill`` uses to score historical
+readings in bulk.
+
+``alert_if_needed`` notifies the ward's head nurse when a stay reaches
+``EARLY_WARNING_ALERT_RISK``. Alerts are coalesced per stay and risk level
+for ``EARLY_WARNING_ALERT_COOLDOWN`` seconds, so a patient who stays
+unwell does not page the nurse on every reading.
+"""
+from bisect import bisect_left
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from core.cache import CacheNamespace
+
+# (inclusive upper bounds of each band, score for each band); the last band is open-ended
+BANDS = {
+    'respiratory_rate': ((8, 11, 20, 24), (3, 1, 0, 2, 3)),
+    'oxygen_saturation': ((91, 93, 95), (3, 2, 1, 0)),
+    'blood_pressure_systolic': ((90, 100, 110, 219), (3, 2, 1, 0, 3)),
+    'pulse_rate': ((40, 50, 90, 110, 130), (3, 1, 0, 1, 2, 3)),
+    'temperature': ((35.0, 36.0, 38.0, 39.0), (3, 1, 0, 1, 2)),
+}
+
+RISK_CHOICES = (
+    ('low', 'Low'),
+    ('low_medium', 'Low-Medium'),
+    ('medium', 'Medium'),
+    ('high', 'High'),
+)
+RISK_LEVELS = [risk for risk, _ in RISK_CHOICES]
+
+alerts = CacheNamespace('early_warning_alerts')
+
+
+def risk_for(total, highest):
+    if total >= 7:
+        return 'high'
+    if total >= 5:
+        return 'medium'
+    if highest >= 3:
+        return 'low_medium'
+    return 'low'
+
+
+def score(reading):
+    """(total, risk) for an object with the vital sign attributes"""
+    total = highest = 0
+    for field, (bounds, scores) in BANDS.items():
+        value = getattr(reading, field)
+        if value is None:
+            continue
+        points = scores[bisect_left(bounds, float(value))]
+        total += points
+        highest = max(highest, points)
+    return total, risk_for(total, highest)
+
+
+def score_columns(columns):
+    """
+    Vectorized ``score``: ``columns`` maps each vital to an array of
+    readings; returns (totals, risk index into RISK_LEVELS) arrays.
+    """
+    totals = highest = None
+    for field, (bounds, scores) in BANDS.items():
+        values = np.asarray(columns[field], dtype=float)
+        points = np.asarray(scores)[np.searchsorted(bounds, values, side='left')]
+        # Missing readings (NaN) score nothing
+        points = np.where(np.isnan(values), 0, points)
+        totals = points if totals is None else totals + points
+        highest = points if highest is None else np.maximum(highest, points)
+
+    risks = np.zeros(len(totals), dtype=int)
+    risks[highest >= 3] = RISK_LEVELS.index('low_medium')
+    risks[totals >= 5] = RISK_LEVELS.index('medium')
+    risks[totals >= 7] = RISK_LEVELS.index('high')
+    return totals, risks
+
+
+def backfill(queryset, chunk_size=5000):
+    """
+    Score every reading in ``queryset`` (VitalSign or TriageRecord) in chunks.
+
+    Rows are grouped by resulting (score, risk), so each chunk costs one
+    UPDATE per distinct outcome rather than one per row. Returns the number
+    of readings scored.
+    """
+    model = queryset.model
+    fields = list(BANDS)
+    scored = 0
+    rows = queryset.order_by('pk').values_list('pk', *fields)
+    last_pk = None
+    while True:
+        chunk = list((rows.filter(pk__gt=last_pk) if last_pk is not None else rows)[:chunk_size])
+        if not chunk:
+            return scored
+        last_pk = chunk[-1][0]
+
+        pks = np.array([row[0] for row in chunk])
+        columns = {
+            field: [np.nan if row[index] is None else float(row[index]) for row in chunk]
+            for index, field in enumerate(fields, start=1)
+        }
+        totals, risks = score_columns(columns)
+        outcomes = totals * len(RISK_LEVELS) + risks
+        with transaction.atomic():
+            for outcome in np.unique(outcomes):
+                total, risk = divmod(int(outcome), len(RISK_LEVELS))
+                model.objects.filter(pk__in=pks[outcomes == outcome].tolist()).update(
+                    early_warning_score=total, early_warning_risk=RISK_LEVELS[risk]
+                )
+        scored += len(chunk)
+
+
+def alert_if_needed(vital_sign):
+    """Notify the head nurse once per stay and risk level within the cooldown"""
+    threshold = RISK_LEVELS.index(settings.EARLY_WARNING_ALERT_RISK)
+    if RISK_LEVELS.index(vital_sign.early_warning_risk or 'low') < threshold:
+        return
+
+    key = alerts.key(vital_sign.ward_stay_id, vital_sign.early_warning_risk)
+    if not alerts.cache.add(key, vital_sign.pk, timeout=settings.EARLY_WARNING_ALERT_COOLDOWN):
+        return
+
+    from notifications.utils import send_notification
+    from .models import WardStay
+
+    stay = WardStay.objects.select_related('patient', 'bed__ward').get(pk=vital_sign.ward_stay_id)
+    head_nurse_id = stay.bed.ward.head_nurse_id
+    if head_nurse_id is None:
+        return
+
+    risk_label = dict(RISK_CHOICES)[vital_sign.early_warning_risk]
+    send_notification(
+        recipient_type='user',
+        recipient_id=head_nurse_id,
+        notification_type='alert',
+        title=f'Early warning: {risk_label} risk',
+        message=(
+            f'{stay.patient.first_name} {stay.patient.last_name} (bed {stay.bed.bed_number}, '
+            f'{stay.bed.ward.name}) scored {vital_sign.early_warning_score}.'
+        ),
+        data={
+            'ward_stay_id': stay.id,
+            'vital_sign_id': vital_sign.pk,
+            'score': vital_sign.early_warning_score,
+            'risk': vital_sign.early_warning_risk,
+        }
+    )
@@ -0,0 +1,138 @@
+"""
+Bed availability forecasts per ward for the next 24, 48 and 72 hours.
+
+For every active stay the chance of discharge within each horizon is
+estimated in one vectorized pass per ward:
+
+* stays with an ``expected_discharge_date`` are expected to leave at
+  ``EXPECTED_DISCHARGE_HOUR`` on that day (immediately if already overdue);
+* other stays use the ward's historical length-of-stay distribution,
+  conditioned on the time already spent: P(LOS <= t + h | LOS > t). Wards
+  with too little history fall back to the hospital-wide distribution.
+
+Expected arrivals come from each ward's recent admission rate. Predicted
+available beds = available now + expected discharges - expected arrivals,
+clamped to the ward's bed count.
+
+The forecast is cached in the ``bed_forecast`` namespace and invalidated by
+any admission, discharge or bed status change (see ward.signals), so repeated
+reads are served from cache.
+"""
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.cache import CacheNamespace
+from reports.length_of_stay import load as load_lengths_of_stay
+from .models import Ward, WardStay
+
+HORIZONS = (24, 48, 72)
+EXPECTED_DISCHARGE_HOUR = 12
+# Wards with fewer completed stays than this use the hospital-wide distribution
+MIN_HISTORY = 20
+ARRIVAL_WINDOW_DAYS = 28
+
+cache = CacheNamespace('bed_forecast', timeout=settings.BED_FORECAST_CACHE_SECONDS)
+
+
+def discharge_probabilities(elapsed, lengths, horizons=HORIZONS):
+    """
+    P(discharged within each horizon | still admitted after ``elapsed`` hours).
+
+    ``lengths`` is a sorted array of historical stay lengths in hours.
+    Survival counts are smoothed by one so stays longer than anything seen
+    before get a probability of 0 rather than a division by zero.
+    """
+    n = len(lengths)
+    targets = elapsed[:, None] + np.asarray(horizons, dtype=float)[None, :]
+    survived_now = n - np.searchsorted(lengths, elapsed, side='right') + 1
+    survived_then = n - np.searchsorted(lengths, targets, side='right') + 1
+    return 1.0 - survived_then / survived_now[:, None]
+
+
+def _expected_discharge_times(dates):
+    return np.array([
+        timezone.make_aware(datetime.combine(date, time(EXPECTED_DISCHARGE_HOUR))).timestamp()
+        if date else np.nan
+        for date in dates
+    ])
+
+
+def compute(now=None):
+    """Forecast for every active ward; one query each for stays, history, beds and arrivals"""
+    now = now or timezone.now()
+    horizons = np.asarray(HORIZONS, dtype=float)
+
+    stays = list(WardStay.objects.filter(is_active=True).values_list(
+        'bed__ward_id', 'admission_date', 'expected_discharge_date'
+    ))
+    stay_wards = np.fromiter((row[0] for row in stays), dtype=np.int64, count=len(stays))
+    elapsed = np.fromiter(
+        ((now - row[1]).total_seconds() / 3600 for row in stays), dtype=float, count=len(stays)
+    )
+    expected_at = _expected_discharge_times([row[2] for row in stays])
+    hours_to_expected = (expected_at - now.timestamp()) / 3600
+
+    history_start = (now - timedelta(days=settings.BED_FORECAST_HISTORY_DAYS)).date()
+    lengths, length_wards, _ = load_lengths_of_stay(history_start, now.date())
+    hospital_lengths = np.sort(lengths)
+
+    arrivals_since = now - timedelta(days=ARRIVAL_WINDOW_DAYS)
+    wards = Ward.objects.filter(is_active=True).annotate(
+        bed_count=Count('beds', filter=Q(beds__is_active=True), distinct=True),
+        available_count=Count('beds', filter=Q(beds__is_active=True, beds__status='available'), distinct=True),
+        recent_admissions=Count(
+            'beds__ward_stays', filter=Q(beds__ward_stays__admission_date__gte=arrivals_since), distinct=True
+        ),
+    ).values_list('id', 'name', 'bed_count', 'available_count', 'recent_admissions')
+
+    forecasts = []
+    for ward_id, name, bed_count, available, recent_admissions in wards:
+        in_ward = stay_wards == ward_id
+        ward_lengths = np.sort(lengths[length_wards == ward_id])
+        history = ward_lengths if len(ward_lengths) >= MIN_HISTORY else hospital_lengths
+
+        if len(history):
+            probabilities = discharge_probabilities(elapsed[in_ward], history)
+        else:
+            probabilities = np.zeros((int(in_ward.sum()), len(horizons)))
+        # A recorded expected discharge date overrides the statistical estimate
+        scheduled = hours_to_expected[in_ward]
+        has_date = ~np.isnan(scheduled)
+        probabilities[has_date] = (scheduled[has_date, None] <= horizons[None, :]).astype(float)
+
+        discharges = probabilities.sum(axis=0)
+        arrivals = recent_admissions / (ARRIVAL_WINDOW_DAYS * 24) * horizons
+        predicted = np.clip(available + discharges - arrivals, 0, bed_count)
+
+        forecasts.append({
+            'ward_id': ward_id,
+            'ward': name,
+            'total_beds': bed_count,
+            'available_now': available,
+            'active_stays': int(in_ward.sum()),
+            'horizons': [
+                {
+                    'hours': int(hours),
+                    'expected_discharges': round(float(discharges[index]), 1),
+                    'scheduled_discharges': int((has_date & (scheduled <= hours)).sum()),
+                    'expected_admissions': round(float(arrivals[index]), 1),
+                    'predicted_available': round(float(predicted[index]), 1),
+                }
+                for index, hours in enumerate(horizons)
+            ],
+        })
+
+    return {'generated_at': now, 'horizons': list(HORIZONS), 'wards': forecasts}
+
+
+def forecast():
+    """Cached forecast; recomputed after the next admission, discharge or bed change"""
+    return cache.get_or_set('all', compute)
+
+
+def invalidate():
+    cache.invalidate()
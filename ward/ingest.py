@@ -0,0 +1,187 @@
+"""
+Bulk vital sign ingestion for bedside device gateways.
+
+``ingest`` takes a batch of reading dicts (from a JSON array or NDJSON) and
+validates it column by column: each vital is converted to a numpy array once
+and checked for presence, integrality and plausible range with array masks,
+instead of running a serializer per row. Ward stays are resolved with a
+single query, early warning scores come from ``early_warning.score_columns``
+and the valid rows are written with ``bulk_create``.
+
+Invalid rows are reported by index with DRF-style field errors and never
+fail the rest of the batch. Because ``bulk_create`` skips signals, the
+affected stays' LatestVitals rows are rebuilt and early warning alerts are
+raised here.
+"""
+import math
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.renderers import MalformedLine
+from . import early_warning
+from .models import VitalSign, WardStay
+from .vitals import VITAL_FIELDS, refresh_latest
+
+# Plausible device ranges (inclusive); anything outside is a sensor or mapping fault
+VALID_RANGES = {
+    'temperature': (25, 45),
+    'pulse_rate': (0, 300),
+    'respiratory_rate': (0, 80),
+    'blood_pressure_systolic': (0, 300),
+    'blood_pressure_diastolic': (0, 200),
+    'oxygen_saturation': (0, 100),
+}
+INTEGER_FIELDS = [field for field in VITAL_FIELDS if field != 'temperature']
+
+# Readings stamped further in the future than this are rejected
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+BULK_CREATE_BATCH_SIZE = 500
+
+
+def _to_float(value):
+    if value is None or isinstance(value, bool):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _column(items, field):
+    raw = [item.get(field) if item is not None else None for item in items]
+    missing = np.fromiter((value is None or value == '' for value in raw), dtype=bool, count=len(raw))
+    values = np.fromiter((_to_float(value) for value in raw), dtype=float, count=len(raw))
+    return values, missing
+
+
+def _stay_id_range():
+    """Ward stay IDs the primary key column can hold and a float represents exactly"""
+    # Auto fields have no range of their own; use the integer type they are stored as
+    column_type = WardStay._meta.pk.get_internal_type().replace('AutoField', 'IntegerField')
+    _, high = connection.ops.integer_field_range(column_type)
+    # SQLite reports no limit; the float columns cap IDs at 2**53 regardless
+    return 1, min(high or 2 ** 53, 2 ** 53)
+
+
+def validate(readings):
+    """
+    Column-wise validation of a batch.
+
+    Returns (columns, stay_ids, recorded_at, errors) where errors maps a row
+    index to {field: [messages]} for every rejected row.
+    """
+    count = len(readings)
+    errors = defaultdict(lambda: defaultdict(list))
+    items = []
+    for index, item in enumerate(readings):
+        if isinstance(item, dict):
+            items.append(item)
+            continue
+        items.append(None)
+        message = str(item) if isinstance(item, MalformedLine) else 'Expected a JSON object.'
+        errors[index]['non_field_errors'].append(message)
+    rejected = np.array([item is None for item in items], dtype=bool)
+
+    def flag(mask, field, message):
+        for index in np.flatnonzero(mask & ~rejected):
+            errors[int(index)][field].append(message)
+
+    columns = {}
+    for field in VITAL_FIELDS:
+        values, missing = _column(items, field)
+        low, high = VALID_RANGES[field]
+        invalid = np.isnan(values) & ~missing
+        flag(missing, field, 'This field is required.')
+        flag(invalid, field, 'A valid number is required.')
+        with np.errstate(invalid='ignore'):
+            if field in INTEGER_FIELDS:
+                flag(~np.isnan(values) & (values != np.floor(values)), field, 'A valid integer is required.')
+            flag((values < low) | (values > high), field, f'Ensure this value is between {low} and {high}.')
+        columns[field] = values
+
+    stay_ids, stay_missing = _column(items, 'ward_stay')
+    low, high = _stay_id_range()
+    with np.errstate(invalid='ignore'):
+        integral = np.isfinite(stay_ids) & (stay_ids == np.floor(stay_ids))
+        in_range = integral & (stay_ids >= low) & (stay_ids <= high)
+    flag(stay_missing, 'ward_stay', 'This field is required.')
+    flag(~integral & ~stay_missing, 'ward_stay', 'A valid integer is required.')
+    flag(integral & ~in_range, 'ward_stay', f'Ensure this value is between {low} and {high}.')
+    requested = {int(stay_id) for stay_id in stay_ids[in_range]}
+    active = set(WardStay.objects.filter(pk__in=requested, is_active=True).values_list('pk', flat=True))
+    unknown = in_range & np.fromiter(
+        (valid and int(stay_id) not in active for stay_id, valid in zip(stay_ids, in_range)), dtype=bool, count=count
+    )
+    flag(unknown, 'ward_stay', 'Ward stay not found or already discharged.')
+
+    now = timezone.now()
+    recorded_at = [now] * count
+    for index, item in enumerate(items):
+        value = item.get('recorded_at') if item is not None else None
+        if not value:
+            continue
+        try:
+            parsed = parse_datetime(value) if isinstance(value, str) else None
+        except ValueError:
+            # Well formed but impossible, e.g. month 13
+            parsed = None
+        if parsed is None:
+            errors[index]['recorded_at'].append('Datetime has wrong format. Use ISO 8601.')
+            continue
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        if parsed > now + MAX_CLOCK_SKEW:
+            errors[index]['recorded_at'].append('Reading is timestamped in the future.')
+        recorded_at[index] = parsed
+
+    return columns, stay_ids, recorded_at, {index: dict(fields) for index, fields in errors.items()}
+
+
+def _raise_alerts(vital_signs):
+    for vital_sign in vital_signs:
+        early_warning.alert_if_needed(vital_sign)
+
+
+def ingest(readings, recorded_by):
+    """Validate and insert a batch of readings; returns counts and per-row errors"""
+    columns, stay_ids, recorded_at, errors = validate(readings)
+    valid = np.array([index not in errors for index in range(len(readings))], dtype=bool)
+    indices = np.flatnonzero(valid)
+
+    totals, risks = early_warning.score_columns({field: values[valid] for field, values in columns.items()})
+    vital_signs = []
+    for position, index in enumerate(indices):
+        values = {field: int(columns[field][index]) for field in INTEGER_FIELDS}
+        values['temperature'] = Decimal(f"{columns['temperature'][index]:.2f}")
+        vital_signs.append(VitalSign(
+            ward_stay_id=int(stay_ids[index]),
+            recorded_by=recorded_by,
+            recorded_at=recorded_at[index],
+            notes=str(readings[index].get('notes') or ''),
+            early_warning_score=int(totals[position]),
+            early_warning_risk=early_warning.RISK_LEVELS[risks[position]],
+            **values
+        ))
+
+    if vital_signs:
+        with transaction.atomic():
+            VitalSign.objects.bulk_create(vital_signs, batch_size=BULK_CREATE_BATCH_SIZE)
+            newest = {}
+            for vital_sign in vital_signs:
+                current = newest.get(vital_sign.ward_stay_id)
+                if current is None or vital_sign.recorded_at >= current.recorded_at:
+                    newest[vital_sign.ward_stay_id] = vital_sign
+            refresh_latest(list(newest))
+            transaction.on_commit(lambda: _raise_alerts(newest.values()))
+
+    return {
+        'received': len(readings),
+        'created': len(vital_signs),
+        'errors': [{'index': index, 'errors': errors[index]} for index in sorted(errors)],
+    }
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ward.nursing_tasks import expand, horizon
+
+
+class Command(BaseCommand):
+    help = 'Expand active recurring nursing task rules into tasks up to the scheduling horizon'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, help='Hours ahead to expand (default: NURSING_TASK_HORIZON_HOURS)')
+
+    def handle(self, *args, **options):
+        until = timezone.now() + timedelta(hours=options['hours']) if options['hours'] else horizon()
+        created = expand(until=until)
+        self.stdout.write(self.style.SUCCESS(f"Created {created} task(s) through {until:%Y-%m-%d %H:%M}"))
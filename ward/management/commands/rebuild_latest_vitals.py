@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ward.vitals import refresh_latest
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the latest-vitals board rows from recorded VitalSign readings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stay', type=int, action='append', help='Limit to a ward stay ID (repeatable)')
+
+    def handle(self, *args, **options):
+        count = refresh_latest(options['stay'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt latest vitals for {count} stay(s)"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from triage.models import TriageRecord
+from ward.early_warning import backfill
+from ward.models import VitalSign
+from ward.vitals import refresh_latest
+
+
+class Command(BaseCommand):
+    help = 'Compute early warning scores for vital sign and triage readings recorded without one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rescore every reading, not only unscored ones')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        for model in (VitalSign, TriageRecord):
+            queryset = model.objects.all()
+            if not options['all']:
+                queryset = queryset.filter(early_warning_score__isnull=True)
+            stay_ids = set(queryset.values_list('ward_stay_id', flat=True).distinct()) if model is VitalSign else None
+
+            count = backfill(queryset, chunk_size=options['chunk_size'])
+            self.stdout.write(f"{model._meta.verbose_name_plural}: scored {count}")
+            if stay_ids:
+                refresh_latest(stay_ids)
+
+        self.stdout.write(self.style.SUCCESS('Early warning scores are up to date'))
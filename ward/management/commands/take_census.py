@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ward.census import slot, take_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Snapshot per-ward occupancy for the current census slot (run every CENSUS_INTERVAL_MINUTES)'
+
+    def handle(self, *args, **options):
+        count = take_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"Census for {count} ward(s) at {slot():%Y-%m-%d %H:%M}"))
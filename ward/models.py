@@ -1,6 +1,9 @@
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from simple_history.models import HistoricalRecords
+from core.history import BatchedHistoricalRecords
+from . import early_warning
 from accounts.models import User, Doctor
 from reception.models import Patient
 
@@ -112,7 +115,7 @@ class WardStay(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     # Track history
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords()
     
     def __str__(self):
         return f"{self.patient} - {self.bed} ({'Active' if self.is_active else 'Discharged'})"
@@ -131,16 +134,58 @@ class VitalSign(models.Model):
     blood_pressure_diastolic = models.PositiveIntegerField()
     oxygen_saturation = models.PositiveIntegerField(help_text="SpO2 in percentage")
     
+    # Early warning score, computed on save (see ward.early_warning)
+    early_warning_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    early_warning_risk = models.CharField(max_length=10, choices=early_warning.RISK_CHOICES, blank=True)
+    
     # System fields
     recorded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recorded_vitals')
-    recorded_at = models.DateTimeField(auto_now_add=True)
+    # Set by the server for single readings; bulk ingestion keeps the device's timestamp
+    recorded_at = models.DateTimeField(default=timezone.now)
     notes = models.TextField(blank=True)
     
     def __str__(self):
         return f"Vitals for {self.ward_stay.patient} on {self.recorded_at.strftime('%Y-%m-%d %H:%M')}"
     
+    def save(self, *args, **kwargs):
+        self.early_warning_score, self.early_warning_risk = early_warning.score(self)
+        super().save(*args, **kwargs)
+    
     class Meta:
         ordering = ['-recorded_at']
+        # Serves per-stay time-range reads (ward.vitals) and latest-reading lookups
+        indexes = [
+            models.Index(fields=['ward_stay', 'recorded_at'], name='vitals_stay_recorded_idx'),
+        ]
+
+class LatestVitals(models.Model):
+    """Most recent VitalSign per ward stay, maintained by ward.signals for ward monitoring boards"""
+    ward_stay = models.OneToOneField(WardStay, on_delete=models.CASCADE, primary_key=True, related_name='latest_vitals')
+    ward = models.ForeignKey(Ward, on_delete=models.CASCADE, related_name='latest_vitals')
+    vital_sign = models.ForeignKey(VitalSign, on_delete=models.CASCADE, related_name='+')
+    
+    # Copied from the reading so boards need no join on VitalSign
+    temperature = models.DecimalField(max_digits=5, decimal_places=2)
+    pulse_rate = models.PositiveIntegerField()
+    respiratory_rate = models.PositiveIntegerField()
+    blood_pressure_systolic = models.PositiveIntegerField()
+    blood_pressure_diastolic = models.PositiveIntegerField()
+    oxygen_saturation = models.PositiveIntegerField()
+    early_warning_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    early_warning_risk = models.CharField(max_length=10, choices=early_warning.RISK_CHOICES, blank=True)
+    recorded_at = models.DateTimeField()
+    
+    # Mirrors WardStay.is_active; discharged stays stay visible to delta polls as removals
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Latest vitals for stay {self.ward_stay_id} at {self.recorded_at.strftime('%Y-%m-%d %H:%M')}"
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['ward', 'updated_at'], name='latest_vitals_ward_idx'),
+        ]
 
 class NursingTask(models.Model):
     STATUS_CHOICES = (
@@ -158,6 +203,7 @@ class NursingTask(models.Model):
     )
     
     ward_stay = models.ForeignKey(WardStay, on_delete=models.CASCADE, related_name='nursing_tasks')
+    rule = models.ForeignKey('RecurringTaskRule', on_delete=models.SET_NULL, null=True, blank=True, related_name='tasks')
     
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -184,3 +230,62 @@ class NursingTask(models.Model):
     
     class Meta:
         ordering = ['scheduled_time']
+        indexes = [
+            # Per-nurse worklists and the upcoming view
+            models.Index(fields=['assigned_to', 'status', 'scheduled_time'], name='nursing_task_worklist_idx'),
+        ]
+        constraints = [
+            # Makes rule expansion idempotent under concurrent requests
+            models.UniqueConstraint(fields=['rule', 'scheduled_time'], name='nursing_task_rule_occurrence'),
+        ]
+
+class RecurringTaskRule(models.Model):
+    """Recurring nursing care (e.g. q4h obs) expanded into NursingTask rows by ward.nursing_tasks"""
+    ward_stay = models.ForeignKey(WardStay, on_delete=models.CASCADE, related_name='task_rules')
+    
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    priority = models.CharField(max_length=20, choices=NursingTask.PRIORITY_CHOICES, default='normal')
+    
+    # Recurrence
+    interval_minutes = models.PositiveIntegerField(validators=[MinValueValidator(1)], help_text="Minutes between occurrences, e.g. 240 for q4h")
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    # Tasks exist for every occurrence before this time
+    expanded_until = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    # Staff assignment
+    assigned_to = models.ForeignKey(User, on_delete=models.CASCADE, related_name='nursing_task_rules')
+    
+    # System fields
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_nursing_task_rules')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.title} every {self.interval_minutes} min for {self.ward_stay.patient}"
+    
+    class Meta:
+        ordering = ['starts_at']
+
+class WardCensus(models.Model):
+    """Periodic snapshot of one ward's occupancy, written by the take_census command"""
+    ward = models.ForeignKey(Ward, on_delete=models.CASCADE, related_name='census')
+    taken_at = models.DateTimeField()
+    total_beds = models.PositiveIntegerField()
+    occupied_beds = models.PositiveIntegerField()
+    active_stays = models.PositiveIntegerField()
+    
+    def __str__(self):
+        return f"{self.ward.name} census at {self.taken_at.strftime('%Y-%m-%d %H:%M')}"
+    
+    class Meta:
+        ordering = ['-taken_at']
+        constraints = [
+            # One snapshot per ward per census slot; also serves range reads per ward
+            models.UniqueConstraint(fields=['ward', 'taken_at'], name='ward_census_slot'),
+        ]
+        indexes = [
+            models.Index(fields=['taken_at'], name='ward_census_taken_idx'),
+        ]
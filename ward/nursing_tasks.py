@@ -0,0 +1,129 @@
+"""
+Recurring nursing task scheduling and per-nurse worklists.
+
+A ``RecurringTaskRule`` (e.g. observations every 240 minutes) is expanded
+lazily into concrete ``NursingTask`` rows, only as far as a rolling horizon
+(``NURSING_TASK_HORIZON_HOURS`` ahead of now). ``expanded_until`` records
+how far each rule has been expanded, so a later expansion only creates the
+occurrences after it. Occurrences more than ``PAST_OCCURRENCE_GRACE`` in the
+past are never created, so a backdated rule, or one whose expansion fell
+behind, does not flood the worklist with overdue tasks. The (rule,
+scheduled_time) unique constraint makes concurrent expansions harmless:
+duplicates are skipped on insert.
+
+Expansion runs when a rule is created or changed and from the
+``expand_task_rules`` command, which should run at least hourly to keep every
+rule expanded to the horizon. Reads never expand: worklists only read the
+``(assigned_to, status, scheduled_time)`` index, in a single query.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import NursingTask, RecurringTaskRule
+
+OPEN_STATUSES = ('scheduled', 'in_progress')
+# How far back an expansion still creates missed occurrences
+PAST_OCCURRENCE_GRACE = timedelta(hours=1)
+
+
+def horizon():
+    """End of the expansion window, rounded up to the hour so rules are extended at most hourly"""
+    until = timezone.now() + timedelta(hours=settings.NURSING_TASK_HORIZON_HOURS)
+    return until.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+
+def occurrences(rule, start, end):
+    """Occurrence times of ``rule`` in [start, end)"""
+    step = timedelta(minutes=rule.interval_minutes)
+    current = max(start, rule.starts_at)
+    offset = (current - rule.starts_at) % step
+    if offset:
+        current += step - offset
+    stop = min(end, rule.ends_at) if rule.ends_at else end
+    while current < stop:
+        yield current
+        current += step
+
+
+def expand(rules=None, until=None):
+    """Create the tasks for every occurrence of ``rules`` before ``until``; returns the number created"""
+    until = until or horizon()
+    rules = RecurringTaskRule.objects.all() if rules is None else rules
+    due = list(rules.filter(
+        Q(expanded_until__isnull=True) | Q(expanded_until__lt=until),
+        is_active=True,
+        ward_stay__is_active=True,
+    ))
+    if not due:
+        return 0
+
+    earliest = timezone.now() - PAST_OCCURRENCE_GRACE
+    tasks = [
+        NursingTask(
+            ward_stay_id=rule.ward_stay_id,
+            rule=rule,
+            title=rule.title,
+            description=rule.description,
+            priority=rule.priority,
+            scheduled_time=scheduled_time,
+            assigned_to_id=rule.assigned_to_id,
+            created_by_id=rule.created_by_id,
+        )
+        for rule in due
+        for scheduled_time in occurrences(rule, max(rule.expanded_until or rule.starts_at, earliest), until)
+    ]
+    with transaction.atomic():
+        NursingTask.objects.bulk_create(tasks, batch_size=500, ignore_conflicts=True)
+        RecurringTaskRule.objects.filter(
+            Q(expanded_until__isnull=True) | Q(expanded_until__lt=until),
+            pk__in=[rule.pk for rule in due]
+        ).update(expanded_until=until)
+    return len(tasks)
+
+
+def stop(rules):
+    """Deactivate ``rules`` and cancel their tasks that have not started yet"""
+    rule_ids = list(rules.values_list('pk', flat=True))
+    with transaction.atomic():
+        RecurringTaskRule.objects.filter(pk__in=rule_ids).update(is_active=False)
+        return NursingTask.objects.filter(
+            rule_id__in=rule_ids, status='scheduled', scheduled_time__gte=timezone.now()
+        ).update(status='cancelled', updated_at=timezone.now())
+
+
+def reschedule(rule):
+    """Replace a changed rule's future occurrences with ones matching its new settings"""
+    if not rule.is_active:
+        return stop(RecurringTaskRule.objects.filter(pk=rule.pk))
+    now = timezone.now()
+    with transaction.atomic():
+        # Includes occurrences cancelled by ``stop``, which would otherwise block re-creation
+        NursingTask.objects.filter(
+            rule=rule, status__in=('scheduled', 'cancelled'), scheduled_time__gte=now
+        ).delete()
+        RecurringTaskRule.objects.filter(pk=rule.pk, expanded_until__isnull=False).update(expanded_until=now)
+        return expand(RecurringTaskRule.objects.filter(pk=rule.pk))
+
+
+def worklist(queryset, user, start, end, statuses=OPEN_STATUSES):
+    """A nurse's tasks due in [start, end); recurring rules are covered up to the expansion horizon"""
+    return queryset.filter(
+        assigned_to=user, status__in=statuses, scheduled_time__gte=start, scheduled_time__lt=end
+    ).order_by('scheduled_time')
+
+
+def bulk_complete(task_ids, user):
+    """Complete the given open tasks; returns (completed ids, skipped ids)"""
+    task_ids = set(task_ids)
+    with transaction.atomic():
+        completable = set(NursingTask.objects.select_for_update().filter(
+            pk__in=task_ids, status__in=OPEN_STATUSES
+        ).values_list('pk', flat=True))
+        NursingTask.objects.filter(pk__in=completable).update(
+            status='completed', completed_at=timezone.now(), completed_by=user, updated_at=timezone.now()
+        )
+    return sorted(completable), sorted(task_ids - completable)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Ward, Bed, WardStay, VitalSign, NursingTask
+from core.serializers import SparseFieldsMixin
+from .models import Ward, Bed, WardStay, VitalSign, LatestVitals, NursingTask, RecurringTaskRule
 
 class WardSerializer(serializers.ModelSerializer):
     available_beds = serializers.IntegerField(read_only=True)
@@ -19,7 +20,7 @@ class BedSerializer(serializers.ModelSerializer):
     def get_ward_name(self, obj):
         return obj.ward.name
 
-class WardStaySerializer(serializers.ModelSerializer):
+class WardStaySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
     bed_info = serializers.SerializerMethodField()
     doctor_name = serializers.SerializerMethodField()
@@ -28,6 +29,7 @@ class WardStaySerializer(serializers.ModelSerializer):
     class Meta:
         model = WardStay
         fields = '__all__'
+        source_fields = {'stay_duration': ['admission_date', 'discharge_date']}
     
     def get_patient_name(self, obj):
         return f"{obj.patient.first_name} {obj.patient.last_name}"
@@ -45,6 +47,16 @@ class WardStaySerializer(serializers.ModelSerializer):
         duration = end_date - obj.admission_date
         return duration.days
 
+class WardStaySummarySerializer(WardStaySerializer):
+    """Columns shown on the admissions list"""
+    
+    class Meta(WardStaySerializer.Meta):
+        fields = [
+            'id', 'patient', 'patient_name', 'bed', 'bed_info', 'doctor_name',
+            'admission_date', 'expected_discharge_date', 'discharge_date',
+            'admission_type', 'is_active', 'stay_duration'
+        ]
+
 class VitalSignSerializer(serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
     recorded_by_name = serializers.SerializerMethodField()
@@ -52,6 +64,7 @@ class VitalSignSerializer(serializers.ModelSerializer):
     class Meta:
         model = VitalSign
         fields = '__all__'
+        read_only_fields = ['recorded_at', 'early_warning_score', 'early_warning_risk']
     
     def get_patient_name(self, obj):
         return f"{obj.ward_stay.patient.first_name} {obj.ward_stay.patient.last_name}"
@@ -59,6 +72,23 @@ class VitalSignSerializer(serializers.ModelSerializer):
     def get_recorded_by_name(self, obj):
         return obj.recorded_by.get_full_name()
 
+class LatestVitalsSerializer(serializers.ModelSerializer):
+    patient_name = serializers.SerializerMethodField()
+    patient_id = serializers.CharField(source='ward_stay.patient.patient_id', read_only=True)
+    bed_number = serializers.CharField(source='ward_stay.bed.bed_number', read_only=True)
+    
+    class Meta:
+        model = LatestVitals
+        fields = [
+            'ward_stay', 'patient_name', 'patient_id', 'bed_number', 'vital_sign',
+            'temperature', 'pulse_rate', 'respiratory_rate', 'blood_pressure_systolic',
+            'blood_pressure_diastolic', 'oxygen_saturation', 'early_warning_score', 'early_warning_risk',
+            'recorded_at', 'is_active', 'updated_at'
+        ]
+    
+    def get_patient_name(self, obj):
+        return f"{obj.ward_stay.patient.first_name} {obj.ward_stay.patient.last_name}"
+
 class NursingTaskSerializer(serializers.ModelSerializer):
     patient_name = serializers.SerializerMethodField()
     assigned_to_name = serializers.SerializerMethodField()
@@ -78,3 +108,25 @@ class NursingTaskSerializer(serializers.ModelSerializer):
         if obj.completed_by:
             return obj.completed_by.get_full_name()
         return None
+
+class RecurringTaskRuleSerializer(serializers.ModelSerializer):
+    patient_name = serializers.SerializerMethodField()
+    assigned_to_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = RecurringTaskRule
+        fields = '__all__'
+        read_only_fields = ['created_by', 'expanded_until']
+    
+    def validate(self, data):
+        starts_at = data.get('starts_at', getattr(self.instance, 'starts_at', None))
+        ends_at = data.get('ends_at', getattr(self.instance, 'ends_at', None))
+        if ends_at and starts_at and ends_at <= starts_at:
+            raise serializers.ValidationError({'ends_at': 'End must be after the start.'})
+        return data
+    
+    def get_patient_name(self, obj):
+        return f"{obj.ward_stay.patient.first_name} {obj.ward_stay.patient.last_name}"
+    
+    def get_assigned_to_name(self, obj):
+        return obj.assigned_to.get_full_name()
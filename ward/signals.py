@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .models import Bed, RecurringTaskRule, VitalSign, WardStay
+from . import early_warning, forecast, nursing_tasks, vitals
+
+
+def vital_sign_saved(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    vitals.record_latest(instance)
+    if created:
+        transaction.on_commit(lambda: early_warning.alert_if_needed(instance))
+
+
+def vital_sign_deleted(sender, instance, **kwargs):
+    # The deleted reading may have been the latest; fall back to the next one
+    vitals.refresh_latest([instance.ward_stay_id])
+
+
+def ward_stay_saved(sender, instance, created, **kwargs):
+    if created or kwargs.get('raw'):
+        return
+    vitals.sync_stay(instance)
+    if not instance.is_active:
+        # Discharged: no more recurring care
+        nursing_tasks.stop(RecurringTaskRule.objects.filter(ward_stay=instance, is_active=True))
+
+
+def invalidate_forecast(sender, **kwargs):
+    # Admissions, discharges and bed status changes all alter the forecast
+    transaction.on_commit(forecast.invalidate)
+
+
+def connect_signals():
+    post_save.connect(vital_sign_saved, sender=VitalSign, dispatch_uid='ward_latest_vitals_save')
+    post_delete.connect(vital_sign_deleted, sender=VitalSign, dispatch_uid='ward_latest_vitals_delete')
+    post_save.connect(ward_stay_saved, sender=WardStay, dispatch_uid='ward_latest_vitals_stay')
+    for model in (WardStay, Bed):
+        post_save.connect(invalidate_forecast, sender=model, dispatch_uid=f'ward_forecast_{model.__name__}_save')
+        post_delete.connect(invalidate_forecast, sender=model, dispatch_uid=f'ward_forecast_{model.__name__}_delete')
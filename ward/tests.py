@@ -0,0 +1,197 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Doctor, User
+from core.testing import QueryBudgetMixin
+from reception.models import Patient
+from . import nursing_tasks
+from .ingest import ingest
+from .models import Bed, NursingTask, RecurringTaskRule, VitalSign, Ward, WardStay
+
+
+class WardTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='x', user_type='admin'
+        )
+        cls.nurse = User.objects.create_user(
+            username='nurse', email='nurse@example.com', password='x', user_type='nurse', department='ward'
+        )
+        doctor_user = User.objects.create_user(
+            username='doctor', email='doctor@example.com', password='x', user_type='doctor', department='general'
+        )
+        cls.doctor = Doctor.objects.create(user=doctor_user, specialty='general', license_number='L1')
+        cls.patient = Patient.objects.create(
+            first_name='Jane', last_name='Doe', date_of_birth=date(1980, 1, 1), gender='F',
+            phone_number='+254700000000', patient_id='PID1'
+        )
+        cls.ward = Ward.objects.create(name='General A', ward_type='general', capacity=10, head_nurse=cls.nurse)
+        cls.bed = Bed.objects.create(ward=cls.ward, bed_number='1')
+        cls.stay = WardStay.objects.create(
+            patient=cls.patient, bed=cls.bed, admission_date=timezone.now() - timedelta(days=1),
+            admitting_doctor=cls.doctor, attending_doctor=cls.doctor,
+            admission_diagnosis='Observation', created_by=cls.admin
+        )
+
+
+class VitalsIngestTests(WardTestCase):
+    def reading(self, **values):
+        reading = {
+            'ward_stay': self.stay.pk, 'temperature': 36.8, 'pulse_rate': 72, 'respiratory_rate': 16,
+            'blood_pressure_systolic': 120, 'blood_pressure_diastolic': 80, 'oxygen_saturation': 98,
+        }
+        reading.update(values)
+        return reading
+
+    def test_non_finite_ward_stay_is_a_row_error(self):
+        result = ingest([self.reading(), self.reading(ward_stay='inf')], self.nurse)
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'], [
+            {'index': 1, 'errors': {'ward_stay': ['A valid integer is required.']}}
+        ])
+
+    def test_out_of_range_ward_stay_is_a_row_error(self):
+        result = ingest([self.reading(ward_stay=10 ** 30), self.reading(), self.reading(ward_stay=0)], self.nurse)
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual([row['index'] for row in result['errors']], [0, 2])
+        for row in result['errors']:
+            self.assertIn('Ensure this value is between', row['errors']['ward_stay'][0])
+
+    def test_impossible_recorded_at_is_a_row_error(self):
+        result = ingest([self.reading(recorded_at='2024-13-45T00:00:00'), self.reading()], self.nurse)
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'], [
+            {'index': 0, 'errors': {'recorded_at': ['Datetime has wrong format. Use ISO 8601.']}}
+        ])
+
+
+class RecurringTaskRuleTests(WardTestCase):
+    def test_reactivated_rule_reopens_its_occurrences(self):
+        rule = RecurringTaskRule.objects.create(
+            ward_stay=self.stay, title='Observations', interval_minutes=240,
+            starts_at=timezone.now() + timedelta(hours=1), assigned_to=self.nurse, created_by=self.admin
+        )
+        nursing_tasks.expand(RecurringTaskRule.objects.filter(pk=rule.pk))
+        scheduled = NursingTask.objects.filter(rule=rule, status='scheduled').count()
+        self.assertGreater(scheduled, 0)
+
+        rule.is_active = False
+        nursing_tasks.reschedule(rule)
+        self.assertFalse(NursingTask.objects.filter(rule=rule, status='scheduled').exists())
+
+        rule.is_active = True
+        rule.save()
+        nursing_tasks.reschedule(rule)
+        self.assertEqual(NursingTask.objects.filter(rule=rule, status='scheduled').count(), scheduled)
+        self.assertFalse(NursingTask.objects.filter(rule=rule, status='cancelled').exists())
+
+    def test_backdated_rule_skips_long_past_occurrences(self):
+        rule = RecurringTaskRule.objects.create(
+            ward_stay=self.stay, title='Observations', interval_minutes=60,
+            starts_at=timezone.now() - timedelta(days=30), assigned_to=self.nurse, created_by=self.admin
+        )
+        nursing_tasks.expand(RecurringTaskRule.objects.filter(pk=rule.pk))
+
+        earliest = NursingTask.objects.filter(rule=rule).order_by('scheduled_time').first().scheduled_time
+        self.assertGreaterEqual(earliest, timezone.now() - nursing_tasks.PAST_OCCURRENCE_GRACE - timedelta(minutes=1))
+
+    def test_reading_the_worklist_does_not_expand_rules(self):
+        RecurringTaskRule.objects.create(
+            ward_stay=self.stay, title='Observations', interval_minutes=240,
+            starts_at=timezone.now() + timedelta(hours=1), assigned_to=self.nurse, created_by=self.admin
+        )
+        client = APIClient()
+        client.force_authenticate(self.nurse)
+
+        for url in ('/api/ward/tasks/worklist/', '/api/ward/tasks/upcoming/'):
+            self.assertEqual(client.get(url).status_code, 200)
+        self.assertFalse(NursingTask.objects.exists())
+
+
+class WardListTests(WardTestCase):
+    def test_wards_are_ordered_and_empty_wards_report_zero_occupancy(self):
+        Ward.objects.create(name='Annex', ward_type='general', capacity=0, head_nurse=self.nurse)
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        response = client.get('/api/ward/wards/')
+
+        self.assertEqual([ward['name'] for ward in response.data['results']], ['Annex', 'General A'])
+        self.assertEqual(response.data['results'][0]['occupancy_rate'], 0)
+
+
+class VitalsParameterTests(WardTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_series_rejects_non_positive_bucket(self):
+        for bucket in ('0', '-60'):
+            response = self.client.get(f'/api/ward/vitals/series/?ward_stay={self.stay.pk}&bucket={bucket}')
+            self.assertEqual(response.status_code, 400)
+
+    def test_series_rejects_non_numeric_ward_stay(self):
+        response = self.client.get('/api/ward/vitals/series/?ward_stay=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_series_rejects_impossible_window(self):
+        for param in ('start', 'end'):
+            response = self.client.get(
+                f'/api/ward/vitals/series/?ward_stay={self.stay.pk}&{param}=2024-13-45T00:00:00'
+            )
+            self.assertEqual(response.status_code, 400)
+
+    def test_board_rejects_non_numeric_ward(self):
+        response = self.client.get('/api/ward/vitals/board/?ward=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_board_rejects_impossible_since(self):
+        response = self.client.get(f'/api/ward/vitals/board/?ward={self.ward.pk}&since=2024-13-45T00:00:00')
+        self.assertEqual(response.status_code, 400)
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, WardTestCase):
+    def setUp(self):
+        self.budget_user = self.admin
+
+    def admit(self, index):
+        bed = Bed.objects.create(ward=self.ward, bed_number=f'B{index}')
+        return WardStay.objects.create(
+            patient=self.patient, bed=bed, admission_date=timezone.now(),
+            admitting_doctor=self.doctor, attending_doctor=self.doctor,
+            admission_diagnosis='Observation', created_by=self.admin
+        )
+
+    def test_wards(self):
+        def make_row(index):
+            ward = Ward.objects.create(name=f'Ward {index}', ward_type='general', capacity=4, head_nurse=self.nurse)
+            Bed.objects.create(ward=ward, bed_number='1')
+        self.assertListQueries('/api/ward/wards/', make_row, 3)
+
+    def test_beds(self):
+        self.assertListQueries(
+            '/api/ward/beds/', lambda index: Bed.objects.create(ward=self.ward, bed_number=f'B{index}'), 2
+        )
+
+    def test_stays(self):
+        self.assertListQueries('/api/ward/stays/', self.admit, 2)
+
+    def test_vitals(self):
+        self.assertListQueries('/api/ward/vitals/', lambda index: VitalSign.objects.create(
+            ward_stay=self.stay, temperature=36.8, pulse_rate=72, respiratory_rate=16,
+            blood_pressure_systolic=120, blood_pressure_diastolic=80, oxygen_saturation=98,
+            recorded_by=self.nurse
+        ), 2)
+
+    def test_tasks(self):
+        self.assertListQueries('/api/ward/tasks/', lambda index: NursingTask.objects.create(
+            ward_stay=self.stay, title=f'Task {index}', description='', scheduled_time=timezone.now(),
+            assigned_to=self.nurse, created_by=self.admin
+        ), 2)
@@ -1,6 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import WardViewSet, BedViewSet, WardStayViewSet, VitalSignViewSet, NursingTaskViewSet
+from .views import (
+    WardViewSet, BedViewSet, WardStayViewSet, VitalSignViewSet, NursingTaskViewSet,
+    RecurringTaskRuleViewSet
+)
 
 router = DefaultRouter()
 router.register(r'wards', WardViewSet)
@@ -8,6 +11,7 @@ router.register(r'beds', BedViewSet)
 router.register(r'stays', WardStayViewSet)
 router.register(r'vitals', VitalSignViewSet)
 router.register(r'tasks', NursingTaskViewSet)
+router.register(r'task-rules', RecurringTaskRuleViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -2,13 +2,40 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Ward, Bed, WardStay, VitalSign, NursingTask
-from .serializers import WardSerializer, BedSerializer, WardStaySerializer, VitalSignSerializer, NursingTaskSerializer
+from .models import Ward, Bed, WardStay, VitalSign, NursingTask, RecurringTaskRule
+from .serializers import (
+    WardSerializer, BedSerializer, WardStaySerializer, WardStaySummarySerializer,
+    VitalSignSerializer, LatestVitalsSerializer, NursingTaskSerializer, RecurringTaskRuleSerializer
+)
+from django.conf import settings
+from django.db.models import Count, F, Q, FloatField, ExpressionWrapper, Max, Min
+from django.db.models.functions import Coalesce, NullIf
 from django.utils import timezone
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_http_date_safe
 from notifications.utils import send_notification
+from dashboard.activity import record_activity
+from core.mixins import ConditionalGetMixin, SparseFieldsetMixin
+from core.renderers import FastJSONParser, NDJSONParser
+from core.serializers import parse_field_list
+from .ingest import ingest
+from . import forecast, nursing_tasks, vitals
 
-class WardViewSet(viewsets.ModelViewSet):
-    queryset = Ward.objects.all()
+class WardViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    # Bed counts are annotated so listing wards does not count beds per row
+    queryset = Ward.objects.annotate(
+        available_beds=Count('beds', filter=Q(beds__status='available', beds__is_active=True)),
+        # Wards without beds report 0 rather than null
+        occupancy_rate=Coalesce(
+            ExpressionWrapper(
+                Count('beds', filter=Q(beds__status='occupied', beds__is_active=True)) * 100.0 /
+                NullIf(Count('beds', filter=Q(beds__is_active=True)), 0),
+                output_field=FloatField()
+            ),
+            0.0
+        )
+    ).order_by('name')  # Meta.ordering is not applied to aggregate (GROUP BY) queries
     serializer_class = WardSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -17,10 +44,19 @@ class WardViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def beds(self, request, pk=None):
         ward = self.get_object()
-        beds = Bed.objects.filter(ward=ward)
+        beds = Bed.objects.filter(ward=ward).select_related('ward')
         serializer = BedSerializer(beds, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def forecast(self, request):
+        """Predicted available beds per ward in 24, 48 and 72 hours (?ward= for one ward)"""
+        data = forecast.forecast()
+        ward_id = request.query_params.get('ward')
+        if ward_id:
+            data = dict(data, wards=[ward for ward in data['wards'] if str(ward['ward_id']) == ward_id])
+        return Response(data)
+    
     @action(detail=True, methods=['get'])
     def occupancy(self, request, pk=None):
         ward = self.get_object()
@@ -38,7 +74,7 @@ class WardViewSet(viewsets.ModelViewSet):
         })
 
 class BedViewSet(viewsets.ModelViewSet):
-    queryset = Bed.objects.all()
+    queryset = Bed.objects.select_related('ward')
     serializer_class = BedSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -71,9 +107,10 @@ class BedViewSet(viewsets.ModelViewSet):
         
         return Response({'error': 'Invalid status value'}, status=status.HTTP_400_BAD_REQUEST)
 
-class WardStayViewSet(viewsets.ModelViewSet):
-    queryset = WardStay.objects.all()
+class WardStayViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = WardStay.objects.select_related('patient', 'bed__ward', 'admitting_doctor__user')
     serializer_class = WardStaySerializer
+    summary_serializer_class = WardStaySummarySerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['is_active', 'bed__ward', 'admission_type']
@@ -99,6 +136,17 @@ class WardStayViewSet(viewsets.ModelViewSet):
         except Bed.DoesNotExist:
             return Response({'error': 'Bed not found'}, status=status.HTTP_404_NOT_FOUND)
     
+    def perform_create(self, serializer):
+        ward_stay = serializer.save()
+        record_activity(
+            actor=ward_stay.admitting_doctor.user,
+            event_type='admission',
+            action='admitted',
+            target=ward_stay.patient.get_full_name(),
+            department='ward',
+            obj=ward_stay
+        )
+    
     @action(detail=True, methods=['post'])
     def discharge(self, request, pk=None):
         ward_stay = self.get_object()
@@ -150,7 +198,7 @@ class WardStayViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Doctor not found'}, status=status.HTTP_404_NOT_FOUND)
 
 class VitalSignViewSet(viewsets.ModelViewSet):
-    queryset = VitalSign.objects.all()
+    queryset = VitalSign.objects.select_related('ward_stay__patient', 'recorded_by')
     serializer_class = VitalSignSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -165,7 +213,7 @@ class VitalSignViewSet(viewsets.ModelViewSet):
         
         try:
             ward_stay = WardStay.objects.get(id=ward_stay_id)
-            latest_vitals = VitalSign.objects.filter(ward_stay=ward_stay).order_by('-recorded_at').first()
+            latest_vitals = self.get_queryset().filter(ward_stay=ward_stay).order_by('-recorded_at').first()
             
             if latest_vitals:
                 serializer = self.get_serializer(latest_vitals)
@@ -177,8 +225,141 @@ class VitalSignViewSet(viewsets.ModelViewSet):
         except WardStay.DoesNotExist:
             return Response({'error': 'Ward stay not found'}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=False, methods=['get'])
+    def series(self, request):
+        """
+        Columnar vitals for one stay: ?ward_stay=&start=&end=&fields=&bucket=&max_points=
+
+        Windows with more than max_points readings (default 500) are
+        downsampled into min/max/mean buckets; ?bucket=<seconds> forces it.
+        """
+        ward_stay_id = request.query_params.get('ward_stay', None)
+        if not ward_stay_id:
+            return Response({'error': 'Ward stay ID is required'},
+                           status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ward_stay_id = int(ward_stay_id)
+        except ValueError:
+            return Response({'error': 'Ward stay ID must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not WardStay.objects.filter(id=ward_stay_id).exists():
+            return Response({'error': 'Ward stay not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        window = {}
+        for param in ('start', 'end'):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    parsed = parse_datetime(value)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    return Response({'error': f'Invalid {param} datetime'}, status=status.HTTP_400_BAD_REQUEST)
+                window[param] = parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+        requested = parse_field_list(request.query_params.get('fields'))
+        unknown = requested - set(vitals.VITAL_FIELDS)
+        if unknown:
+            return Response({'error': f"Unknown vitals: {', '.join(sorted(unknown))}"},
+                           status=status.HTTP_400_BAD_REQUEST)
+        fields = [field for field in vitals.VITAL_FIELDS if not requested or field in requested]
+
+        try:
+            bucket = int(request.query_params.get('bucket', 0))
+            max_points = max(int(request.query_params.get('max_points', 500)), 1)
+        except ValueError:
+            return Response({'error': 'bucket and max_points must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if 'bucket' in request.query_params and bucket < 1:
+            return Response({'error': 'bucket must be at least 1 second'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not bucket:
+            readings = VitalSign.objects.filter(ward_stay_id=ward_stay_id)
+            if 'start' in window:
+                readings = readings.filter(recorded_at__gte=window['start'])
+            if 'end' in window:
+                readings = readings.filter(recorded_at__lt=window['end'])
+            extent = readings.aggregate(count=Count('id'), first=Min('recorded_at'), last=Max('recorded_at'))
+            if extent['count'] > max_points:
+                bucket = vitals.choose_bucket(
+                    window.get('start', extent['first']), window.get('end', extent['last']), max_points
+                )
+
+        if bucket:
+            data = vitals.downsample(ward_stay_id, bucket, fields=fields, **window)
+        else:
+            data = vitals.series(ward_stay_id, fields=fields, **window)
+        return Response({'ward_stay': int(ward_stay_id), 'bucket_seconds': bucket or None, **data})
+
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """
+        Latest vitals for every active stay on a ward: ?ward=
+
+        Polling boards send If-Modified-Since (or ?since=<ISO datetime>) with
+        the previous Last-Modified to receive only the stays that changed.
+        """
+        ward_id = request.query_params.get('ward', None)
+        if not ward_id:
+            return Response({'error': 'Ward ID is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ward_id = int(ward_id)
+        except ValueError:
+            return Response({'error': 'Ward ID must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        since = None
+        if request.query_params.get('since'):
+            try:
+                since = parse_datetime(request.query_params['since'])
+            except ValueError:
+                since = None
+            if since is None:
+                return Response({'error': 'Invalid since datetime'}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        elif request.headers.get('If-Modified-Since'):
+            timestamp = parse_http_date_safe(request.headers['If-Modified-Since'])
+            if timestamp is not None:
+                # HTTP dates have whole-second resolution: only changes in later seconds are new
+                since = datetime.fromtimestamp(timestamp, tz=dt_timezone.utc) + timedelta(microseconds=999999)
+
+        rows = list(vitals.board(ward_id, since))
+        if since is not None and not rows and 'since' not in request.query_params:
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        as_of = max((row.updated_at for row in rows), default=since)
+        response = Response({
+            'ward': ward_id,
+            'delta': since is not None,
+            'as_of': as_of,
+            'results': LatestVitalsSerializer(rows, many=True).data,
+        })
+        if as_of is not None:
+            # Never claim the current second: rows may still change in it
+            last_modified = min(int(as_of.timestamp()), int(timezone.now().timestamp()) - 1)
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    @action(detail=False, methods=['post'], parser_classes=[FastJSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Batch ingestion for device gateways: a JSON array (or {"readings": [...]})
+        or NDJSON, one reading per line. Invalid rows are reported by index and
+        the rest are stored.
+        """
+        readings = request.data
+        if isinstance(readings, dict):
+            readings = readings.get('readings')
+        if not isinstance(readings, list):
+            return Response({'error': 'Expected a JSON array or NDJSON of readings'},
+                           status=status.HTTP_400_BAD_REQUEST)
+        if len(readings) > settings.VITALS_INGEST_MAX_BATCH:
+            return Response({'error': f'At most {settings.VITALS_INGEST_MAX_BATCH} readings per batch'},
+                           status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        result = ingest(readings, request.user)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST)
+
 class NursingTaskViewSet(viewsets.ModelViewSet):
-    queryset = NursingTask.objects.all()
+    queryset = NursingTask.objects.select_related('ward_stay__patient', 'assigned_to', 'completed_by')
     serializer_class = NursingTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -203,7 +384,7 @@ class NursingTaskViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         user = request.user
-        tasks = NursingTask.objects.filter(
+        tasks = self.get_queryset().filter(
             assigned_to=user,
             status='scheduled',
             scheduled_time__gte=timezone.now()
@@ -211,3 +392,70 @@ class NursingTaskViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(tasks, many=True)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def worklist(self, request):
+        """
+        Open tasks for a nurse's shift: ?start=&end=&assigned_to=&status=
+
+        Defaults to the current user and a window from 4 hours ago (overdue
+        tasks) to 12 hours ahead. Recurring rules only appear as far as they
+        have been expanded (NURSING_TASK_HORIZON_HOURS ahead).
+        """
+        now = timezone.now()
+        window = {'start': now - timedelta(hours=4), 'end': now + timedelta(hours=12)}
+        for param in ('start', 'end'):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    parsed = parse_datetime(value)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    return Response({'error': f'Invalid {param} datetime'}, status=status.HTTP_400_BAD_REQUEST)
+                window[param] = parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+        if not timedelta(0) < window['end'] - window['start'] <= timedelta(days=7):
+            return Response({'error': 'Window must be positive and at most 7 days'}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user
+        if request.query_params.get('assigned_to'):
+            from accounts.models import User
+            try:
+                user = User.objects.get(pk=request.query_params['assigned_to'])
+            except (User.DoesNotExist, ValueError):
+                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        statuses = parse_field_list(request.query_params.get('status')) or nursing_tasks.OPEN_STATUSES
+        tasks = nursing_tasks.worklist(self.get_queryset(), user, window['start'], window['end'], statuses)
+        serializer = self.get_serializer(tasks, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['post'], url_path='bulk-complete')
+    def bulk_complete(self, request):
+        task_ids = request.data.get('ids')
+        if not isinstance(task_ids, list) or not all(isinstance(task_id, int) for task_id in task_ids):
+            return Response({'error': 'ids must be a list of task IDs'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        completed, skipped = nursing_tasks.bulk_complete(task_ids, request.user)
+        return Response({'completed': completed, 'skipped': skipped})
+
+class RecurringTaskRuleViewSet(viewsets.ModelViewSet):
+    queryset = RecurringTaskRule.objects.select_related('ward_stay__patient', 'assigned_to')
+    serializer_class = RecurringTaskRuleSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['ward_stay', 'assigned_to', 'is_active']
+    
+    def perform_create(self, serializer):
+        rule = serializer.save(created_by=self.request.user)
+        nursing_tasks.expand(RecurringTaskRule.objects.filter(pk=rule.pk))
+        rule.refresh_from_db(fields=['expanded_until'])
+    
+    def perform_update(self, serializer):
+        rule = serializer.save()
+        nursing_tasks.reschedule(rule)
+        rule.refresh_from_db(fields=['is_active', 'expanded_until'])
+    
+    def perform_destroy(self, instance):
+        nursing_tasks.stop(RecurringTaskRule.objects.filter(pk=instance.pk))
+        instance.delete()
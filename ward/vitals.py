@@ -0,0 +1,190 @@
+"""
+Columnar read API for vital sign time series.
+
+Trend charts need one array per vital, not one serialized VitalSign per
+reading. ``series`` reads the rows for a stay as plain tuples over the
+``(ward_stay, recorded_at)`` index and returns parallel arrays. When a
+window holds more readings than a chart can show, ``downsample`` folds them
+into fixed time buckets with min/max/mean per vital, so the payload stays
+bounded however long the stay runs.
+
+``LatestVitals`` is the read model behind ward monitoring boards: one row
+per stay holding its newest reading, kept current by ``record_latest`` on
+every VitalSign save (see ward.signals). Writers that bypass signals, such
+as ``bulk_create``, call ``refresh_latest`` for the stays they touched.
+"""
+import math
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import LatestVitals, VitalSign, WardStay
+
+VITAL_FIELDS = (
+    'temperature',
+    'pulse_rate',
+    'respiratory_rate',
+    'blood_pressure_systolic',
+    'blood_pressure_diastolic',
+    'oxygen_saturation',
+)
+
+# Copied from each reading into its stay's LatestVitals row
+LATEST_FIELDS = VITAL_FIELDS + ('early_warning_score', 'early_warning_risk')
+
+# Bucket widths (seconds) chosen from when downsampling automatically
+BUCKET_SIZES = (60, 300, 900, 1800, 3600, 7200, 14400, 21600, 43200, 86400)
+
+
+def _rows(ward_stay_id, start=None, end=None, fields=VITAL_FIELDS):
+    queryset = VitalSign.objects.filter(ward_stay_id=ward_stay_id)
+    if start is not None:
+        queryset = queryset.filter(recorded_at__gte=start)
+    if end is not None:
+        queryset = queryset.filter(recorded_at__lt=end)
+    return queryset.order_by('recorded_at').values_list('recorded_at', *fields)
+
+
+def series(ward_stay_id, start=None, end=None, fields=VITAL_FIELDS):
+    """Readings for a stay as {'timestamps': [...], '<vital>': [...]}"""
+    rows = list(_rows(ward_stay_id, start, end, fields))
+    result = {'timestamps': [row[0] for row in rows]}
+    for index, field in enumerate(fields, start=1):
+        result[field] = [float(row[index]) if row[index] is not None else None for row in rows]
+    return result
+
+
+def choose_bucket(start, end, max_points):
+    """Smallest standard bucket width that keeps the window within max_points"""
+    span = (end - start).total_seconds()
+    for size in BUCKET_SIZES:
+        if span / size <= max_points:
+            return size
+    return int(math.ceil(span / max_points))
+
+
+def downsample(ward_stay_id, bucket_seconds, start=None, end=None, fields=VITAL_FIELDS):
+    """
+    Readings folded into ``bucket_seconds`` wide buckets.
+
+    Returns bucket start times, reading counts and, per vital, parallel
+    ``min``/``max``/``mean`` arrays. Empty buckets are omitted.
+    """
+    result = {'timestamps': [], 'count': []}
+    for field in fields:
+        result[field] = {'min': [], 'max': [], 'mean': []}
+
+    current_bucket = None
+    count = 0
+    stats = None
+
+    def close_bucket():
+        result['timestamps'].append(bucket_origin + timedelta(seconds=current_bucket * bucket_seconds))
+        result['count'].append(count)
+        for field, (low, high, total, seen) in zip(fields, stats):
+            result[field]['min'].append(low)
+            result[field]['max'].append(high)
+            result[field]['mean'].append(round(total / seen, 2) if seen else None)
+
+    bucket_origin = None
+    for row in _rows(ward_stay_id, start, end, fields).iterator(chunk_size=2000):
+        recorded_at = row[0]
+        if bucket_origin is None:
+            # Align buckets to the window start (or first reading) rounded down to the bucket width
+            origin = start or recorded_at
+            epoch = origin.timestamp()
+            bucket_origin = origin - timedelta(seconds=epoch % bucket_seconds)
+        bucket = int((recorded_at - bucket_origin).total_seconds() // bucket_seconds)
+
+        if bucket != current_bucket:
+            if current_bucket is not None:
+                close_bucket()
+            current_bucket = bucket
+            count = 0
+            stats = [[None, None, 0.0, 0] for _ in fields]
+
+        count += 1
+        for index, value in enumerate(row[1:]):
+            if value is None:
+                continue
+            value = float(value)
+            entry = stats[index]
+            entry[0] = value if entry[0] is None or value < entry[0] else entry[0]
+            entry[1] = value if entry[1] is None or value > entry[1] else entry[1]
+            entry[2] += value
+            entry[3] += 1
+
+    if current_bucket is not None:
+        close_bucket()
+    return result
+
+
+def record_latest(vital_sign):
+    """Make ``vital_sign`` its stay's latest reading unless a newer one is already recorded"""
+    values = {field: getattr(vital_sign, field) for field in LATEST_FIELDS}
+    # update() skips auto_now, so delta polling needs updated_at set explicitly
+    values.update(vital_sign_id=vital_sign.pk, recorded_at=vital_sign.recorded_at, updated_at=timezone.now())
+    newer_or_missing = LatestVitals.objects.filter(
+        ward_stay_id=vital_sign.ward_stay_id, recorded_at__lte=vital_sign.recorded_at
+    )
+    if newer_or_missing.update(**values):
+        return
+
+    ward_id, is_active = WardStay.objects.filter(pk=vital_sign.ward_stay_id).values_list('bed__ward_id', 'is_active').get()
+    _, created = LatestVitals.objects.get_or_create(
+        ward_stay_id=vital_sign.ward_stay_id,
+        defaults=dict(values, ward_id=ward_id, is_active=is_active)
+    )
+    if not created:
+        # Another writer created the row first; it may hold an older reading
+        newer_or_missing.update(**values)
+
+
+def refresh_latest(ward_stay_ids=None):
+    """Rebuild LatestVitals from VitalSign for the given stays (all stays when None)"""
+    stays = WardStay.objects.all()
+    if ward_stay_ids is not None:
+        stays = stays.filter(pk__in=list(ward_stay_ids))
+    newest = VitalSign.objects.filter(ward_stay=OuterRef('pk')).order_by('-recorded_at', '-id').values('id')[:1]
+    rows = list(stays.annotate(latest_id=Subquery(newest)).values_list('pk', 'latest_id', 'bed__ward_id', 'is_active'))
+
+    readings = VitalSign.objects.in_bulk([latest_id for _, latest_id, _, _ in rows if latest_id])
+    now = timezone.now()
+    latest = [
+        LatestVitals(
+            ward_stay_id=stay_id, ward_id=ward_id, vital_sign_id=latest_id, is_active=is_active,
+            recorded_at=readings[latest_id].recorded_at, updated_at=now,
+            **{field: getattr(readings[latest_id], field) for field in LATEST_FIELDS}
+        )
+        for stay_id, latest_id, ward_id, is_active in rows if latest_id
+    ]
+    with transaction.atomic():
+        LatestVitals.objects.filter(ward_stay_id__in=[row[0] for row in rows]).delete()
+        LatestVitals.objects.bulk_create(latest, batch_size=500)
+    return len(latest)
+
+
+def sync_stay(ward_stay):
+    """Carry a stay's ward and active flag over to its LatestVitals row"""
+    ward_id = ward_stay.bed.ward_id
+    LatestVitals.objects.filter(ward_stay_id=ward_stay.pk).exclude(
+        ward_id=ward_id, is_active=ward_stay.is_active
+    ).update(ward_id=ward_id, is_active=ward_stay.is_active, updated_at=timezone.now())
+
+
+def board(ward_id, since=None):
+    """
+    Latest readings for a ward's patients in one query.
+
+    Without ``since`` only active stays are returned. With it, every row
+    changed after ``since`` is returned, including stays discharged since
+    then (``is_active`` false) so polling boards can drop them.
+    """
+    queryset = LatestVitals.objects.filter(ward_id=ward_id).select_related('ward_stay__patient', 'ward_stay__bed')
+    if since is None:
+        queryset = queryset.filter(is_active=True)
+    else:
+        queryset = queryset.filter(updated_at__gt=since)
+    return queryset.order_by('ward_stay__bed__bed_number')